@@ -1,19 +1,24 @@
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import os
+import time
+import uuid
 
 from sqlmodel import select
 
+from app.core.config_cache import get_config_cache
 from app.core.memory import MemoryStore
 from app.core.secrets import SecretsBroker
 from app.integrations.mcp_client import MCPRegistry
 from app.providers.model_registry import ModelRegistry
 from app.providers.model_filters import filter_chat_models, is_chat_model, pick_best_chat_model
 from app.providers.base import ProviderError
+from app.providers.response_cache import CachedText
+from app.providers.scheduler import BACKGROUND, load_limits
 from app.core.events import Event
 from app.db.models import AgentConfig, ProjectBudget, Run
-from app.db.session import get_session
+from app.db.session import get_session, run_db
 
 
 class AgentRuntime:
@@ -22,16 +27,29 @@ class AgentRuntime:
         registry: ModelRegistry,
         mcp_registry: MCPRegistry,
         secrets_broker: SecretsBroker | None = None,
+        stream: bool = True,
+        delta_interval: float = 0.1,
+        delta_bytes: int = 256,
     ) -> None:
         self.registry = registry
+        self.stream = stream
+        self.delta_interval = max(0.0, delta_interval)
+        self.delta_bytes = max(1, delta_bytes)
         self.mcp_registry = mcp_registry
         self.memory = MemoryStore()
         self.secrets_broker = secrets_broker
         self.event_bus = None
         self.event_writer = None
 
-    async def run_agent(self, run_id: int, agent: AgentConfig, goal: str) -> Dict[str, Any]:
-        budget_allowed = self._check_budget(run_id)
+    async def run_agent(
+        self,
+        run_id: int,
+        agent: AgentConfig,
+        goal: str,
+        priority: int = BACKGROUND,
+        cache: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        budget_allowed = await run_db(self._check_budget, run_id)
         if not budget_allowed:
             return {
                 "role": agent.role,
@@ -47,7 +65,7 @@ class AgentRuntime:
         name = agent.display_name or agent.role
         memories = []
         if agent.id:
-            recent = self.memory.recent(run_id, agent.id, role=agent.role, limit=None)
+            recent = await run_db(self.memory.recent, run_id, agent.id, role=agent.role, limit=None)
             memories = [entry.content for entry in reversed(recent)]
         memory_note = "\nRecent memory:\n" + "\n".join(memories) if memories else ""
         prompt = (
@@ -62,20 +80,24 @@ class AgentRuntime:
             if fallback:
                 model_to_use = fallback
                 if agent.id:
-                    with get_session() as session:
-                        stored = session.get(AgentConfig, agent.id)
-                        if stored:
-                            stored.model = fallback
-                            session.add(stored)
-                            session.commit()
+                    await run_db(self._store_model, agent.id, fallback)
         payload = {"prompt": prompt, "role": agent.role}
-        if self.secrets_broker:
-            token = self.secrets_broker.issue_provider_token(agent.provider)
-            if token:
-                payload["provider_token"] = token.token
+        setting = await run_db(get_config_cache().setting_for_run, run_id)
+        limits = load_limits(setting.provider_limits) if setting else None
         await self._emit_thinking(run_id, agent, "start")
+        ttft = None
+        cached = False
         try:
-            response = await self.registry.invoke(agent.provider, model_to_use, payload)
+            if self.stream:
+                content, ttft, cached = await self._stream_content(
+                    run_id, agent, model_to_use, payload, priority, limits, cache
+                )
+            else:
+                response = await self.registry.invoke(
+                    agent.provider, model_to_use, payload, priority=priority, limits=limits, cache=cache
+                )
+                content = response.get("content", "")
+                cached = bool(response.get("cached"))
         except ProviderError as exc:
             await self._emit_thinking(run_id, agent, "done", error=str(exc))
             return {
@@ -90,15 +112,78 @@ class AgentRuntime:
                 "content": f"Provider error: {exc}",
                 "timestamp": datetime.utcnow().isoformat(),
             }
-        await self._emit_thinking(run_id, agent, "done")
+        ttft_ms = round(ttft * 1000, 1) if ttft is not None else None
+        await self._emit_thinking(run_id, agent, "done", ttft_ms=ttft_ms)
 
-        self._increment_budget(run_id)
+        if not cached:
+            await run_db(self._increment_budget, run_id)
 
         return {
             "role": agent.role,
-            "content": response.get("content", ""),
+            "content": content,
             "timestamp": datetime.utcnow().isoformat(),
+            "ttft_ms": ttft_ms,
+            "cached": cached,
+        }
+
+    async def _stream_content(
+        self,
+        run_id: int,
+        agent: AgentConfig,
+        model: str,
+        payload: Dict[str, Any],
+        priority: int = BACKGROUND,
+        limits: Optional[dict] = None,
+        cache: Optional[str] = None,
+    ) -> tuple[str, Optional[float], bool]:
+        stream_id = uuid.uuid4().hex[:12]
+        started = time.monotonic()
+        last_flush = started
+        ttft = None
+        parts: list[str] = []
+        pending: list[str] = []
+        pending_bytes = 0
+        index = 0
+        cached = False
+        async for chunk in self.registry.invoke_stream(
+            agent.provider, model, payload, priority=priority, limits=limits, cache=cache
+        ):
+            if not chunk:
+                continue
+            cached = cached or isinstance(chunk, CachedText)
+            now = time.monotonic()
+            if ttft is None:
+                ttft = now - started
+                self.registry.record_ttft(agent.provider, ttft)
+            parts.append(chunk)
+            pending.append(chunk)
+            pending_bytes += len(chunk.encode("utf-8"))
+            # Coalesce tokens so a fast stream costs one event per interval or byte budget.
+            if pending_bytes >= self.delta_bytes or now - last_flush >= self.delta_interval:
+                await self._emit_delta(run_id, agent, stream_id, index, "".join(pending), False)
+                index += 1
+                pending, pending_bytes, last_flush = [], 0, now
+        await self._emit_delta(run_id, agent, stream_id, index, "".join(pending), True)
+        return "".join(parts), ttft, cached
+
+    async def _emit_delta(
+        self, run_id: int, agent: AgentConfig, stream_id: str, index: int, delta: str, done: bool
+    ) -> None:
+        if not self.event_bus:
+            return
+        payload = {
+            "agent": agent.display_name or agent.role,
+            "agent_id": agent.id,
+            "role": agent.role,
+            "stream_id": stream_id,
+            "index": index,
+            "delta": delta,
+            "done": done,
         }
+        try:
+            await self.event_bus.publish(Event(type="chat.delta", payload=payload, run_id=run_id))
+        except Exception:
+            pass
 
     async def _emit_thinking(
         self,
@@ -106,6 +191,7 @@ class AgentRuntime:
         agent: AgentConfig,
         status: str,
         error: str | None = None,
+        ttft_ms: float | None = None,
     ) -> None:
         payload = {
             "agent": agent.display_name or agent.role,
@@ -113,18 +199,29 @@ class AgentRuntime:
             "status": status,
             "error": error,
         }
+        if ttft_ms is not None:
+            payload["ttft_ms"] = ttft_ms
         event_type = "agent.thinking" if status == "start" else "agent.thinking.done"
+        event = Event(type=event_type, payload=payload, run_id=run_id)
         if self.event_writer and run_id:
             try:
-                self.event_writer(run_id, {"type": event_type, "payload": payload})
+                self.event_writer(run_id, event.__dict__)
             except Exception:
                 pass
         if self.event_bus:
             try:
-                await self.event_bus.publish(Event(type=event_type, payload=payload))
+                await self.event_bus.publish(event)
             except Exception:
                 pass
 
+    def _store_model(self, agent_id: int, model: str) -> None:
+        with get_session() as session:
+            stored = session.get(AgentConfig, agent_id)
+            if stored:
+                stored.model = model
+                session.add(stored)
+                session.commit()
+
     def _check_budget(self, run_id: int) -> bool:
         with get_session() as session:
             run = session.get(Run, run_id)
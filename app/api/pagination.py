@@ -0,0 +1,57 @@
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlmodel import Session
+
+MAX_LIMIT = 1000
+NEXT_HEADER = "X-Next-After-Id"
+
+# Columns that can be arbitrarily large are only returned when named in ``fields``.
+HEAVY_FIELDS: dict[str, set[str]] = {
+    "artifact": {"content"},
+    "auditlog": {"request", "result"},
+}
+
+
+class PageParams:
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(default=None, ge=0),
+        # Omitted means the whole result, as before paging existed; clients opt in by passing a limit.
+        limit: Optional[int] = Query(default=None, ge=1, le=MAX_LIMIT),
+        fields: Optional[str] = Query(default=None),
+    ) -> None:
+        self.after_id = after_id
+        self.limit = limit
+        self.fields = fields
+
+
+def select_fields(model, fields: Optional[str]) -> list[str]:
+    names = list(model.__table__.columns.keys())
+    if not fields:
+        heavy = HEAVY_FIELDS.get(model.__tablename__, set())
+        return [name for name in names if name not in heavy]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(names))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [name for name in names if name == "id" or name in requested]
+
+
+def paginate(session: Session, model, statement, page: PageParams, response: Response) -> list[dict]:
+    names = select_fields(model, page.fields)
+    if page.after_id is not None:
+        statement = statement.where(model.id > page.after_id)
+    columns = (model.__table__.c[name] for name in names)
+    statement = statement.with_only_columns(*columns).order_by(model.id)
+    if page.limit is not None:
+        statement = statement.limit(page.limit + 1)
+    rows = session.connection().execute(statement).all()
+    if page.limit is not None and len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_HEADER] = str(rows[-1].id)
+    return [dict(row._mapping) for row in rows]
+
+
+def project(obj, model, fields: Optional[str]) -> dict:
+    return {name: getattr(obj, name) for name in select_fields(model, fields)}
@@ -1,12 +1,12 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlmodel import select
 
+from app.api.pagination import PageParams, paginate
 from app.db.models import AgentConfig, ProjectSetting, Team
 from app.db.session import get_session
-from app.providers.model_registry import ModelRegistry
 from app.core.chat_router import MANAGER_ROLES
 from app.core.presets import generate_avatar_url, is_broken_avatar_url, pick_avatar_url
 from app.core.role_scopes import resolve_role_scopes
@@ -41,20 +41,36 @@ def create_agent(agent: AgentConfig) -> AgentConfig:
         return agent
 
 
-@router.get("/", response_model=List[AgentConfig])
-def list_agents() -> List[AgentConfig]:
+@router.get("/")
+def list_agents(
+    response: Response,
+    team_id: Optional[int] = Query(default=None),
+    project_id: Optional[int] = Query(default=None),
+    role: Optional[str] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(AgentConfig)
+    if team_id is not None:
+        statement = statement.where(AgentConfig.team_id == team_id)
+    if project_id is not None:
+        statement = statement.where(AgentConfig.team_id.in_(select(Team.id).where(Team.project_id == project_id)))
+    if role is not None:
+        statement = statement.where(AgentConfig.role == role)
     with get_session() as session:
-        agents = list(session.exec(select(AgentConfig)))
+        agents = paginate(session, AgentConfig, statement, page, response)
         updated = False
-        for agent in agents:
-            if is_broken_avatar_url(agent.avatar_url):
-                agent.avatar_url = generate_avatar_url(agent.display_name or "agent")
-                session.add(agent)
-                updated = True
+        for row in agents:
+            if "avatar_url" not in row or not is_broken_avatar_url(row["avatar_url"]):
+                continue
+            agent = session.get(AgentConfig, row["id"])
+            if agent is None:
+                continue
+            agent.avatar_url = generate_avatar_url(agent.display_name or "agent")
+            row["avatar_url"] = agent.avatar_url
+            session.add(agent)
+            updated = True
         if updated:
             session.commit()
-            for agent in agents:
-                session.refresh(agent)
         return agents
 
 
@@ -96,8 +112,7 @@ async def refresh_agent_model(agent_id: int, request: Request) -> dict:
             raise HTTPException(status_code=404, detail="Agent not found")
         if agent.role not in MANAGER_ROLES:
             return {"status": "skipped", "reason": "not_manager"}
-        registry = ModelRegistry(request.app.state.secrets_broker)
-        model = await registry.suggest_manager_model(agent.provider)
+        model = await request.app.state.model_registry.suggest_manager_model(agent.provider)
         if model:
             agent.model = model
             session.add(agent)
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import select
 
+from app.api.pagination import PageParams, paginate
 from app.db.models import Approval
 from app.db.session import get_session
 
@@ -20,10 +21,20 @@ def create_approval(approval: Approval) -> Approval:
         return approval
 
 
-@router.get("/", response_model=List[Approval])
-def list_approvals() -> List[Approval]:
+@router.get("/")
+def list_approvals(
+    response: Response,
+    run_id: Optional[int] = Query(default=None),
+    status: Optional[str] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(Approval)
+    if run_id is not None:
+        statement = statement.where(Approval.run_id == run_id)
+    if status is not None:
+        statement = statement.where(Approval.status == status)
     with get_session() as session:
-        return list(session.exec(select(Approval)))
+        return paginate(session, Approval, statement, page, response)
 
 
 @router.get("/{approval_id}", response_model=Approval)
@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import select
 
-from app.db.models import Artifact
+from app.api.pagination import PageParams, paginate
+from app.db.models import Artifact, Task
 from app.db.session import get_session
 
 router = APIRouter()
@@ -18,10 +19,23 @@ def create_artifact(artifact: Artifact) -> Artifact:
         return artifact
 
 
-@router.get("/", response_model=List[Artifact])
-def list_artifacts() -> List[Artifact]:
+@router.get("/")
+def list_artifacts(
+    response: Response,
+    task_id: Optional[int] = Query(default=None),
+    run_id: Optional[int] = Query(default=None),
+    type: Optional[str] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(Artifact)
+    if task_id is not None:
+        statement = statement.where(Artifact.task_id == task_id)
+    if run_id is not None:
+        statement = statement.where(Artifact.task_id.in_(select(Task.id).where(Task.run_id == run_id)))
+    if type is not None:
+        statement = statement.where(Artifact.type == type)
     with get_session() as session:
-        return list(session.exec(select(Artifact)))
+        return paginate(session, Artifact, statement, page, response)
 
 
 @router.get("/{artifact_id}", response_model=Artifact)
@@ -1,19 +1,27 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import select
 
+from app.api.pagination import PageParams, paginate
 from app.db.models import ProjectBudget, ProviderBalance
 from app.db.session import get_session
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[ProjectBudget])
-def list_budgets() -> List[ProjectBudget]:
+@router.get("/")
+def list_budgets(
+    response: Response,
+    project_id: Optional[int] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(ProjectBudget)
+    if project_id is not None:
+        statement = statement.where(ProjectBudget.project_id == project_id)
     with get_session() as session:
-        return list(session.exec(select(ProjectBudget)))
+        return paginate(session, ProjectBudget, statement, page, response)
 
 
 @router.post("/")
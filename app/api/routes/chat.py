@@ -3,24 +3,34 @@ import json
 import uuid
 import re
 
-from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
 from sqlmodel import select
 
-from app.core.chat_router import ChatRouter, MANAGER_ROLES
+from app.core.chat_router import ChatRouter, MANAGER_ROLES, ROLE_KEYWORDS
 from app.core.events import Event
 from app.core.memory import MemoryStore
 from app.core.artifacts import ArtifactStore
+from app.core.config_cache import get_config_cache
 from app.core.orchestrator import Orchestrator
 from app.core.tool_dispatcher import extract_tool_call, execute_tool_call, normalize_tool_response
 from app.core.project_registry import project_attachments_dir
-from app.db.models import AgentConfig, ProjectSetting, Run, Team, Task
+from app.db.models import AgentConfig, Run, Team, Task
 from app.db.session import get_session
+from app.providers.scheduler import INTERACTIVE
 
 router = APIRouter()
 router_helper = ChatRouter()
 memory = MemoryStore()
 @router.get("/history")
-def chat_history(request: Request, run_id: int | None = None) -> dict:
+def chat_history(
+    request: Request,
+    run_id: int | None = None,
+    after_seq: int | None = None,
+    after: int | None = None,
+    before: int | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    role: list[str] | None = Query(default=None),
+) -> dict:
     with get_session() as session:
         run = session.get(Run, int(run_id)) if run_id else None
         if not run:
@@ -35,9 +45,21 @@ def chat_history(request: Request, run_id: int | None = None) -> dict:
         if not run:
             return {"run_id": None, "messages": []}
     store = ArtifactStore(request.app.state.data_dir)
+    messages, has_more = store.page_chats(
+        run.id,
+        after_seq=after if after is not None else after_seq,
+        before_seq=before,
+        limit=limit,
+        roles=role,
+    )
+    seqs = [int(message.get("seq") or 0) for message in messages]
     return {
         "run_id": run.id,
-        "messages": store.read_chats(run.id),
+        "messages": messages,
+        "has_more": has_more,
+        "next_after": max(seqs) if seqs else None,
+        "prev_before": min(seqs) if seqs else None,
+        "head_seq": store.head_chat_seq(run.id),
         "pause_mode": run.pause_mode,
     }
 
@@ -72,9 +94,7 @@ async def send_message(payload: dict, request: Request) -> dict:
             session.add(run)
             session.commit()
             session.refresh(run)
-        setting = session.exec(
-            select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-        ).first()
+        setting = get_config_cache().setting(run.project_id)
         chat_policy = (setting.chat_target_policy if setting else None) or "managers"
 
         targets = router_helper.resolve_targets(run.team_id, message, chat_policy)
@@ -90,6 +110,7 @@ async def send_message(payload: dict, request: Request) -> dict:
             session.commit()
             mode_event = Event(
                 type=f"team.{command}",
+                run_id=run.id,
                 payload={
                     "run_id": run.id,
                     "mode": command,
@@ -113,8 +134,10 @@ async def send_message(payload: dict, request: Request) -> dict:
                 _clear_pause_mode(session, run)
                 session.add(run)
                 session.commit()
+                request.app.state.task_dispatcher.notify()
                 resume_event = Event(
                     type="team.resume",
+                    run_id=run.id,
                     payload={"run_id": run.id, "mode": "resume", "actor": "Stakeholder"},
                 )
                 artifacts = ArtifactStore(request.app.state.data_dir)
@@ -131,8 +154,10 @@ async def send_message(payload: dict, request: Request) -> dict:
             _clear_pause_mode(session, run)
             session.add(run)
             session.commit()
+            request.app.state.task_dispatcher.notify()
             resume_event = Event(
                 type="team.resume",
+                run_id=run.id,
                 payload={"run_id": run.id, "mode": "resume", "actor": "Stakeholder"},
             )
             artifacts = ArtifactStore(request.app.state.data_dir)
@@ -159,6 +184,7 @@ async def send_message(payload: dict, request: Request) -> dict:
     artifacts.write_chat(run.id, "Stakeholder", stakeholder_message)
     stakeholder_event = Event(
         type="chat.message",
+        run_id=run.id,
         payload={
             **stakeholder_message,
             "targets": [t.display_name or t.role for t in targets],
@@ -170,6 +196,7 @@ async def send_message(payload: dict, request: Request) -> dict:
     await event_bus.publish(
         Event(
             type="notification.requested",
+            run_id=run.id,
             payload={
                 "title": "Stakeholder feedback",
                 "body": message,
@@ -183,15 +210,13 @@ async def send_message(payload: dict, request: Request) -> dict:
     manager = None
     manager_briefed = False
     if not has_mention:
-        with get_session() as session:
-            agents = list(
-                session.exec(select(AgentConfig).where(AgentConfig.team_id == run.team_id))
-            )
+        agents = get_config_cache().roster(run.team_id)
         manager = _pick_manager(agents)
         if manager and manager.id:
             await event_bus.publish(
                 Event(
                     type="agent.thinking",
+                    run_id=run.id,
                     payload={
                         "agent": manager.display_name or manager.role,
                         "role": manager.role,
@@ -212,7 +237,9 @@ async def send_message(payload: dict, request: Request) -> dict:
                 "}\n\n"
                 f"Stakeholder request:\n{message}\n"
             )
-            manager_response = await agent_runtime.run_agent(run.id, manager, manager_prompt)
+            manager_response = await agent_runtime.run_agent(
+                run.id, manager, manager_prompt, priority=INTERACTIVE
+            )
             manager_text = (manager_response.get("content") or "").strip()
             manager_payload = _extract_json_payload(manager_text)
             directive = None
@@ -229,7 +256,7 @@ async def send_message(payload: dict, request: Request) -> dict:
                     "timestamp": datetime.utcnow().isoformat(),
                 }
                 artifacts.write_chat(run.id, manager.role, manager_message)
-                await event_bus.publish(Event(type="chat.message", payload=manager_message))
+                await event_bus.publish(Event(type="chat.message", payload=manager_message, run_id=run.id))
                 memory.append(run.id, manager.id, manager.role, f"Manager: {directive}")
                 manager_briefed = True
                 await _trigger_agent_followups(
@@ -263,8 +290,10 @@ async def send_message(payload: dict, request: Request) -> dict:
                     session.commit()
                     session.refresh(task)
                     created_tasks += 1
+                    request.app.state.task_dispatcher.notify()
                     task_event = Event(
                         type="task.created",
+                        run_id=run.id,
                         payload={
                             "task_id": task.id,
                             "title": task.title,
@@ -285,8 +314,10 @@ async def send_message(payload: dict, request: Request) -> dict:
                     session.add(task)
                     session.commit()
                     session.refresh(task)
+                    request.app.state.task_dispatcher.notify()
                     task_event = Event(
                         type="task.created",
+                        run_id=run.id,
                         payload={
                             "task_id": task.id,
                             "title": task.title,
@@ -316,6 +347,7 @@ async def send_message(payload: dict, request: Request) -> dict:
         await event_bus.publish(
             Event(
                 type="memory.updated",
+                run_id=run.id,
                 payload={
                     "agent_id": agent.id,
                     "agent": agent.display_name or agent.role,
@@ -323,7 +355,7 @@ async def send_message(payload: dict, request: Request) -> dict:
                 },
             )
         )
-        response = await agent_runtime.run_agent(run.id, agent, prompt)
+        response = await agent_runtime.run_agent(run.id, agent, prompt, priority=INTERACTIVE)
         response_text = (response.get("content") or "").strip()
         tool_call = extract_tool_call(response_text)
         if tool_call:
@@ -355,9 +387,10 @@ async def send_message(payload: dict, request: Request) -> dict:
         artifacts.write_chat(run.id, agent.role, agent_message)
         agent_event = Event(
             type="agent.response",
+            run_id=run.id,
             payload={"agent": agent.role, "content": response_text},
         )
-        chat_event = Event(type="chat.message", payload=agent_message)
+        chat_event = Event(type="chat.message", payload=agent_message, run_id=run.id)
         artifacts.write_event(run.id, agent_event.__dict__)
         artifacts.write_event(run.id, chat_event.__dict__)
         await event_bus.publish(agent_event)
@@ -390,6 +423,7 @@ async def send_message(payload: dict, request: Request) -> dict:
             await event_bus.publish(
                 Event(
                     type="agent.thinking",
+                    run_id=run.id,
                     payload={
                         "agent": manager.display_name or manager.role,
                         "role": manager.role,
@@ -403,7 +437,9 @@ async def send_message(payload: dict, request: Request) -> dict:
                 "Otherwise, respond with a short directive that includes @mentions.\n\n"
                 "Team updates:\n" + "\n".join(team_updates)
             )
-            manager_response = await agent_runtime.run_agent(run.id, manager, followup_prompt)
+            manager_response = await agent_runtime.run_agent(
+                run.id, manager, followup_prompt, priority=INTERACTIVE
+            )
             manager_text = (manager_response.get("content") or "").strip()
             if manager_text.upper().startswith("NO_FURTHER_ACTION"):
                 break
@@ -415,7 +451,7 @@ async def send_message(payload: dict, request: Request) -> dict:
                 "timestamp": datetime.utcnow().isoformat(),
             }
             artifacts.write_chat(run.id, manager.role, manager_message)
-            await event_bus.publish(Event(type="chat.message", payload=manager_message))
+            await event_bus.publish(Event(type="chat.message", payload=manager_message, run_id=run.id))
             memory.append(run.id, manager.id, manager.role, f"Manager: {manager_text}")
             await _trigger_agent_followups(
                 run,
@@ -469,7 +505,7 @@ async def _trigger_agent_followups(
             "Respond with your next actions. "
             "If you are blocked or done, ask @po or @dm what to do next."
         )
-        response = await agent_runtime.run_agent(run.id, agent, prompt)
+        response = await agent_runtime.run_agent(run.id, agent, prompt, priority=INTERACTIVE)
         response_text = (response.get("content") or "").strip()
         agent_message = {
             "message_id": str(uuid.uuid4()),
@@ -481,9 +517,10 @@ async def _trigger_agent_followups(
         artifacts.write_chat(run.id, agent.role, agent_message)
         agent_event = Event(
             type="agent.response",
+            run_id=run.id,
             payload={"agent": agent.role, "content": response_text},
         )
-        chat_event = Event(type="chat.message", payload=agent_message)
+        chat_event = Event(type="chat.message", payload=agent_message, run_id=run.id)
         artifacts.write_event(run.id, agent_event.__dict__)
         artifacts.write_event(run.id, chat_event.__dict__)
         await event_bus.publish(agent_event)
@@ -492,21 +529,13 @@ async def _trigger_agent_followups(
 
 
 def _pick_best_agent(team_id: int, message: str) -> AgentConfig | None:
-    keywords = {
-        "qa": ["test", "bug", "regression", "qa", "verify"],
-        "devops": ["deploy", "ci", "pipeline", "infra", "release"],
-        "docs": ["docs", "documentation", "readme", "guide"],
-        "dev": ["code", "implement", "fix", "refactor", "build"],
-        "pm": ["scope", "plan", "requirements", "roadmap"],
-    }
     text = message.lower()
-    with get_session() as session:
-        agents = list(session.exec(select(AgentConfig).where(AgentConfig.team_id == team_id)))
+    agents = get_config_cache().roster(team_id)
     scored: list[tuple[int, AgentConfig]] = []
     for agent in agents:
         role = agent.role.lower()
         score = 0
-        for key, words in keywords.items():
+        for key, words in ROLE_KEYWORDS.items():
             if key in role:
                 score += sum(1 for w in words if w in text) * 2
             else:
@@ -569,21 +598,20 @@ async def _emit_system_message(
         "timestamp": datetime.utcnow().isoformat(),
     }
     artifacts.write_chat(run.id, "System", system_message)
-    event = Event(type="chat.message", payload=system_message)
+    event = Event(type="chat.message", payload=system_message, run_id=run.id)
     artifacts.write_event(run.id, event.__dict__)
     await event_bus.publish(event)
 
 
 async def _emit_attention_notice(request: Request, run: Run) -> None:
-    with get_session() as session:
-        agents = list(session.exec(select(AgentConfig).where(AgentConfig.team_id == run.team_id)))
+    agents = get_config_cache().roster(run.team_id)
     notice = {
         "title": "Attention requested",
         "body": "Stakeholder has called a team meeting. Await instructions.",
         "targets": [t.display_name or t.role for t in agents],
     }
     await request.app.state.event_bus.publish(
-        Event(type="notification.requested", payload=notice)
+        Event(type="notification.requested", payload=notice, run_id=run.id)
     )
 
 
@@ -622,6 +650,7 @@ async def upload_attachment(
     await request.app.state.event_bus.publish(
         Event(
             type="chat.attachment",
+            run_id=run_id,
             payload={
                 "run_id": run_id,
                 "filename": file.filename,
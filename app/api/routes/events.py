@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlmodel import select
 
 from app.core.artifacts import ArtifactStore
+from app.core.events import EventFilter
 from app.db.models import Run
 from app.db.session import get_session
 
@@ -9,7 +10,15 @@ router = APIRouter()
 
 
 @router.get("/history")
-def events_history(request: Request, run_id: int | None = None) -> dict:
+def events_history(
+    request: Request,
+    run_id: int | None = None,
+    since: int | None = None,
+    after: int | None = None,
+    before: int | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    types: str | None = None,
+) -> dict:
     with get_session() as session:
         run = session.get(Run, int(run_id)) if run_id else None
         if not run:
@@ -24,4 +33,21 @@ def events_history(request: Request, run_id: int | None = None) -> dict:
         if not run:
             return {"run_id": None, "events": []}
     store = ArtifactStore(request.app.state.data_dir)
-    return {"run_id": run.id, "events": store.read_events(run.id)}
+    type_filter = EventFilter.build(types=types) if types else None
+    events, has_more = store.page_events(
+        run.id,
+        after_seq=after if after is not None else since,
+        before_seq=before,
+        limit=limit,
+        types=type_filter.matches_type if type_filter else None,
+    )
+    return {"run_id": run.id, "events": events, **_cursors(events, has_more)}
+
+
+def _cursors(records: list[dict], has_more: bool) -> dict:
+    seqs = [int(record.get("seq") or 0) for record in records]
+    return {
+        "has_more": has_more,
+        "next_after": max(seqs) if seqs else None,
+        "prev_before": min(seqs) if seqs else None,
+    }
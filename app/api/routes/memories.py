@@ -1,23 +1,35 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Query
-from sqlmodel import select
+from fastapi import APIRouter, Depends, Query, Response
+from sqlmodel import func, select
 
+from app.api.pagination import PageParams, paginate
 from app.db.models import AgentMemory
 from app.db.session import get_session
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[AgentMemory])
+@router.get("/")
 def list_memories(
+    response: Response,
     run_id: Optional[int] = Query(default=None),
     agent_id: Optional[int] = Query(default=None),
-) -> List[AgentMemory]:
+    page: PageParams = Depends(),
+) -> List[dict]:
     with get_session() as session:
         statement = select(AgentMemory)
         if run_id is not None:
             statement = statement.where(AgentMemory.run_id == run_id)
         if agent_id is not None:
             statement = statement.where(AgentMemory.agent_id == agent_id)
-        return list(session.exec(statement))
+        return paginate(session, AgentMemory, statement, page, response)
+
+
+@router.get("/counts")
+def count_memories(run_id: Optional[int] = Query(default=None)) -> Dict[int, int]:
+    with get_session() as session:
+        statement = select(AgentMemory.agent_id, func.count()).group_by(AgentMemory.agent_id)
+        if run_id is not None:
+            statement = statement.where(AgentMemory.run_id == run_id)
+        return {agent_id: count for agent_id, count in session.exec(statement) if agent_id}
@@ -25,7 +25,8 @@ async def list_models(
     provider: Optional[str] = Query(default=None),
     only_enabled: bool = Query(default=True),
 ) -> List[dict]:
-    registry = ModelRegistry(request.app.state.secrets_broker)
+    # A fresh model list per request, over the app's pooled connections.
+    registry = ModelRegistry(request.app.state.secrets_broker, request.app.state.model_registry.http)
     enabled = None
     if only_enabled:
         with get_session() as session:
@@ -35,8 +36,8 @@ async def list_models(
 
 
 @router.get("/providers", response_model=List[str])
-def list_providers() -> List[str]:
-    return ModelRegistry().providers()
+def list_providers(request: Request) -> List[str]:
+    return request.app.state.model_registry.providers()
 
 
 @router.get("/recommended", response_model=Dict[str, dict])
@@ -44,7 +45,7 @@ async def list_recommended(
     request: Request,
     only_enabled: bool = Query(default=True),
 ) -> Dict[str, dict]:
-    registry = ModelRegistry(request.app.state.secrets_broker)
+    registry = ModelRegistry(request.app.state.secrets_broker, request.app.state.model_registry.http)
     enabled = None
     if only_enabled:
         with get_session() as session:
@@ -1,3 +1,4 @@
+import json
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Request
@@ -181,6 +182,7 @@ def get_project_settings(request: Request) -> dict:
         "mcp_endpoints": setting.mcp_endpoints,
         "mcp_ports": setting.mcp_ports,
         "enabled_plugins": setting.enabled_plugins,
+        "provider_limits": setting.provider_limits,
     }
 
 
@@ -203,6 +205,7 @@ def update_project_settings(payload: dict, request: Request) -> dict:
     mcp_endpoints = payload.get("mcp_endpoints")
     mcp_ports = payload.get("mcp_ports")
     enabled_plugins = payload.get("enabled_plugins")
+    provider_limits = payload.get("provider_limits")
     with get_session() as session:
         setting = _get_setting(session, project_id)
         if allow_all_tools is not None:
@@ -236,6 +239,10 @@ def update_project_settings(payload: dict, request: Request) -> dict:
             setting.mcp_ports = str(mcp_ports) or None
         if enabled_plugins is not None:
             setting.enabled_plugins = str(enabled_plugins) or None
+        if provider_limits is not None:
+            if isinstance(provider_limits, dict):
+                provider_limits = json.dumps(provider_limits)
+            setting.provider_limits = str(provider_limits) or None
         session.add(setting)
         session.commit()
         session.refresh(setting)
@@ -257,4 +264,5 @@ def update_project_settings(payload: dict, request: Request) -> dict:
         "mcp_endpoints": setting.mcp_endpoints,
         "mcp_ports": setting.mcp_ports,
         "enabled_plugins": setting.enabled_plugins,
+        "provider_limits": setting.provider_limits,
     }
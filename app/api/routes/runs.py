@@ -1,15 +1,15 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from sqlmodel import select
 
 from app.agents.runtime import AgentRuntime
+from app.api.pagination import PageParams, paginate
 from app.core.artifacts import ArtifactStore
 from app.core.events import Event
 from app.core.orchestrator import Orchestrator
 from app.db.models import Run
 from app.db.session import get_session
-from app.providers.model_registry import ModelRegistry
 
 router = APIRouter()
 
@@ -18,9 +18,17 @@ def _get_orchestrator(request: Request) -> Orchestrator:
     settings = request.app.state.settings
     event_bus = request.app.state.event_bus
     mcp_registry = request.app.state.mcp_registry
-    registry = ModelRegistry(request.app.state.secrets_broker)
-    runtime = AgentRuntime(registry, mcp_registry, request.app.state.secrets_broker)
-    artifacts = ArtifactStore(request.app.state.data_dir)
+    runtime = AgentRuntime(
+        request.app.state.model_registry,
+        mcp_registry,
+        request.app.state.secrets_broker,
+        settings.stream_responses,
+        settings.stream_flush_ms / 1000,
+        settings.stream_flush_bytes,
+    )
+    artifacts = ArtifactStore(
+        request.app.state.data_dir, settings.snapshot_max_bytes, settings.compress_snapshots
+    )
     return Orchestrator(
         event_bus,
         artifacts,
@@ -28,6 +36,7 @@ def _get_orchestrator(request: Request) -> Orchestrator:
         request.app.state.active_project_root,
         request.app.state.job_engine,
         request.app.state.verifier,
+        request.app.state.task_dispatcher,
     )
 
 
@@ -42,10 +51,20 @@ def create_run(run: Run, request: Request) -> Run:
         return run
 
 
-@router.get("/", response_model=List[Run])
-def list_runs() -> List[Run]:
+@router.get("/")
+def list_runs(
+    response: Response,
+    project_id: Optional[int] = Query(default=None),
+    status: Optional[str] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(Run)
+    if project_id is not None:
+        statement = statement.where(Run.project_id == project_id)
+    if status is not None:
+        statement = statement.where(Run.status == status)
     with get_session() as session:
-        return list(session.exec(select(Run)))
+        return paginate(session, Run, statement, page, response)
 
 
 @router.get("/{run_id}", response_model=Run)
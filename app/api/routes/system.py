@@ -2,11 +2,16 @@ from pathlib import Path
 import os
 import platform
 
-from fastapi import APIRouter, HTTPException, Request
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from app.core.shell import execute_shell_tool, system_info, is_destructive_command
 from app.core.tool_broker import ToolRequest
-from app.db.models import Run
+from app.repo.file_watcher import watcher_stats
+from app.api.pagination import PageParams, paginate
+from app.db.models import AuditLog, Run
+from app.db.session import get_session
 from sqlmodel import select
 
 router = APIRouter()
@@ -17,6 +22,79 @@ def get_system_info() -> dict:
     return system_info()
 
 
+@router.get("/events")
+def get_event_subscribers(request: Request) -> dict:
+    return {"subscribers": request.app.state.event_bus.stats()}
+
+
+@router.get("/watchers")
+def get_file_watchers() -> dict:
+    return {"watchers": watcher_stats()}
+
+
+@router.get("/audit")
+def get_audit_queue(request: Request) -> dict:
+    return request.app.state.audit_logger.stats()
+
+
+@router.get("/audit/entries")
+def list_audit_entries(
+    response: Response,
+    run_id: Optional[int] = Query(default=None),
+    action: Optional[str] = Query(default=None),
+    decision: Optional[str] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(AuditLog)
+    if run_id is not None:
+        statement = statement.where(AuditLog.run_id == run_id)
+    if action is not None:
+        statement = statement.where(AuditLog.action == action)
+    if decision is not None:
+        statement = statement.where(AuditLog.decision == decision)
+    with get_session() as session:
+        return paginate(session, AuditLog, statement, page, response)
+
+
+@router.get("/config-cache")
+def get_config_cache_stats(request: Request) -> dict:
+    return request.app.state.config_cache.stats()
+
+
+@router.get("/http")
+def get_provider_http(request: Request) -> dict:
+    return request.app.state.model_registry.http.stats()
+
+
+@router.get("/streams")
+def get_stream_stats(request: Request) -> dict:
+    return request.app.state.model_registry.stream_stats()
+
+
+@router.get("/scheduler")
+def get_scheduler_stats(request: Request) -> dict:
+    return request.app.state.model_registry.scheduler.stats()
+
+
+@router.get("/response-cache")
+def get_response_cache_stats(request: Request) -> dict:
+    cache = request.app.state.model_registry.response_cache
+    return cache.stats() if cache else {}
+
+
+@router.delete("/response-cache")
+def clear_response_cache(request: Request) -> dict:
+    cache = request.app.state.model_registry.response_cache
+    if cache:
+        cache.clear()
+    return {"cleared": bool(cache)}
+
+
+@router.get("/loop")
+def get_loop_lag(request: Request) -> dict:
+    return request.app.state.loop_monitor.stats()
+
+
 @router.post("/run")
 def run_system_command(payload: dict, request: Request) -> dict:
     command = payload.get("command")
@@ -1,27 +1,42 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import select
 
-from app.db.models import Task
+from app.api.pagination import PageParams, paginate
+from app.db.models import Run, Task
 from app.db.session import get_session
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Task)
-def create_task(task: Task) -> Task:
+def create_task(task: Task, request: Request) -> Task:
     with get_session() as session:
         session.add(task)
         session.commit()
         session.refresh(task)
-        return task
-
-
-@router.get("/", response_model=List[Task])
-def list_tasks() -> List[Task]:
+    request.app.state.task_dispatcher.notify()
+    return task
+
+
+@router.get("/")
+def list_tasks(
+    response: Response,
+    run_id: Optional[int] = Query(default=None),
+    status: Optional[str] = Query(default=None),
+    project_id: Optional[int] = Query(default=None),
+    page: PageParams = Depends(),
+) -> List[dict]:
+    statement = select(Task)
+    if run_id is not None:
+        statement = statement.where(Task.run_id == run_id)
+    if status is not None:
+        statement = statement.where(Task.status == status)
+    if project_id is not None:
+        statement = statement.where(Task.run_id.in_(select(Run.id).where(Run.project_id == project_id)))
     with get_session() as session:
-        return list(session.exec(select(Task)))
+        return paginate(session, Task, statement, page, response)
 
 
 @router.get("/{task_id}", response_model=Task)
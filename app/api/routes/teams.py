@@ -8,6 +8,7 @@ from sqlmodel import select
 
 from app.core.presets import PRESETS, build_agents
 from app.providers.model_registry import ModelRegistry
+from app.providers.scheduler import INTERACTIVE
 from app.providers.model_filters import (
     filter_chat_models,
     is_chat_model,
@@ -24,8 +25,6 @@ router = APIRouter()
 
 async def _generate_profile(request: Request, role: str, provider: str, model: str) -> tuple[str | None, str | None]:
     registry = request.app.state.orchestrator.agent_runtime.registry
-    broker = request.app.state.secrets_broker
-    token = broker.issue_provider_token(provider) if broker else None
     prompt = (
         "You are generating a concise team member profile for a business-focused AI agent.\n"
         f"Role: {role}\n"
@@ -33,10 +32,8 @@ async def _generate_profile(request: Request, role: str, provider: str, model: s
         "Personality should be 2-3 sentences. Avoid emojis.\n"
     )
     payload = {"prompt": prompt, "role": role}
-    if token:
-        payload["provider_token"] = token.token
     try:
-        response = await registry.invoke(provider, model, payload)
+        response = await registry.invoke(provider, model, payload, priority=INTERACTIVE, cache="profile")
         raw = response.get("content", "")
         data = json.loads(raw)
         return data.get("display_name"), data.get("personality")
@@ -112,7 +109,7 @@ async def apply_preset(team_id: int, payload: dict, request: Request) -> dict:
             select(ProjectSetting).where(ProjectSetting.project_id == team.project_id)
         ).first()
         enabled = [item.provider for item in session.exec(select(ProviderKey))]
-        registry = ModelRegistry(request.app.state.secrets_broker)
+        registry = request.app.state.model_registry
         provider = None if provider in {"auto", ""} else provider
         model = None if model in {"auto", ""} else model
         if provider and model and not is_chat_model(provider, model):
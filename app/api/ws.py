@@ -1,6 +1,10 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.core.events import EventBus
+from app.core.artifacts import ArtifactStore
+from app.core.events import EventBus, Subscriber, SubscriberClosed
 
 router = APIRouter()
 
@@ -9,11 +13,84 @@ router = APIRouter()
 async def events_socket(websocket: WebSocket) -> None:
     await websocket.accept()
     event_bus: EventBus = websocket.app.state.event_bus
-    queue = event_bus.subscribe()
+    client = websocket.client
+    params = websocket.query_params
+    try:
+        queue = event_bus.subscribe(
+            name=f"ws:{client.host}:{client.port}" if client else "ws",
+            run_id=params.getlist("run_id") or None,
+            project_id=params.getlist("project_id") or None,
+            types=",".join(params.getlist("types")) or None,
+        )
+    except ValueError:
+        await websocket.close(code=1008, reason="invalid filters")
+        return
+    # Taken before the first await, so everything newer arrives through the queue.
+    backlog = _backlog(websocket, event_bus, queue, params.get("since"))
+    reader = asyncio.create_task(_read_filters(websocket, event_bus, queue))
     try:
         await websocket.send_text('{"type":"connection.ready","payload":{}}')
-        while True:
-            message = await queue.get()
+        for message in backlog:
             await websocket.send_text(message)
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                break
+            await websocket.send_text(getter.result())
+    except SubscriberClosed:
+        await websocket.close(code=1013, reason="event queue overflow")
     except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
         event_bus.unsubscribe(queue)
+
+
+def _backlog(websocket: WebSocket, event_bus: EventBus, queue: Subscriber, since: str | None) -> list[str]:
+    run_ids = queue.filters.run_ids
+    if since is None or not run_ids or len(run_ids) != 1:
+        return []
+    try:
+        since_seq = int(since)
+    except ValueError:
+        return []
+    run_id = next(iter(run_ids))
+    buffered, oldest = event_bus.replay(run_id, since_seq)
+    replayed: dict[int, str] = {}
+    if oldest is None or oldest > since_seq + 1:
+        # Only the gap between the cursor and the ring buffer comes from disk.
+        store = ArtifactStore(websocket.app.state.data_dir)
+        for event in store.read_events(
+            run_id, after_seq=since_seq, before_seq=oldest, types=queue.filters.matches_type
+        ):
+            replayed.setdefault(int(event.get("seq") or 0), json.dumps(event, ensure_ascii=True))
+    for seq, event_type, message in buffered:
+        if queue.filters.matches_type(event_type):
+            replayed.setdefault(seq, message)
+    return [replayed[seq] for seq in sorted(replayed)]
+
+
+async def _read_filters(websocket: WebSocket, event_bus: EventBus, queue: Subscriber) -> None:
+    while True:
+        try:
+            data = json.loads(await websocket.receive_text())
+        except WebSocketDisconnect:
+            return
+        except Exception:
+            continue
+        if not isinstance(data, dict) or data.get("action") != "subscribe":
+            continue
+        try:
+            event_bus.update_filters(
+                queue,
+                run_id=data.get("run_id"),
+                project_id=data.get("project_id"),
+                types=data.get("types"),
+            )
+        except (TypeError, ValueError):
+            continue
+        await websocket.send_text(
+            json.dumps({"type": "connection.subscribed", "payload": queue.stats()["filters"]})
+        )
@@ -3,6 +3,10 @@ from dataclasses import dataclass
 from pathlib import Path
 import secrets
 
+from app.db.session import DEFAULT_SQLITE_PRAGMAS
+from app.providers.http_pool import parse_timeouts
+from app.providers.scheduler import parse_limits
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -17,6 +21,39 @@ class Settings:
     allow_self_edit: bool
     allow_self_project: bool
     generate_profiles: bool
+    task_sweep_seconds: float
+    max_concurrent_tasks: int
+    agent_concurrency: int
+    provider_concurrency: int
+    task_lease_seconds: float
+    triage_model: str | None
+    event_queue_size: int
+    event_overflow_policy: str
+    event_replay_size: int
+    artifact_flush_ms: int
+    artifact_fsync_seconds: float
+    snapshot_max_bytes: int
+    compress_snapshots: bool
+    watch_debounce_ms: int
+    watch_max_events_per_second: int
+    sqlite_pragmas: dict[str, str]
+    db_threads: int
+    audit_flush_ms: int
+    audit_max_batch: int
+    job_batch_size: int
+    metric_rollups: bool
+    http_max_connections: int
+    http_keepalive: int
+    http2: bool
+    provider_timeouts: dict[str, float]
+    stream_responses: bool
+    stream_flush_ms: int
+    stream_flush_bytes: int
+    provider_limits: dict[str, dict[str, float]]
+    provider_retries: int
+    response_cache_sites: list[str]
+    response_cache_size: int
+    response_cache_ttl: int
 
 
 def load_settings() -> Settings:
@@ -47,6 +84,50 @@ def load_settings() -> Settings:
     allow_self_edit = os.getenv("AI_DEVTEAM_ALLOW_SELF_EDIT", "true").lower() == "true"
     allow_self_project = os.getenv("AI_DEVTEAM_ALLOW_SELF_PROJECT", "false").lower() == "true"
     generate_profiles = os.getenv("AI_DEVTEAM_GENERATE_PROFILES", "true").lower() == "true"
+    task_sweep_seconds = float(os.getenv("AI_DEVTEAM_TASK_SWEEP_SECONDS", "30"))
+    max_concurrent_tasks = int(os.getenv("AI_DEVTEAM_MAX_CONCURRENT_TASKS", "8"))
+    agent_concurrency = int(os.getenv("AI_DEVTEAM_AGENT_CONCURRENCY", "1"))
+    provider_concurrency = int(os.getenv("AI_DEVTEAM_PROVIDER_CONCURRENCY", "4"))
+    task_lease_seconds = float(os.getenv("AI_DEVTEAM_TASK_LEASE_SECONDS", "120"))
+    triage_model = os.getenv("AI_DEVTEAM_TRIAGE_MODEL") or None
+    event_queue_size = int(os.getenv("AI_DEVTEAM_EVENT_QUEUE_SIZE", "1000"))
+    event_overflow_policy = os.getenv("AI_DEVTEAM_EVENT_OVERFLOW", "drop_oldest")
+    event_replay_size = int(os.getenv("AI_DEVTEAM_EVENT_REPLAY_SIZE", "500"))
+    artifact_flush_ms = int(os.getenv("AI_DEVTEAM_ARTIFACT_FLUSH_MS", "50"))
+    artifact_fsync_seconds = float(os.getenv("AI_DEVTEAM_ARTIFACT_FSYNC_SECONDS", "0"))
+    snapshot_max_bytes = int(os.getenv("AI_DEVTEAM_SNAPSHOT_MAX_BYTES", "1000000"))
+    compress_snapshots = os.getenv("AI_DEVTEAM_SNAPSHOT_COMPRESS", "true").lower() == "true"
+    watch_debounce_ms = int(os.getenv("AI_DEVTEAM_WATCH_DEBOUNCE_MS", "250"))
+    watch_max_events_per_second = int(os.getenv("AI_DEVTEAM_WATCH_MAX_EVENTS", "200"))
+    sqlite_pragmas = dict(DEFAULT_SQLITE_PRAGMAS)
+    for item in os.getenv("AI_DEVTEAM_SQLITE_PRAGMAS", "").split(","):
+        name, _, value = item.partition("=")
+        name, value = name.strip().lower(), value.strip()
+        if not name.isidentifier():
+            continue
+        if value:
+            sqlite_pragmas[name] = value
+        else:
+            sqlite_pragmas.pop(name, None)
+    db_threads = int(os.getenv("AI_DEVTEAM_DB_THREADS", "4"))
+    audit_flush_ms = int(os.getenv("AI_DEVTEAM_AUDIT_FLUSH_MS", "50"))
+    audit_max_batch = int(os.getenv("AI_DEVTEAM_AUDIT_MAX_BATCH", "256"))
+    job_batch_size = int(os.getenv("AI_DEVTEAM_JOB_BATCH", "1"))
+    metric_rollups = os.getenv("AI_DEVTEAM_METRIC_ROLLUPS", "false").lower() == "true"
+    http_max_connections = int(os.getenv("AI_DEVTEAM_HTTP_MAX_CONNECTIONS", "20"))
+    http_keepalive = int(os.getenv("AI_DEVTEAM_HTTP_KEEPALIVE", "10"))
+    http2 = os.getenv("AI_DEVTEAM_HTTP2", "false").lower() == "true"
+    provider_timeouts = parse_timeouts(os.getenv("AI_DEVTEAM_PROVIDER_TIMEOUTS", ""))
+    stream_responses = os.getenv("AI_DEVTEAM_STREAM", "true").lower() == "true"
+    stream_flush_ms = int(os.getenv("AI_DEVTEAM_STREAM_FLUSH_MS", "100"))
+    stream_flush_bytes = int(os.getenv("AI_DEVTEAM_STREAM_FLUSH_BYTES", "256"))
+    provider_limits = parse_limits(os.getenv("AI_DEVTEAM_PROVIDER_LIMITS", "concurrency=8"))
+    provider_retries = int(os.getenv("AI_DEVTEAM_PROVIDER_RETRIES", "3"))
+    response_cache_sites = [
+        site.strip() for site in os.getenv("AI_DEVTEAM_RESPONSE_CACHE", "").split(",") if site.strip()
+    ]
+    response_cache_size = int(os.getenv("AI_DEVTEAM_RESPONSE_CACHE_SIZE", "1000"))
+    response_cache_ttl = int(os.getenv("AI_DEVTEAM_RESPONSE_CACHE_TTL", "86400"))
     return Settings(
         repo_root=repo_root,
         data_dir=data_dir,
@@ -59,4 +140,37 @@ def load_settings() -> Settings:
         allow_self_edit=allow_self_edit,
         allow_self_project=allow_self_project,
         generate_profiles=generate_profiles,
+        task_sweep_seconds=task_sweep_seconds,
+        max_concurrent_tasks=max_concurrent_tasks,
+        agent_concurrency=agent_concurrency,
+        provider_concurrency=provider_concurrency,
+        task_lease_seconds=task_lease_seconds,
+        triage_model=triage_model,
+        event_queue_size=event_queue_size,
+        event_overflow_policy=event_overflow_policy,
+        event_replay_size=event_replay_size,
+        artifact_flush_ms=artifact_flush_ms,
+        artifact_fsync_seconds=artifact_fsync_seconds,
+        snapshot_max_bytes=snapshot_max_bytes,
+        compress_snapshots=compress_snapshots,
+        watch_debounce_ms=watch_debounce_ms,
+        watch_max_events_per_second=watch_max_events_per_second,
+        sqlite_pragmas=sqlite_pragmas,
+        db_threads=db_threads,
+        audit_flush_ms=audit_flush_ms,
+        audit_max_batch=audit_max_batch,
+        job_batch_size=job_batch_size,
+        metric_rollups=metric_rollups,
+        http_max_connections=http_max_connections,
+        http_keepalive=http_keepalive,
+        http2=http2,
+        provider_timeouts=provider_timeouts,
+        stream_responses=stream_responses,
+        stream_flush_ms=stream_flush_ms,
+        stream_flush_bytes=stream_flush_bytes,
+        provider_limits=provider_limits,
+        provider_retries=provider_retries,
+        response_cache_sites=response_cache_sites,
+        response_cache_size=response_cache_size,
+        response_cache_ttl=response_cache_ttl,
     )
@@ -0,0 +1,231 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+
+# Held while a batch is written, so index readers never observe half of an append.
+io_lock = threading.RLock()
+
+_writer: Optional["ArtifactWriter"] = None
+
+
+@dataclass
+class _Write:
+    path: Path
+    data: bytes
+    index_path: Optional[Path] = None
+    index_line: Optional[Callable[[int], bytes]] = None
+
+
+class ArtifactWriter:
+    def __init__(
+        self,
+        flush_interval: float = 0.05,
+        fsync_interval: float = 0.0,
+        max_batch: int = 512,
+        max_open_files: int = 128,
+    ) -> None:
+        self.flush_interval = max(0.0, flush_interval)
+        self.fsync_interval = max(0.0, fsync_interval)
+        self.max_batch = max(1, max_batch)
+        self.max_open_files = max(2, max_open_files)
+        self.written = 0
+        self.batches = 0
+        self._queue: "queue.SimpleQueue[Optional[_Write]]" = queue.SimpleQueue()
+        self._handles: "OrderedDict[Path, BinaryIO]" = OrderedDict()
+        self._positions: dict[Path, int] = {}
+        self._pending: dict[Path, int] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._last_fsync = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def append(
+        self,
+        path: Path,
+        data: bytes,
+        index_path: Optional[Path] = None,
+        index_line: Optional[Callable[[int], bytes]] = None,
+    ) -> None:
+        self._submit(_Write(path, data, index_path, index_line))
+
+    def pending(self, path: Optional[Path] = None) -> int:
+        with self._condition:
+            if path is None:
+                return sum(self._pending.values())
+            return self._pending.get(path, 0)
+
+    def flush(self, path: Optional[Path] = None, timeout: float = 5.0) -> bool:
+        if not self.pending(path):
+            return True
+        if not self.running:
+            return False
+        # Cut the current batch short instead of waiting out the flush interval.
+        self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while (self._pending.get(path, 0) if path else sum(self._pending.values())) > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def release(self, path: Path) -> None:
+        self.flush(path)
+        with io_lock:
+            self._release(path)
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._thread is None:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        with io_lock:
+            self._close_handles()
+
+    def _submit(self, item: _Write) -> None:
+        with self._condition:
+            self._pending[item.path] = self._pending.get(item.path, 0) + 1
+        if self.running:
+            self._queue.put(item)
+            return
+        # Not started (tests, scripts): write through on the caller's thread.
+        self._write_batch([item])
+        with io_lock:
+            self._close_handles()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item] if item else []
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            if batch:
+                self._write_batch(batch)
+            if self._closed and self._queue.empty():
+                return
+
+    def _write_batch(self, batch: list[_Write]) -> None:
+        records: dict[int, BinaryIO] = {}
+        indexes: dict[int, BinaryIO] = {}
+        with io_lock:
+            for item in batch:
+                try:
+                    record, index = self._write(item)
+                except Exception:
+                    continue
+                records[id(record)] = record
+                if index is not None:
+                    indexes[id(index)] = index
+            # Records reach the file before their index lines do.
+            for handle in [*records.values(), *indexes.values()]:
+                try:
+                    handle.flush()
+                except Exception:
+                    continue
+            if self.fsync_interval and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                for handle in self._handles.values():
+                    try:
+                        os.fsync(handle.fileno())
+                    except Exception:
+                        continue
+                self._last_fsync = time.monotonic()
+        self.written += len(batch)
+        self.batches += 1
+        with self._condition:
+            for item in batch:
+                count = self._pending.get(item.path, 0) - 1
+                if count > 0:
+                    self._pending[item.path] = count
+                else:
+                    self._pending.pop(item.path, None)
+            self._condition.notify_all()
+
+    def _write(self, item: _Write) -> tuple[BinaryIO, Optional[BinaryIO]]:
+        handle = self._handle(item.path)
+        offset = self._positions[item.path]
+        handle.write(item.data)
+        self._positions[item.path] = offset + len(item.data)
+        if item.index_path is None or item.index_line is None:
+            return handle, None
+        index = self._handle(item.index_path)
+        line = item.index_line(offset)
+        index.write(line)
+        self._positions[item.index_path] += len(line)
+        return handle, index
+
+    def _handle(self, path: Path) -> BinaryIO:
+        handle = self._handles.get(path)
+        if handle is not None and not handle.closed:
+            self._handles.move_to_end(path)
+            return handle
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = path.open("ab")
+        self._positions[path] = handle.seek(0, 2)
+        self._handles[path] = handle
+        while len(self._handles) > self.max_open_files:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        return handle
+
+    def _release(self, path: Path) -> None:
+        handle = self._handles.pop(path, None)
+        self._positions.pop(path, None)
+        if handle is not None:
+            handle.close()
+
+    def _close_handles(self) -> None:
+        for handle in self._handles.values():
+            try:
+                handle.flush()
+                if self.fsync_interval:
+                    os.fsync(handle.fileno())
+                handle.close()
+            except Exception:
+                continue
+        self._handles.clear()
+        self._positions.clear()
+
+
+def get_writer() -> ArtifactWriter:
+    global _writer
+    if _writer is None:
+        _writer = ArtifactWriter()
+    return _writer
+
+
+def configure_writer(flush_interval: float, fsync_interval: float) -> ArtifactWriter:
+    global _writer
+    if _writer is not None:
+        _writer.close()
+    _writer = ArtifactWriter(flush_interval, fsync_interval)
+    _writer.start()
+    atexit.register(_writer.close)
+    return _writer
@@ -1,68 +1,156 @@
-import hashlib
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.jsonl_log import IndexEntry, JsonlLog, format_entry
+from app.core.snapshots import SnapshotStore
+
+
+_chat_seq_lock = threading.Lock()
+_chat_seq: dict[tuple[Path, int], int] = {}
+_event_seq_lock = threading.Lock()
+_event_seq: dict[tuple[Path, int], int] = {}
+_chat_migrate_lock = threading.Lock()
+_migrated_chat_dirs: set[str] = set()
+_ready_run_dirs: set[tuple[Path, int]] = set()
+_event_logs: dict[tuple[Path, int], JsonlLog] = {}
+_chat_logs: dict[tuple[Path, int], JsonlLog] = {}
+
+CHAT_LOG = "chat.jsonl"
 
 
 class ArtifactStore:
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(
+        self, base_dir: Path, snapshot_max_bytes: int = 1_000_000, compress_snapshots: bool = True
+    ) -> None:
         self.base_dir = base_dir
+        self.snapshots = SnapshotStore(base_dir, snapshot_max_bytes, compress_snapshots)
 
     def _run_dir(self, run_id: int) -> Path:
         return self.base_dir / "runs" / str(run_id)
 
     def _ensure_dirs(self, run_id: int) -> None:
+        key = (self.base_dir, run_id)
+        if key in _ready_run_dirs:
+            return
         run_dir = self._run_dir(run_id)
         for folder in ("chats", "artifacts", "events", "snapshots"):
             (run_dir / folder).mkdir(parents=True, exist_ok=True)
+        _ready_run_dirs.add(key)
 
     def write_event(self, run_id: int, event: Dict[str, Any]) -> Path:
         self._ensure_dirs(run_id)
-        path = self._run_dir(run_id) / "events" / "events.jsonl"
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(event, ensure_ascii=True) + "\n")
-        return path
+        if event.get("seq") is None:
+            event["seq"] = self.next_event_seq(run_id)
+        log = self._event_log(run_id)
+        log.append(event)
+        return log.path
 
-    def read_events(self, run_id: int) -> list[dict]:
-        path = self._run_dir(run_id) / "events" / "events.jsonl"
-        if not path.exists():
-            return []
-        messages: list[dict] = []
-        try:
-            contents = path.read_text(encoding="utf-8").splitlines()
-        except Exception:
-            return []
-        for line in contents:
-            try:
-                messages.append(json.loads(line))
-            except Exception:
-                continue
-        return messages
+    def next_event_seq(self, run_id: int) -> int:
+        key = (self.base_dir, run_id)
+        with _event_seq_lock:
+            if key not in _event_seq:
+                _event_seq[key] = self._event_log(run_id).head_seq()
+            _event_seq[key] += 1
+            return _event_seq[key]
+
+    def read_events(
+        self,
+        run_id: int,
+        after_seq: Optional[int] = None,
+        before_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        types: Optional[Callable[[str], bool]] = None,
+    ) -> list[dict]:
+        return self.page_events(run_id, after_seq, before_seq, limit, types)[0]
+
+    def page_events(
+        self,
+        run_id: int,
+        after_seq: Optional[int] = None,
+        before_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        types: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[list[dict], bool]:
+        return self._event_log(run_id).page(after_seq, before_seq, limit, types)
 
     def write_chat(self, run_id: int, role: str, message: Dict[str, Any]) -> Path:
         self._ensure_dirs(run_id)
-        path = self._run_dir(run_id) / "chats" / f"{role}.jsonl"
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(message, ensure_ascii=True) + "\n")
-        return path
+        log = self._chat_log(run_id)
+        key = (self.base_dir, run_id)
+        # Numbering and appending under one lock keeps the log seq-ordered by construction.
+        with _chat_seq_lock:
+            if key not in _chat_seq:
+                _chat_seq[key] = log.head_seq()
+            _chat_seq[key] += 1
+            message["seq"] = _chat_seq[key]
+            log.append(message, kind=role)
+        return log.path
 
-    def read_chats(self, run_id: int) -> list[dict]:
-        run_dir = self._run_dir(run_id) / "chats"
-        if not run_dir.exists():
-            return []
-        messages: list[dict] = []
-        for item in run_dir.glob("*.jsonl"):
-            try:
-                contents = item.read_text(encoding="utf-8").splitlines()
-            except Exception:
-                continue
-            for line in contents:
-                try:
-                    messages.append(json.loads(line))
-                except Exception:
-                    continue
-        messages.sort(key=lambda msg: msg.get("timestamp", ""))
-        return messages
+    def read_chats(
+        self,
+        run_id: int,
+        after_seq: Optional[int] = None,
+        before_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        roles: Optional[Iterable[str]] = None,
+    ) -> list[dict]:
+        return self.page_chats(run_id, after_seq, before_seq, limit, roles)[0]
+
+    def page_chats(
+        self,
+        run_id: int,
+        after_seq: Optional[int] = None,
+        before_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+        roles: Optional[Iterable[str]] = None,
+    ) -> Tuple[list[dict], bool]:
+        wanted = set(roles) if roles else None
+        return self._chat_log(run_id).page(
+            after_seq, before_seq, limit, wanted.__contains__ if wanted else None
+        )
+
+    def head_chat_seq(self, run_id: int) -> int:
+        key = (self.base_dir, run_id)
+        with _chat_seq_lock:
+            if key not in _chat_seq:
+                _chat_seq[key] = self._chat_log(run_id).head_seq()
+            return _chat_seq[key]
+
+    def migrate_chats(self, run_id: int) -> int:
+        chat_dir = self._run_dir(run_id) / "chats"
+        key = str(chat_dir)
+        if key in _migrated_chat_dirs:
+            return 0
+        with _chat_migrate_lock:
+            if key in _migrated_chat_dirs:
+                return 0
+            legacy = (
+                [path for path in sorted(chat_dir.glob("*.jsonl")) if path.name != CHAT_LOG]
+                if chat_dir.exists()
+                else []
+            )
+            if legacy:
+                _merge_chat_files(chat_dir, legacy)
+            _migrated_chat_dirs.add(key)
+            return len(legacy)
+
+    def _chat_log(self, run_id: int) -> JsonlLog:
+        key = (self.base_dir, run_id)
+        log = _chat_logs.get(key)
+        if log is None:
+            self.migrate_chats(run_id)
+            log = _chat_logs[key] = JsonlLog(self._run_dir(run_id) / "chats" / CHAT_LOG, "role")
+        return log
+
+    def _event_log(self, run_id: int) -> JsonlLog:
+        key = (self.base_dir, run_id)
+        log = _event_logs.get(key)
+        if log is None:
+            log = _event_logs[key] = JsonlLog(self._run_dir(run_id) / "events" / "events.jsonl")
+        return log
 
     def write_artifact(self, run_id: int, artifact: Dict[str, Any]) -> Path:
         self._ensure_dirs(run_id)
@@ -72,14 +160,62 @@ class ArtifactStore:
             handle.write(json.dumps(artifact, ensure_ascii=True, indent=2))
         return path
 
-    def write_snapshot(self, run_id: int, file_path: str, contents: str) -> Path:
-        self._ensure_dirs(run_id)
-        safe_name = file_path.replace(":", "").replace("/", "_").replace("\\", "_")
-        if len(safe_name) > 120:
-            digest = hashlib.sha256(file_path.encode("utf-8")).hexdigest()[:16]
-            base = Path(file_path).name.replace(":", "") or "snapshot"
-            safe_name = f"{base}_{digest}"
-        path = self._run_dir(run_id) / "snapshots" / f"{safe_name}.txt"
-        with path.open("w", encoding="utf-8") as handle:
-            handle.write(contents)
-        return path
+    def write_snapshot(self, run_id: int, file_path: str, contents: str | bytes) -> dict:
+        data = contents.encode("utf-8") if isinstance(contents, str) else contents
+        return self.snapshots.save(run_id, file_path, data)
+
+
+def _merge_chat_files(chat_dir: Path, legacy: list[Path]) -> None:
+    merged = JsonlLog(chat_dir / CHAT_LOG, "role")
+    records: list[tuple[str, dict]] = []
+    if merged.path.exists():
+        records.extend((str(record.get("role") or ""), record) for record in merged.page()[0])
+    for path in legacy:
+        role = path.stem
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except Exception:
+            continue
+        for line in lines:
+            try:
+                records.append((role, json.loads(line)))
+            except Exception:
+                continue
+    # A crash after the swap but before archiving leaves legacy files to merge again. Their copies
+    # lack the seq given on the first pass, so duplicates match without it and the merged one wins.
+    unique: dict[str, tuple[str, dict]] = {}
+    for role, record in records:
+        fields = {name: value for name, value in record.items() if name != "seq"}
+        unique.setdefault(json.dumps(fields, sort_keys=True), (role, record))
+    # Pre-sequence messages are numbered 1..N in timestamp order; numbered ones keep their order after them.
+    unnumbered = sorted(
+        (item for item in unique.values() if not item[1].get("seq")),
+        key=lambda item: str(item[1].get("timestamp") or ""),
+    )
+    numbered = sorted(
+        (item for item in unique.values() if item[1].get("seq")),
+        key=lambda item: (int(item[1]["seq"]), str(item[1].get("timestamp") or "")),
+    )
+    records = unnumbered + numbered
+    for seq, (_, record) in enumerate(records, start=1):
+        record["seq"] = seq
+    data = bytearray()
+    index = []
+    for role, record in records:
+        line = (json.dumps(record, ensure_ascii=True) + "\n").encode("utf-8")
+        index.append(format_entry(IndexEntry(record["seq"], len(data), len(line), role)))
+        data.extend(line)
+    staging = chat_dir / f"{CHAT_LOG}.migrating"
+    staging.write_bytes(bytes(data))
+    merged.forget()
+    merged.index_path.unlink(missing_ok=True)
+    os.replace(staging, merged.path)
+    merged.index_path.write_text("".join(index), encoding="utf-8")
+    merged.forget()
+    archive = chat_dir / "legacy"
+    archive.mkdir(exist_ok=True)
+    for path in legacy:
+        os.replace(path, archive / path.name)
+        index_path = path.with_suffix(".idx")
+        if index_path.exists():
+            os.replace(index_path, archive / index_path.name)
@@ -1,10 +1,16 @@
+import atexit
 import json
-from dataclasses import dataclass
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
+from sqlmodel import Session
+
 from app.db.models import AuditLog
-from app.db.session import get_session
+from app.db.session import get_engine
 
 
 @dataclass
@@ -18,22 +24,145 @@ class AuditEntry:
     result: Optional[dict[str, Any]] = None
     run_id: Optional[int] = None
     job_id: Optional[int] = None
-    created_at: str = datetime.utcnow().isoformat()
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
 class AuditLogger:
-    def log(self, entry: AuditEntry) -> None:
-        record = AuditLog(
-            run_id=entry.run_id,
-            job_id=entry.job_id,
-            actor=entry.actor,
-            action=entry.action,
-            tool_name=entry.tool_name,
-            risk_level=entry.risk_level,
-            decision=entry.decision,
-            request=json.dumps(entry.request or {}, ensure_ascii=True),
-            result=json.dumps(entry.result or {}, ensure_ascii=True),
-        )
-        with get_session() as session:
-            session.add(record)
-            session.commit()
+    def __init__(self, flush_interval: float = 0.05, max_batch: int = 256) -> None:
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_batch = max(1, max_batch)
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self._queue: "queue.SimpleQueue[Optional[tuple[Any, AuditLog]]]" = queue.SimpleQueue()
+        self._queued = 0
+        self._done = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, entry: AuditEntry, durable: bool = False) -> bool:
+        # The engine is captured now so a project switch cannot redirect queued entries.
+        item = (get_engine(), _record(entry))
+        if durable or not self.running:
+            # Written on the caller's thread, so the answer reflects a committed row.
+            return self._write_batch([item]) == 1
+        with self._condition:
+            self._queued += 1
+        self._queue.put(item)
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        with self._condition:
+            target = self._queued
+            if self._done >= target:
+                return True
+        if not self.running:
+            return False
+        self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._done < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stats(self) -> dict:
+        with self._condition:
+            pending = self._queued - self._done
+        return {
+            "pending": pending,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._thread is None:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item] if item else []
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            if batch:
+                self._write_batch(batch)
+                with self._condition:
+                    self._done += len(batch)
+                    self._condition.notify_all()
+            if self._closed and self._queue.empty():
+                return
+
+    def _write_batch(self, batch: list[tuple[Any, AuditLog]]) -> int:
+        written = 0
+        groups: dict[int, tuple[Any, list[AuditLog]]] = {}
+        for engine, record in batch:
+            groups.setdefault(id(engine), (engine, []))[1].append(record)
+        for engine, records in groups.values():
+            try:
+                with Session(engine) as session:
+                    session.add_all(records)
+                    session.commit()
+                written += len(records)
+            except Exception:
+                # One bad row (e.g. a run deleted meanwhile) must not lose the rest of the window.
+                written += sum(self._write_one(engine, record) for record in records)
+        self.written += written
+        self.batches += 1
+        return written
+
+    def _write_one(self, engine, record: AuditLog) -> bool:
+        try:
+            with Session(engine) as session:
+                session.add(AuditLog.model_validate(record.model_dump()))
+                session.commit()
+            return True
+        except Exception:
+            self.failed += 1
+            return False
+
+
+def _record(entry: AuditEntry) -> AuditLog:
+    try:
+        created_at = datetime.fromisoformat(entry.created_at)
+    except (TypeError, ValueError):
+        created_at = datetime.utcnow()
+    return AuditLog(
+        run_id=entry.run_id,
+        job_id=entry.job_id,
+        actor=entry.actor,
+        action=entry.action,
+        tool_name=entry.tool_name,
+        risk_level=entry.risk_level,
+        decision=entry.decision,
+        request=json.dumps(entry.request or {}, ensure_ascii=True),
+        result=json.dumps(entry.result or {}, ensure_ascii=True),
+        created_at=created_at,
+    )
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.db.models import ChatCursor
+from app.db.session import get_session
+
+
+class ChatCursorStore:
+    def load(self, run_id: int, agent_ids: Iterable[int], start_seq: int) -> dict[int, int]:
+        agent_ids = [agent_id for agent_id in agent_ids if agent_id]
+        if not agent_ids:
+            return {}
+        with get_session() as session:
+            cursors = self._read(session, run_id, agent_ids)
+            missing = [agent_id for agent_id in agent_ids if agent_id not in cursors]
+            if not missing:
+                return cursors
+            # New readers start at the head so history is never replayed to the model.
+            for agent_id in missing:
+                session.add(ChatCursor(run_id=run_id, agent_id=agent_id, last_seq=start_seq))
+            try:
+                session.commit()
+            except IntegrityError:
+                # Another process created some of them first; theirs are the cursors to use.
+                session.rollback()
+                for agent_id in missing:
+                    self._insert(run_id, agent_id, start_seq)
+                return self._read(session, run_id, agent_ids)
+            cursors.update({agent_id: start_seq for agent_id in missing})
+        return cursors
+
+    def advance(self, run_id: int, agent_id: int, seq: int) -> None:
+        with get_session() as session:
+            result = session.exec(
+                update(ChatCursor)
+                .where(
+                    ChatCursor.run_id == run_id,
+                    ChatCursor.agent_id == agent_id,
+                    ChatCursor.last_seq < seq,
+                )
+                .values(last_seq=seq, updated_at=datetime.utcnow())
+            )
+            session.commit()
+            if result.rowcount:
+                return
+        if not self._insert(run_id, agent_id, seq):
+            # Lost the insert race; fold our position into the winner's row.
+            self.advance(run_id, agent_id, seq)
+
+    def _read(self, session, run_id: int, agent_ids: list[int]) -> dict[int, int]:
+        rows = session.exec(
+            select(ChatCursor).where(
+                ChatCursor.run_id == run_id,
+                ChatCursor.agent_id.in_(agent_ids),
+            )
+        )
+        return {row.agent_id: row.last_seq for row in rows}
+
+    def _insert(self, run_id: int, agent_id: int, seq: int) -> bool:
+        with get_session() as session:
+            if self._read(session, run_id, [agent_id]):
+                return True
+            session.add(ChatCursor(run_id=run_id, agent_id=agent_id, last_seq=seq))
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                return False
+            return True
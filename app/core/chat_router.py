@@ -1,10 +1,10 @@
+import json
 import re
+from dataclasses import dataclass
 from typing import List, Optional
 
-from sqlmodel import select
-
+from app.core.config_cache import get_config_cache
 from app.db.models import AgentConfig
-from app.db.session import get_session
 
 
 MANAGER_ROLES = {"Product Owner", "Delivery Manager", "Release Manager"}
@@ -17,39 +17,139 @@ ROLE_ALIASES = {
     "qa engineer": {"qa", "tester", "test"},
     "release manager": {"rm", "release"},
 }
+ROLE_KEYWORDS = {
+    "qa": ["test", "bug", "regression", "qa", "verify"],
+    "devops": ["deploy", "ci", "pipeline", "infra", "release"],
+    "docs": ["docs", "documentation", "readme", "guide"],
+    "dev": ["code", "implement", "fix", "refactor", "build"],
+    "pm": ["scope", "plan", "requirements", "roadmap"],
+}
+
+
+@dataclass
+class TriageResult:
+    responders: List[AgentConfig]
+    candidates: int
+    used_model: bool = False
+
+    @property
+    def avoided(self) -> int:
+        return max(0, self.candidates - len(self.responders))
 
 
 class ChatRouter:
-    def __init__(self) -> None:
-        self._mention_pattern = re.compile(r"@([\\w\\-]+)")
+    def __init__(self, registry=None, triage_model: str | None = None, secrets_broker=None) -> None:
+        self._mention_pattern = re.compile(r"@([\w\-]+)")
+        self.registry = registry
+        self.triage_model = triage_model
+        self.secrets_broker = secrets_broker
+        self.calls_avoided: dict[int, int] = {}
+        self.model_calls: dict[int, int] = {}
 
     def resolve_targets(
         self, team_id: int, message: str, policy: str = "managers"
     ) -> List[AgentConfig]:
-        mentions = self._extract_mentions(message)
-        with get_session() as session:
-            agents = list(session.exec(select(AgentConfig).where(AgentConfig.team_id == team_id)))
+        mentions = self.extract_mentions(message)
+        agents = get_config_cache().roster(team_id)
         if mentions:
             if any(mention in TEAM_MENTIONS for mention in mentions):
                 return agents
-            selected: list[AgentConfig] = []
-            for agent in agents:
-                display = (agent.display_name or "").lower()
-                role = agent.role.lower()
-                aliases = ROLE_ALIASES.get(role, set())
-                if any(
-                    mention == display
-                    or mention == role.replace(" ", "")
-                    or mention in aliases
-                    for mention in mentions
-                ):
-                    selected.append(agent)
+            selected = self._match_mentions(agents, mentions)
             if selected:
                 return selected
         if policy == "team":
             return agents
         return [agent for agent in agents if agent.role in MANAGER_ROLES]
 
-    def _extract_mentions(self, message: str) -> List[str]:
+    async def triage(
+        self, message: dict, agents: List[AgentConfig], run_id: Optional[int] = None
+    ) -> TriageResult:
+        sender = str(message.get("agent") or "").lower()
+        sender_role = str(message.get("role") or "").lower()
+        content = str(message.get("content") or "")
+        candidates = [
+            agent
+            for agent in agents
+            if agent.id
+            and sender not in {(agent.display_name or "").lower(), agent.role.lower()}
+        ]
+        result = TriageResult(responders=[], candidates=len(candidates))
+        mentions = self.extract_mentions(content)
+        if mentions:
+            if any(mention in TEAM_MENTIONS for mention in mentions):
+                result.responders = candidates
+            else:
+                result.responders = self._match_mentions(candidates, mentions)
+        if not result.responders and not mentions:
+            result.responders = self._match_keywords(candidates, content)
+        if not result.responders and candidates and self.registry and self.triage_model:
+            result.responders = await self._ask_model(candidates, sender, content)
+            result.used_model = True
+        if not result.responders and sender_role not in {"system", *(r.lower() for r in MANAGER_ROLES)}:
+            result.responders = [agent for agent in candidates if agent.role in MANAGER_ROLES]
+        if run_id:
+            self.calls_avoided[run_id] = self.calls_avoided.get(run_id, 0) + result.avoided
+            if result.used_model:
+                self.model_calls[run_id] = self.model_calls.get(run_id, 0) + 1
+        return result
+
+    def extract_mentions(self, message: str) -> List[str]:
         matches = self._mention_pattern.findall(message or "")
         return [match.lower().replace("@", "") for match in matches if match]
+
+    def _match_mentions(self, agents: List[AgentConfig], mentions: List[str]) -> List[AgentConfig]:
+        selected: list[AgentConfig] = []
+        for agent in agents:
+            display = (agent.display_name or "").lower()
+            role = agent.role.lower()
+            aliases = ROLE_ALIASES.get(role, set())
+            if any(
+                mention == display
+                or mention == role.replace(" ", "")
+                or mention in aliases
+                for mention in mentions
+            ):
+                selected.append(agent)
+        return selected
+
+    def _match_keywords(self, agents: List[AgentConfig], content: str) -> List[AgentConfig]:
+        words = set(re.findall(r"\w+", content.lower()))
+        hits = {key for key, keywords in ROLE_KEYWORDS.items() if words.intersection(keywords)}
+        if not hits:
+            return []
+        return [agent for agent in agents if any(key in agent.role.lower() for key in hits)]
+
+    async def _ask_model(
+        self, candidates: List[AgentConfig], sender: str, content: str
+    ) -> List[AgentConfig]:
+        provider, _, model = self.triage_model.partition(":")
+        if not model:
+            return []
+        roster = "\n".join(
+            f"- {agent.display_name or agent.role} ({agent.role})" for agent in candidates
+        )
+        prompt = (
+            "You route team chat messages. Decide which teammates must respond.\n"
+            f"Team:\n{roster}\n\n"
+            f"From: {sender}\nMessage: {content}\n\n"
+            'Return ONLY a JSON array of names, e.g. ["Ava"]. Return [] if nobody needs to respond.'
+        )
+        payload = {"prompt": prompt, "role": "router"}
+        if self.secrets_broker:
+            token = self.secrets_broker.issue_provider_token(provider)
+            if token:
+                payload["provider_token"] = token.token
+        try:
+            response = await self.registry.invoke(provider, model, payload)
+            raw = str(response.get("content") or "")
+            names = json.loads(raw[raw.find("[") : raw.rfind("]") + 1])
+        except Exception:
+            return []
+        if not isinstance(names, list):
+            return []
+        wanted = {str(name).strip().lower() for name in names}
+        return [
+            agent
+            for agent in candidates
+            if (agent.display_name or "").lower() in wanted or agent.role.lower() in wanted
+        ]
@@ -0,0 +1,177 @@
+import threading
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlmodel import Session, select
+
+from app.db.models import AgentConfig, ProjectSetting, Run, Team
+from app.db.session import get_engine, get_session
+
+CHANGED_KEY = "config_cache.changed"
+# Rewritten on every memory append and never read by the loops.
+_VOLATILE_AGENT_FIELDS = {"memory_summary"}
+
+_cache: Optional["ConfigCache"] = None
+_cache_lock = threading.Lock()
+
+
+class ConfigCache:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._settings: dict[tuple[str, int], Optional[dict]] = {}
+        self._rosters: dict[tuple[str, int], list[dict]] = {}
+        self._run_projects: dict[tuple[str, int], int] = {}
+        self.listeners: list[Callable[[set[int], set[int]], None]] = []
+
+    def setting(self, project_id: Optional[int]) -> Optional[ProjectSetting]:
+        if project_id is None:
+            return None
+        key = (_url(), project_id)
+        with self._lock:
+            if key in self._settings:
+                self.hits += 1
+                data = self._settings[key]
+                return ProjectSetting.model_validate(data) if data else None
+            self.misses += 1
+            generation = self._generation
+        with get_session() as session:
+            setting = session.exec(
+                select(ProjectSetting).where(ProjectSetting.project_id == project_id)
+            ).first()
+            data = setting.model_dump() if setting else None
+        self._store(self._settings, key, data, generation)
+        return ProjectSetting.model_validate(data) if data else None
+
+    def roster(self, team_id: Optional[int]) -> list[AgentConfig]:
+        if team_id is None:
+            return []
+        key = (_url(), team_id)
+        with self._lock:
+            if key in self._rosters:
+                self.hits += 1
+                return [AgentConfig.model_validate(data) for data in self._rosters[key]]
+            self.misses += 1
+            generation = self._generation
+        with get_session() as session:
+            rows = [
+                agent.model_dump()
+                for agent in session.exec(select(AgentConfig).where(AgentConfig.team_id == team_id))
+            ]
+        self._store(self._rosters, key, rows, generation)
+        return [AgentConfig.model_validate(data) for data in rows]
+
+    def project_for_run(self, run_id: Optional[int]) -> Optional[int]:
+        if not run_id:
+            return None
+        key = (_url(), run_id)
+        with self._lock:
+            if key in self._run_projects:
+                self.hits += 1
+                return self._run_projects[key]
+            self.misses += 1
+        with get_session() as session:
+            run = session.get(Run, run_id)
+            if not run:
+                return None
+            project_id = run.project_id
+        # A run never moves between projects, so this mapping needs no invalidation.
+        with self._lock:
+            self._run_projects[key] = project_id
+        return project_id
+
+    def setting_for_run(self, run_id: Optional[int]) -> Optional[ProjectSetting]:
+        return self.setting(self.project_for_run(run_id))
+
+    def invalidate(
+        self, url: Optional[str] = None, projects: Iterable[int] = (), teams: Iterable[int] = ()
+    ) -> None:
+        projects, teams = set(projects), set(teams)
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if url is None:
+                self._settings.clear()
+                self._rosters.clear()
+            for project_id in projects:
+                self._settings.pop((url, project_id), None)
+            for team_id in teams:
+                self._rosters.pop((url, team_id), None)
+        for listener in list(self.listeners):
+            try:
+                listener(projects, teams)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "settings": len(self._settings),
+                "rosters": len(self._rosters),
+            }
+
+    def _store(self, table: dict, key: tuple[str, int], value, generation: int) -> None:
+        # A write that committed while we were reading bumps the generation; keep the stale row out.
+        with self._lock:
+            if self._generation == generation:
+                table[key] = value
+
+
+def get_config_cache() -> ConfigCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ConfigCache()
+            event.listen(Session, "after_flush", _collect)
+            event.listen(Session, "after_commit", _publish)
+            event.listen(Session, "after_rollback", _discard)
+        return _cache
+
+
+def _url() -> str:
+    return str(get_engine().url)
+
+
+def _collect(session: Session, flush_context) -> None:
+    projects: set[int] = set()
+    teams: set[int] = set()
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        if isinstance(obj, ProjectSetting):
+            projects.add(obj.project_id)
+        elif isinstance(obj, Team) and obj.id is not None:
+            teams.add(obj.id)
+        elif isinstance(obj, AgentConfig) and _roster_changed(obj):
+            teams.add(obj.team_id)
+            previous = inspect(obj).attrs.team_id.history.deleted
+            teams.update(team_id for team_id in previous or () if team_id is not None)
+    if projects or teams:
+        changed = session.info.setdefault(CHANGED_KEY, (set(), set()))
+        changed[0].update(projects)
+        changed[1].update(teams)
+
+
+def _roster_changed(agent: AgentConfig) -> bool:
+    state = inspect(agent)
+    if not state.persistent or state.deleted or state.was_deleted:
+        return True
+    return any(
+        attr.history.has_changes() for attr in state.attrs if attr.key not in _VOLATILE_AGENT_FIELDS
+    )
+
+
+def _publish(session: Session) -> None:
+    changed = session.info.pop(CHANGED_KEY, None)
+    if changed and _cache is not None:
+        _cache.invalidate(str(session.get_bind().url), changed[0], changed[1])
+
+
+def _discard(session: Session) -> None:
+    session.info.pop(CHANGED_KEY, None)
@@ -1,34 +1,346 @@
 import asyncio
 import json
-from dataclasses import dataclass, asdict
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+OVERFLOW_POLICIES = {"drop_oldest", "drop_newest", "coalesce", "disconnect"}
+# Live-only events: never sequenced, replayed or written to the run log.
+TRANSIENT_EVENTS = {"chat.delta"}
 
 
 @dataclass
 class Event:
     type: str
     payload: Dict[str, Any]
-    timestamp: str = datetime.utcnow().isoformat()
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    run_id: Optional[int] = None
+    project_id: Optional[int] = None
+    seq: Optional[int] = None
 
     def to_json(self) -> str:
         return json.dumps(asdict(self), ensure_ascii=True)
 
 
+class SubscriberClosed(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    run_ids: Optional[frozenset] = None
+    project_ids: Optional[frozenset] = None
+    types: Optional[frozenset] = None
+
+    @classmethod
+    def build(
+        cls,
+        run_id: Union[int, Iterable[int], None] = None,
+        project_id: Union[int, Iterable[int], None] = None,
+        types: Union[str, Iterable[str], None] = None,
+    ) -> "EventFilter":
+        return cls(_id_set(run_id), _id_set(project_id), _type_set(types))
+
+    def matches(self, event: "Event") -> bool:
+        if self.run_ids is not None and event.run_id not in self.run_ids:
+            return False
+        if self.project_ids is not None and event.project_id not in self.project_ids:
+            return False
+        return self.matches_type(event.type)
+
+    def matches_type(self, event_type: str) -> bool:
+        return self.types is None or bool(self.types.intersection(_type_keys(event_type)))
+
+
+def _id_set(value: Union[int, Iterable[int], None]) -> Optional[frozenset]:
+    if value is None:
+        return None
+    if isinstance(value, (int, str)):
+        value = [value]
+    ids = frozenset(int(item) for item in value if str(item).strip())
+    return ids or None
+
+
+def _type_set(value: Union[str, Iterable[str], None]) -> Optional[frozenset]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    patterns = set()
+    for pattern in value:
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if pattern == "*":
+            return None
+        # "chat.*" is stored as the prefix key "chat."; anything else must match exactly.
+        patterns.add(pattern[:-1] if pattern.endswith(".*") else pattern)
+    return frozenset(patterns) or None
+
+
+def _type_keys(event_type: str) -> List[str]:
+    parts = event_type.split(".")
+    return [event_type] + [".".join(parts[:index]) + "." for index in range(1, len(parts))]
+
+
+class Subscriber:
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        policy: str = "drop_oldest",
+        name: str = "",
+        filters: Optional[EventFilter] = None,
+    ) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.name = name
+        self.filters = filters or EventFilter()
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.peak_depth = 0
+        self.closed = False
+        self._items: Deque[Tuple[str, str]] = deque()
+        self._ready = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def offer(self, event_type: str, message: str) -> bool:
+        if self.closed:
+            return False
+        if len(self._items) >= self.maxsize:
+            if self.policy == "disconnect":
+                self.dropped += len(self._items) + 1
+                self.close()
+                return False
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return True
+            if self.policy == "coalesce":
+                for index, (queued_type, _) in enumerate(self._items):
+                    if queued_type == event_type:
+                        self._items[index] = (event_type, message)
+                        self.coalesced += 1
+                        return True
+            self._items.popleft()
+            self.dropped += 1
+        self._items.append((event_type, message))
+        self.peak_depth = max(self.peak_depth, len(self._items))
+        self._ready.set()
+        return True
+
+    def get_nowait(self) -> str:
+        if not self._items:
+            if self.closed:
+                raise SubscriberClosed(self.name)
+            raise asyncio.QueueEmpty
+        _, message = self._items.popleft()
+        self.delivered += 1
+        if not self._items and not self.closed:
+            self._ready.clear()
+        return message
+
+    async def get(self) -> str:
+        while not self._items:
+            if self.closed:
+                raise SubscriberClosed(self.name)
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def close(self) -> None:
+        self.closed = True
+        self._items.clear()
+        self._ready.set()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "maxsize": self.maxsize,
+            "depth": len(self._items),
+            "peak_depth": self.peak_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "closed": self.closed,
+            "filters": {
+                "run_id": sorted(self.filters.run_ids) if self.filters.run_ids else None,
+                "project_id": sorted(self.filters.project_ids) if self.filters.project_ids else None,
+                "types": sorted(self.filters.types) if self.filters.types else None,
+            },
+        }
+
+
+_DIMENSIONS = ("run", "project", "type")
+
+
 class EventBus:
-    def __init__(self) -> None:
-        self._subscribers: List[asyncio.Queue[str]] = []
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        policy: str = "drop_oldest",
+        project_resolver: Optional[Callable[[int], Optional[int]]] = None,
+        sequencer: Optional[Callable[[int], int]] = None,
+        replay_size: int = 500,
+        replay_runs: int = 64,
+    ) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.project_resolver = project_resolver
+        self.sequencer = sequencer
+        self.replay_size = max(0, replay_size)
+        self.replay_runs = max(1, replay_runs)
+        self._replay: "OrderedDict[int, Deque[Tuple[int, str, str]]]" = OrderedDict()
+        self._seqs: Dict[int, int] = {}
+        self._subscribers: List[Subscriber] = []
+        self._index: Dict[str, Dict[Any, Set[Subscriber]]] = {dim: {} for dim in _DIMENSIONS}
+        self._unfiltered: Dict[str, Set[Subscriber]] = {dim: set() for dim in _DIMENSIONS}
+        self._run_projects: Dict[int, Optional[int]] = {}
 
-    def subscribe(self) -> asyncio.Queue[str]:
-        queue: asyncio.Queue[str] = asyncio.Queue()
-        self._subscribers.append(queue)
-        return queue
+    def subscribe(
+        self,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+        name: str = "",
+        run_id: Union[int, Iterable[int], None] = None,
+        project_id: Union[int, Iterable[int], None] = None,
+        types: Union[str, Iterable[str], None] = None,
+    ) -> Subscriber:
+        filters = EventFilter.build(run_id, project_id, types)
+        subscriber = Subscriber(maxsize or self.maxsize, policy or self.policy, name, filters)
+        self._subscribers.append(subscriber)
+        self._add_index(subscriber)
+        return subscriber
 
-    def unsubscribe(self, queue: asyncio.Queue[str]) -> None:
-        if queue in self._subscribers:
-            self._subscribers.remove(queue)
+    def update_filters(
+        self,
+        subscriber: Subscriber,
+        run_id: Union[int, Iterable[int], None] = None,
+        project_id: Union[int, Iterable[int], None] = None,
+        types: Union[str, Iterable[str], None] = None,
+    ) -> None:
+        if subscriber not in self._subscribers:
+            return
+        self._remove_index(subscriber)
+        subscriber.filters = EventFilter.build(run_id, project_id, types)
+        self._add_index(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            self._remove_index(subscriber)
 
     async def publish(self, event: Event) -> None:
+        # Never awaits a consumer: slow subscribers absorb overflow per their policy.
+        if event.run_id is None and isinstance(event.payload.get("run_id"), int):
+            event.run_id = event.payload["run_id"]
+        if event.project_id is None and event.run_id is not None and self._index["project"]:
+            event.project_id = self._project_for(event.run_id)
+        transient = event.type in TRANSIENT_EVENTS
+        if event.run_id is not None and event.seq is None and not transient:
+            event.seq = self._next_seq(event.run_id)
+        targets = self._lookup("run", [event.run_id])
+        if targets:
+            targets &= self._lookup("project", [event.project_id])
+        if targets:
+            targets &= self._lookup("type", _type_keys(event.type))
+        if not targets and (transient or not self.replay_size):
+            return
         message = event.to_json()
-        for queue in list(self._subscribers):
-            await queue.put(message)
+        if event.run_id is not None and event.seq is not None:
+            self._remember(event.run_id, event.seq, event.type, message)
+        for subscriber in targets:
+            if not subscriber.offer(event.type, message):
+                self.unsubscribe(subscriber)
+
+    def stats(self) -> list[dict]:
+        return [subscriber.stats() for subscriber in self._subscribers]
+
+    def head_seq(self, run_id: int) -> int:
+        return self._seqs.get(run_id, 0)
+
+    def replay(self, run_id: int, since: int) -> Tuple[List[Tuple[int, str, str]], Optional[int]]:
+        buffer = self._replay.get(run_id)
+        if not buffer:
+            return [], None
+        # Publishing can reorder neighbours, so the ring's lower bound is its smallest seq.
+        return [item for item in buffer if item[0] > since], min(item[0] for item in buffer)
+
+    def _next_seq(self, run_id: int) -> Optional[int]:
+        if not self.sequencer:
+            return None
+        try:
+            return self.sequencer(run_id)
+        except Exception:
+            return None
+
+    def _remember(self, run_id: int, seq: int, event_type: str, message: str) -> None:
+        self._seqs[run_id] = max(self._seqs.get(run_id, 0), seq)
+        if not self.replay_size:
+            return
+        buffer = self._replay.get(run_id)
+        if buffer is None:
+            buffer = deque(maxlen=self.replay_size)
+            self._replay[run_id] = buffer
+            while len(self._replay) > self.replay_runs:
+                self._replay.popitem(last=False)
+        else:
+            self._replay.move_to_end(run_id)
+        # Emitters that write to disk before publishing can reach here out of order.
+        if buffer and seq < buffer[-1][0]:
+            items = sorted([*buffer, (seq, event_type, message)])
+            buffer.clear()
+            buffer.extend(items)
+        else:
+            buffer.append((seq, event_type, message))
+
+    def _lookup(self, dim: str, keys: List[Any]) -> Set[Subscriber]:
+        matched = set(self._unfiltered[dim])
+        index = self._index[dim]
+        for key in keys:
+            if key is not None and key in index:
+                matched |= index[key]
+        return matched
+
+    def _keys(self, subscriber: Subscriber) -> Dict[str, Optional[frozenset]]:
+        filters = subscriber.filters
+        return {"run": filters.run_ids, "project": filters.project_ids, "type": filters.types}
+
+    def _add_index(self, subscriber: Subscriber) -> None:
+        for dim, keys in self._keys(subscriber).items():
+            if keys is None:
+                self._unfiltered[dim].add(subscriber)
+                continue
+            for key in keys:
+                self._index[dim].setdefault(key, set()).add(subscriber)
+
+    def _remove_index(self, subscriber: Subscriber) -> None:
+        for dim, keys in self._keys(subscriber).items():
+            self._unfiltered[dim].discard(subscriber)
+            for key in keys or ():
+                bucket = self._index[dim].get(key)
+                if bucket is None:
+                    continue
+                bucket.discard(subscriber)
+                if not bucket:
+                    del self._index[dim][key]
+
+    def _project_for(self, run_id: int) -> Optional[int]:
+        if run_id in self._run_projects:
+            return self._run_projects[run_id]
+        if not self.project_resolver:
+            return None
+        try:
+            project_id = self.project_resolver(run_id)
+        except Exception:
+            return None
+        if project_id is not None:
+            self._run_projects[run_id] = project_id
+        return project_id
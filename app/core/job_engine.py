@@ -5,10 +5,11 @@ from datetime import datetime
 from typing import Awaitable, Callable, Dict, Iterable, Optional
 
 from app.core.events import Event, EventBus
+from sqlalchemy import update
 from sqlmodel import select
 
 from app.db.models import Job, JobEvent, JobStep
-from app.db.session import get_session
+from app.db.session import get_session, run_db
 
 
 @dataclass
@@ -17,9 +18,18 @@ class JobStepResult:
     error: Optional[str] = None
 
 
+@dataclass
+class _Transition:
+    job: Job
+    step: JobStep
+    event: Optional[JobEvent] = None
+
+
 class JobEngine:
-    def __init__(self, event_bus: EventBus) -> None:
+    def __init__(self, event_bus: EventBus, batch_size: int = 1) -> None:
         self.event_bus = event_bus
+        self.batch_size = max(1, batch_size)
+        self.transactions = 0
 
     def create_job(self, run_id: int) -> int:
         with get_session() as session:
@@ -45,26 +55,47 @@ class JobEngine:
         handlers: Dict[str, Callable[[], Awaitable[JobStepResult]]],
         max_attempts: int = 2,
     ) -> None:
-        for step_name in steps:
-            step = self._start_step(job_id, step_name)
-            await self._emit(job_id, "job.step.started", {"step": step_name, "job_id": job_id})
-            result = await self._run_step_with_retries(step, handlers, max_attempts)
-            if not result.success:
-                self._fail_job(job_id, step, result.error or "step_failed")
-                await self._emit(
-                    job_id,
-                    "job.failed",
-                    {"step": step_name, "job_id": job_id, "error": result.error},
-                )
-                return
-            self._complete_step(job_id, step)
-            await self._emit(job_id, "job.step.completed", {"step": step_name, "job_id": job_id})
-
-        self._complete_job(job_id)
-        await self._emit(job_id, "job.completed", {"job_id": job_id})
+        job = await run_db(self._load_job, job_id)
+        pending: list[_Transition] = []
+        try:
+            for step_name in steps:
+                now = datetime.utcnow()
+                job.status = "running"
+                job.current_state = step_name
+                job.updated_at = now
+                step = JobStep(job_id=job_id, name=step_name, status="running", started_at=now)
+                await self._transition(pending, job, step, "job.step.started", {"step": step_name, "job_id": job_id})
+                result = await self._run_step_with_retries(pending, job, step, handlers, max_attempts)
+                now = datetime.utcnow()
+                job.updated_at = now
+                step.ended_at = now
+                if not result.success:
+                    job.status = "failed"
+                    step.status = "failed"
+                    step.error = result.error or "step_failed"
+                    await self._transition(
+                        pending,
+                        job,
+                        step,
+                        "job.failed",
+                        {"step": step_name, "job_id": job_id, "error": result.error},
+                    )
+                    return
+                step.status = "completed"
+                await self._transition(pending, job, step, "job.step.completed", {"step": step_name, "job_id": job_id})
+
+            job.status = "completed"
+            job.current_state = "done"
+            job.updated_at = datetime.utcnow()
+            await self._transition(pending, job, None, "job.completed", {"job_id": job_id})
+        finally:
+            if pending:
+                await run_db(self._persist, pending)
 
     async def _run_step_with_retries(
         self,
+        pending: list[_Transition],
+        job: Job,
         step: JobStep,
         handlers: Dict[str, Callable[[], Awaitable[JobStepResult]]],
         max_attempts: int,
@@ -75,7 +106,8 @@ class JobEngine:
         for attempt in range(1, max_attempts + 1):
             try:
                 step.attempts = attempt
-                self._update_step(step)
+                if attempt > 1:
+                    await self._transition(pending, job, step)
                 result = await handler()
                 if result.success:
                     return result
@@ -87,79 +119,66 @@ class JobEngine:
                 await asyncio.sleep(min(2**attempt, 5))
         return JobStepResult(False, "max_attempts_exceeded")
 
-    def _start_step(self, job_id: int, name: str) -> JobStep:
+    async def _transition(
+        self,
+        pending: list[_Transition],
+        job: Job,
+        step: Optional[JobStep],
+        event_type: Optional[str] = None,
+        payload: Optional[dict] = None,
+    ) -> None:
+        event = None
+        if event_type:
+            event = JobEvent(
+                job_id=job.id,
+                type=event_type,
+                payload=json.dumps(payload or {}, ensure_ascii=True),
+            )
+        pending.append(_Transition(job, step, event))
+        if len(pending) >= self.batch_size:
+            batch = list(pending)
+            pending.clear()
+            await run_db(self._persist, batch)
+        if event_type:
+            await self.event_bus.publish(Event(type=event_type, payload=payload or {}, run_id=job.run_id))
+
+    def _load_job(self, job_id: int) -> Job:
         with get_session() as session:
             job = session.get(Job, job_id)
             if not job:
                 raise RuntimeError("Job not found")
-            job.status = "running"
-            job.current_state = name
-            job.updated_at = datetime.utcnow()
-            step = JobStep(job_id=job.id, name=name, status="running", started_at=datetime.utcnow())
-            session.add(job)
-            session.add(step)
-            session.commit()
-            session.refresh(step)
-            return step
+            return job
 
-    def _complete_step(self, job_id: int, step: JobStep) -> None:
+    def _persist(self, batch: list[_Transition]) -> None:
+        # Step, job and event rows of every queued transition commit together.
         with get_session() as session:
-            persisted = session.get(JobStep, step.id)
-            if not persisted:
-                return
-            persisted.status = "completed"
-            persisted.ended_at = datetime.utcnow()
-            job = session.get(Job, job_id)
-            if job:
-                job.updated_at = datetime.utcnow()
-            session.add(persisted)
-            session.commit()
-
-    def _fail_job(self, job_id: int, step: JobStep, error: str) -> None:
-        with get_session() as session:
-            persisted = session.get(JobStep, step.id)
-            if persisted:
-                persisted.status = "failed"
-                persisted.error = error
-                persisted.ended_at = datetime.utcnow()
-                session.add(persisted)
-            job = session.get(Job, job_id)
-            if job:
-                job.status = "failed"
-                job.updated_at = datetime.utcnow()
-                session.add(job)
-            session.commit()
-
-    def _complete_job(self, job_id: int) -> None:
-        with get_session() as session:
-            persisted = session.get(Job, job_id)
-            if not persisted:
-                return
-            persisted.status = "completed"
-            persisted.current_state = "done"
-            persisted.updated_at = datetime.utcnow()
-            session.add(persisted)
-            session.commit()
-
-    async def _emit(self, job_id: int, event_type: str, payload: dict) -> None:
-        event = Event(type=event_type, payload=payload)
-        with get_session() as session:
-            session.add(
-                JobEvent(
-                    job_id=job_id,
-                    step_id=payload.get("step_id"),
-                    type=event_type,
-                    payload=json.dumps(payload, ensure_ascii=True),
+            session.expire_on_commit = False
+            jobs: dict[int, Job] = {}
+            for transition in batch:
+                step = transition.step
+                if step is not None and step.id is None:
+                    session.add(step)
+                    session.flush()
+                elif step is not None:
+                    session.exec(
+                        update(JobStep)
+                        .where(JobStep.id == step.id)
+                        .values(
+                            status=step.status,
+                            attempts=step.attempts,
+                            ended_at=step.ended_at,
+                            error=step.error,
+                        )
+                    )
+                if transition.event is not None:
+                    transition.event.step_id = step.id if step is not None else None
+                    session.add(transition.event)
+                jobs[transition.job.id] = transition.job
+            for job in jobs.values():
+                session.exec(
+                    update(Job)
+                    .where(Job.id == job.id)
+                    .values(status=job.status, current_state=job.current_state, updated_at=job.updated_at)
                 )
-            )
-            session.commit()
-        await self.event_bus.publish(event)
-
-    def _update_step(self, step: JobStep) -> None:
-        with get_session() as session:
-            persisted = session.get(JobStep, step.id)
-            if not persisted:
-                return
-            persisted.attempts = step.attempts
-            session.add(persisted)
             session.commit()
+        self.transactions += 1
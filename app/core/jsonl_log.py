@@ -0,0 +1,244 @@
+import bisect
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.artifact_writer import get_writer, io_lock
+
+
+_lock = io_lock
+_cache: dict[str, "_IndexState"] = {}
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    seq: int
+    offset: int
+    length: int
+    kind: str
+
+
+@dataclass
+class _IndexState:
+    index_size: int = 0
+    covered: int = 0
+    head_seq: int = 0
+    entries: List[IndexEntry] = field(default_factory=list)
+    # Appends handed to the writer that are not on disk yet, served to readers from memory.
+    pending: List[Tuple[IndexEntry, bytes]] = field(default_factory=list)
+
+
+class JsonlLog:
+    def __init__(self, path: Path, kind_field: str = "type") -> None:
+        self.path = path
+        self.index_path = path.with_suffix(".idx")
+        self.kind_field = kind_field
+
+    def append(self, record: Dict[str, Any], kind: Optional[str] = None) -> None:
+        data = (json.dumps(record, ensure_ascii=True) + "\n").encode("utf-8")
+        entry = _entry(record, -1, len(data), self.kind_field)
+        if kind is not None:
+            entry = IndexEntry(entry.seq, -1, entry.length, _clean(kind))
+        item = (entry, data)
+        with _lock:
+            state = _cache.setdefault(str(self.path), _IndexState())
+            state.pending.append(item)
+
+        def index_line(offset: int) -> bytes:
+            # The writer calls this under io_lock as the record lands, so no reader sees it twice.
+            _discard(state.pending, item)
+            return format_entry(IndexEntry(entry.seq, offset, entry.length, entry.kind)).encode("utf-8")
+
+        get_writer().append(self.path, data, self.index_path, index_line)
+
+    def forget(self) -> None:
+        writer = get_writer()
+        writer.release(self.path)
+        writer.release(self.index_path)
+        with _lock:
+            _cache.pop(str(self.path), None)
+
+    def page(
+        self,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+        match: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[List[dict], bool]:
+        with _lock:
+            state = self._refresh()
+            selected, has_more = select_entries(state.entries, after, before, limit, match)
+            pending = [
+                (entry.seq, data)
+                for entry, data in state.pending
+                if _in_range(entry, after, before, match)
+            ]
+        records = self._read(selected)
+        if not pending:
+            return [record for _, record in records], has_more
+        for seq, data in pending:
+            try:
+                records.append((seq, json.loads(data)))
+            except Exception:
+                continue
+        records.sort(key=lambda item: item[0])
+        if limit is not None and len(records) > limit:
+            has_more = True
+            records = records[-limit:] if after is None else records[:limit]
+        return [record for _, record in records], has_more
+
+    def load(self, entries: Iterable[IndexEntry]) -> List[dict]:
+        return [record for _, record in self._read(entries)]
+
+    def head_seq(self) -> int:
+        with _lock:
+            state = self._refresh()
+            return max([state.head_seq, *(entry.seq for entry, _ in state.pending)])
+
+    def _refresh(self) -> _IndexState:
+        state = _cache.setdefault(str(self.path), _IndexState())
+        self._read_index(state)
+        self._repair(state)
+        return state
+
+    def _read(self, entries: Iterable[IndexEntry]) -> List[Tuple[int, dict]]:
+        records: list[Tuple[int, dict]] = []
+        try:
+            handle = self.path.open("rb")
+        except OSError:
+            return records
+        with handle:
+            for entry in entries:
+                handle.seek(entry.offset)
+                try:
+                    records.append((entry.seq, json.loads(handle.read(entry.length))))
+                except Exception:
+                    continue
+        return records
+
+    def _read_index(self, state: _IndexState) -> None:
+        try:
+            size = self.index_path.stat().st_size
+        except OSError:
+            return
+        if size < state.index_size:
+            state.index_size, state.covered, state.head_seq, state.entries = 0, 0, 0, []
+        if size == state.index_size:
+            return
+        with self.index_path.open("rb") as handle:
+            handle.seek(state.index_size)
+            chunk = handle.read(size - state.index_size)
+        # Only consume complete lines; a half-written tail is picked up next time.
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            parts = line.split("\t", 3)
+            if len(parts) != 4:
+                continue
+            try:
+                entry = IndexEntry(int(parts[0]), int(parts[1]), int(parts[2]), parts[3])
+            except ValueError:
+                continue
+            _insert(state, entry)
+            state.covered = max(state.covered, entry.offset + entry.length)
+        state.index_size += len(complete)
+
+    def _repair(self, state: _IndexState) -> None:
+        # Logs written before the index existed, or a crash between the two appends.
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size <= state.covered:
+            return
+        repaired: list[IndexEntry] = []
+        with self.path.open("rb") as handle:
+            handle.seek(state.covered)
+            offset = state.covered
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except Exception:
+                    record = None
+                if isinstance(record, dict):
+                    repaired.append(_entry(record, offset, len(raw), self.kind_field))
+                offset += len(raw)
+        if not repaired:
+            state.covered = offset
+            return
+        lines = "".join(format_entry(entry) for entry in repaired).encode("utf-8")
+        with self.index_path.open("ab") as handle:
+            handle.write(lines)
+        for entry in repaired:
+            _insert(state, entry)
+        state.index_size += len(lines)
+        state.covered = offset
+
+
+def select_entries(
+    entries: List[IndexEntry],
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    limit: Optional[int] = None,
+    match: Optional[Callable[[str], bool]] = None,
+) -> Tuple[List[IndexEntry], bool]:
+    # Entries are kept seq-ordered, so a page is a bisection plus a walk of at most `limit` matches.
+    seq = lambda entry: entry.seq  # noqa: E731
+    start = bisect.bisect_right(entries, after, key=seq) if after is not None else 0
+    end = bisect.bisect_left(entries, before, key=seq) if before is not None else len(entries)
+    # Without an "after" cursor the page is the tail, so recent history never needs a scan.
+    tail = after is None and limit is not None
+    positions = range(end - 1, start - 1, -1) if tail else range(start, end)
+    selected: list[IndexEntry] = []
+    for position in positions:
+        entry = entries[position]
+        if match is not None and not match(entry.kind):
+            continue
+        if limit is not None and len(selected) == limit:
+            return (selected[::-1] if tail else selected), True
+        selected.append(entry)
+    return (selected[::-1] if tail else selected), False
+
+
+def _insert(state: _IndexState, entry: IndexEntry) -> None:
+    # Appends arrive almost in seq order; the rare straggler is placed after its equals.
+    if entry.seq >= state.head_seq:
+        state.entries.append(entry)
+        state.head_seq = entry.seq
+    else:
+        bisect.insort_right(state.entries, entry, key=lambda item: item.seq)
+
+
+def _in_range(
+    entry: IndexEntry, after: Optional[int], before: Optional[int], match: Optional[Callable[[str], bool]]
+) -> bool:
+    return (
+        (after is None or entry.seq > after)
+        and (before is None or entry.seq < before)
+        and (match is None or match(entry.kind))
+    )
+
+
+def _discard(pending: List[Tuple[IndexEntry, bytes]], item: Tuple[IndexEntry, bytes]) -> None:
+    for position, candidate in enumerate(pending):
+        if candidate is item:
+            del pending[position]
+            return
+
+
+def _entry(record: Dict[str, Any], offset: int, length: int, kind_field: str) -> IndexEntry:
+    try:
+        seq = int(record.get("seq") or 0)
+    except (TypeError, ValueError):
+        seq = 0
+    return IndexEntry(seq, offset, length, _clean(str(record.get(kind_field) or "")))
+
+
+def _clean(kind: str) -> str:
+    return kind.replace("\t", " ").replace("\n", " ")
+
+
+def format_entry(entry: IndexEntry) -> str:
+    return f"{entry.seq}\t{entry.offset}\t{entry.length}\t{entry.kind}\n"
@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+from typing import Optional
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.05, window: int = 1200, stall_threshold: float = 0.1) -> None:
+        self.interval = max(0.001, interval)
+        self.stall_threshold = stall_threshold
+        self.samples: deque[float] = deque(maxlen=max(1, window))
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def record(self, lag: float) -> None:
+        self.samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.stall_threshold:
+            self.stalls += 1
+
+    def stats(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": len(ordered),
+            "p50_ms": round(percentile(0.5), 2),
+            "p99_ms": round(percentile(0.99), 2),
+            "max_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            # Anything past the requested wake-up is time the loop spent blocked on someone else.
+            self.record(max(0.0, loop.time() - expected))
@@ -1,16 +1,19 @@
 import asyncio
-import re
 from datetime import datetime
 from typing import Optional
 
 from sqlmodel import select
 
+from app.core.config_cache import get_config_cache
 from app.core.events import Event, EventBus
 from app.core.memory import MemoryStore
-from app.core.chat_router import ChatRouter, MANAGER_ROLES
+from app.core.task_dispatcher import TaskDispatcher
+from app.core.task_executor import ClaimedTask, TaskExecutor
+from app.core.task_leases import TaskLeaseManager, retry_limit
+from app.core.chat_router import ChatRouter, MANAGER_ROLES, ROLE_KEYWORDS
 from app.core.tool_dispatcher import execute_tool_call, extract_tool_call, normalize_tool_response
-from app.db.models import AgentConfig, ProjectSetting, Run, Task, Team
-from app.db.session import get_session
+from app.db.models import AgentConfig, ProjectSetting, Run, Task
+from app.db.session import get_session, run_db
 
 
 class ManagerLoop:
@@ -23,6 +26,9 @@ class ManagerLoop:
         artifact_store,
         repo_root,
         allow_self_edit: bool,
+        task_dispatcher: TaskDispatcher | None = None,
+        task_executor: TaskExecutor | None = None,
+        task_leases: TaskLeaseManager | None = None,
     ) -> None:
         self.event_bus = event_bus
         self.get_active_project_id = get_active_project_id
@@ -34,6 +40,9 @@ class ManagerLoop:
         self.allow_self_edit = allow_self_edit
         self.memory = MemoryStore()
         self._running = False
+        self.task_dispatcher = task_dispatcher or TaskDispatcher()
+        self.task_executor = task_executor or TaskExecutor(on_release=self.task_dispatcher.notify)
+        self.task_leases = task_leases or TaskLeaseManager()
 
     def start(self) -> None:
         if self._running:
@@ -42,78 +51,189 @@ class ManagerLoop:
         asyncio.create_task(self._run())
 
     async def _run(self) -> None:
-        while True:
-            try:
-                await self._tick()
-            except Exception:
-                pass
-            await asyncio.sleep(2)
+        signal = self.task_dispatcher.subscribe()
+        try:
+            while True:
+                await self.task_dispatcher.wait(signal)
+                try:
+                    await self._tick()
+                except Exception:
+                    pass
+        finally:
+            self.task_dispatcher.unsubscribe(signal)
 
     async def _tick(self) -> None:
         project_id = self.get_active_project_id()
         if project_id is None:
             return
+        tasks = await run_db(self._load_tasks)
+        for task in tasks:
+            if not self.task_executor.has_capacity():
+                break
+            if self.task_executor.is_inflight(task.id):
+                continue
+            claimed = await self._claim_task(task.id)
+            if claimed:
+                self.task_executor.spawn(task.id, self._handle_task(claimed))
+
+    def _load_tasks(self) -> list[Task]:
         with get_session() as session:
-            tasks = list(
+            return list(
                 session.exec(
                     select(Task)
                     .where(
-                        Task.status == "pending",
+                        self.task_leases.claimable(),
                         (Task.assigned_role == None)  # noqa: E711
                         | (Task.assigned_role.in_(list(MANAGER_ROLES))),
                     )
                     .order_by(Task.created_at.asc())
                 )
             )
-        for task in tasks[:3]:
-            await self._handle_task(task.id)
 
-    async def _handle_task(self, task_id: int) -> None:
+    async def _claim_task(self, task_id: int) -> Optional[ClaimedTask]:
+        loaded = await run_db(self._load_claim, task_id)
+        if not loaded:
+            return None
+        task, run, agents, setting, exhausted = loaded
+        if exhausted:
+            await self._emit(
+                task.run_id,
+                "task.failed",
+                {"task_id": task.id, "reason": f"max_attempts:{exhausted}"},
+            )
+            return None
+        assigned = _pick_agent(agents, task)
+        # Reservations stay on the event loop; the conditional UPDATE is what makes the claim exclusive.
+        if not assigned or not self.task_executor.try_reserve(assigned):
+            return None
+        task = await run_db(self.task_leases.claim_task, task_id, assigned.role)
+        if task is None:
+            self.task_executor.release(assigned, notify=False)
+            return None
+
+        await self._emit(
+            run.id,
+            "task.started",
+            {"task_id": task.id, "assigned_role": assigned.role, "title": task.title},
+        )
+        return ClaimedTask(task=task, run=run, agent=assigned, setting=setting, agents=agents)
+
+    def _load_claim(
+        self, task_id: int
+    ) -> Optional[tuple[Task, Run, list[AgentConfig], Optional[ProjectSetting], Optional[int]]]:
         with get_session() as session:
+            session.expire_on_commit = False
             task = session.get(Task, task_id)
-            if not task or task.status != "pending":
-                return
+            if not task or not self.task_leases.is_claimable(task):
+                return None
             run = session.get(Run, task.run_id)
             if not run:
-                return
+                return None
             if run.pause_mode:
+                return None
+        setting = get_config_cache().setting(run.project_id)
+        limit = retry_limit(setting)
+        if task.attempts >= limit:
+            if not self.task_leases.fail_exhausted(task_id, limit):
+                return None
+            return task, run, [], setting, limit
+        return task, run, get_config_cache().roster(run.team_id), setting, None
+
+    async def _handle_task(self, claimed: ClaimedTask) -> None:
+        try:
+            async with self.task_leases.hold(claimed.task.id):
+                await self._execute_task(claimed)
+        except Exception as exc:
+            await self._abandon(claimed, exc)
+
+    async def _abandon(self, claimed: ClaimedTask, exc: Exception) -> None:
+        task = claimed.task
+        status = await run_db(
+            self.task_leases.abandon, task.id, task.attempts, retry_limit(claimed.setting)
+        )
+        if status == "pending":
+            self.task_dispatcher.notify()
+        if status:
+            await self._emit(
+                claimed.run.id,
+                "task.failed" if status == "failed" else "task.requeued",
+                {"task_id": task.id, "reason": f"error: {exc}"},
+            )
+
+    async def _execute_task(self, claimed: ClaimedTask) -> None:
+        task, run, assigned = claimed.task, claimed.run, claimed.agent
+        task_id = task.id
+        manager = _pick_manager(claimed.agents)
+        try:
+            response_text = await self._run_assigned(claimed)
+        finally:
+            self.task_executor.release(assigned)
+
+        review_text = response_text
+        if manager:
+            review_prompt = (
+                f"Task: {task.title}\n"
+                f"Assigned role: {assigned.role}\n"
+                f"Worker output: {response_text}\n\n"
+                "If acceptable, respond with ONLY: APPROVED.\n"
+                "If rework is needed, respond with ONLY: RETRY and a brief reason.\n"
+                "If delegating follow-up, mention teammates with @mentions."
+            )
+            async with self.task_executor.slot(manager):
+                review = await self.agent_runtime.run_agent(run.id, manager, review_prompt)
+            review_text = (review.get("content") or "").strip()
+            review_message = {
+                "agent": manager.display_name or manager.role,
+                "role": manager.role,
+                "content": review_text,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            self.artifact_store.write_chat(run.id, manager.role, review_message)
+            await self._emit(run.id, "chat.message", review_message)
+            await run_db(self.memory.append, run.id, manager.id, manager.role, f"Manager: {review_text}")
+            await self._emit(
+                run.id,
+                "memory.updated",
+                {
+                    "agent_id": manager.id,
+                    "agent": manager.display_name or manager.role,
+                    "content": f"Manager: {review_text}",
+                },
+            )
+            await self._emit(
+                run.id,
+                "task.reviewed",
+                {"task_id": task.id, "reviewer": manager.role, "review": review_text},
+            )
+            if self.chat_router.extract_mentions(review_text):
+                await self._trigger_followups(run, manager, review_text)
+
+        if manager and review_text.startswith("RETRY"):
+            if not await run_db(self.task_leases.finish, task_id, "pending"):
                 return
-            retry_limit = 3
-            setting = session.exec(
-                select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-            ).first()
-            if setting and setting.task_retry_limit:
-                retry_limit = max(1, int(setting.task_retry_limit))
-            if task.attempts >= retry_limit:
-                task.status = "failed"
-                task.updated_at = datetime.utcnow()
-                session.add(task)
-                session.commit()
-                await self._emit(
-                    task.run_id,
-                    "task.failed",
-                    {"task_id": task.id, "reason": f"max_attempts:{retry_limit}"},
-                )
-                return
-            team = session.get(Team, run.team_id)
-            agents = list(session.exec(select(AgentConfig).where(AgentConfig.team_id == team.id)))
-            manager = _pick_manager(agents)
-            assigned = _pick_agent(agents, task)
-            if not assigned:
-                return
-            task.status = "in_progress"
-            task.assigned_role = assigned.role
-            task.attempts += 1
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            session.commit()
+            self.task_dispatcher.notify()
+            await self._emit(
+                run.id,
+                "task.requeued",
+                {"task_id": task_id, "reason": review_text},
+            )
+            return
+        if not await run_db(self.task_leases.finish, task_id, "completed"):
+            return
 
         await self._emit(
             run.id,
-            "task.started",
-            {"task_id": task.id, "assigned_role": assigned.role, "title": task.title},
+            "task.completed",
+            {
+                "task_id": task_id,
+                "summary": response_text,
+                "assigned_role": assigned.role,
+                "review": review_text if manager else None,
+            },
         )
 
+    async def _run_assigned(self, claimed: ClaimedTask) -> str:
+        task, run, assigned, setting = claimed.task, claimed.run, claimed.agent, claimed.setting
         tool_note = (
             "If you need to edit code, use ONLY JSON tool calls like:\n"
             '{"tool":"file.read","arguments":{"path":"src/app.ts"}}\n'
@@ -160,7 +280,7 @@ class ManagerLoop:
         }
         self.artifact_store.write_chat(run.id, assigned.role, worker_message)
         await self._emit(run.id, "chat.message", worker_message)
-        self.memory.append(run.id, assigned.id, assigned.role, f"Agent: {response_text}")
+        await run_db(self.memory.append, run.id, assigned.id, assigned.role, f"Agent: {response_text}")
         await self._emit(
             run.id,
             "memory.updated",
@@ -170,79 +290,10 @@ class ManagerLoop:
                 "content": f"Agent: {response_text}",
             },
         )
-
-        review_text = response_text
-        if manager:
-            review_prompt = (
-                f"Task: {task.title}\n"
-                f"Assigned role: {assigned.role}\n"
-                f"Worker output: {response_text}\n\n"
-                "If acceptable, respond with ONLY: APPROVED.\n"
-                "If rework is needed, respond with ONLY: RETRY and a brief reason.\n"
-                "If delegating follow-up, mention teammates with @mentions."
-            )
-            review = await self.agent_runtime.run_agent(run.id, manager, review_prompt)
-            review_text = (review.get("content") or "").strip()
-            review_message = {
-                "agent": manager.display_name or manager.role,
-                "role": manager.role,
-                "content": review_text,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-            self.artifact_store.write_chat(run.id, manager.role, review_message)
-            await self._emit(run.id, "chat.message", review_message)
-            self.memory.append(run.id, manager.id, manager.role, f"Manager: {review_text}")
-            await self._emit(
-                run.id,
-                "memory.updated",
-                {
-                    "agent_id": manager.id,
-                    "agent": manager.display_name or manager.role,
-                    "content": f"Manager: {review_text}",
-                },
-            )
-            await self._emit(
-                run.id,
-                "task.reviewed",
-                {"task_id": task.id, "reviewer": manager.role, "review": review_text},
-            )
-            if _has_mentions(review_text):
-                await self._trigger_followups(run, manager, review_text)
-
-        with get_session() as session:
-            task = session.get(Task, task_id)
-            if not task:
-                return
-            if manager and review_text.startswith("RETRY"):
-                task.status = "pending"
-                task.updated_at = datetime.utcnow()
-                session.add(task)
-                session.commit()
-                await self._emit(
-                    run.id,
-                    "task.requeued",
-                    {"task_id": task.id, "reason": review_text},
-                )
-                return
-            task.status = "completed"
-            task.completed_at = datetime.utcnow()
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            session.commit()
-
-        await self._emit(
-            run.id,
-            "task.completed",
-            {
-                "task_id": task.id,
-                "summary": response_text,
-                "assigned_role": assigned.role,
-                "review": review_text if manager else None,
-            },
-        )
+        return response_text
 
     async def _emit(self, run_id: int, event_type: str, payload: dict) -> None:
-        event = Event(type=event_type, payload=payload)
+        event = Event(type=event_type, payload=payload, run_id=run_id)
         self.artifact_store.write_event(run_id, event.__dict__)
         await self.event_bus.publish(event)
 
@@ -271,12 +322,6 @@ class ManagerLoop:
             await self._emit(run.id, "chat.message", agent_message)
 
 
-def _has_mentions(text: str) -> bool:
-    return bool(re.search(r"@([\\w\\-]+)", text or ""))
-
-
-
-
 def _pick_agent(agents: list[AgentConfig], task: Task) -> Optional[AgentConfig]:
     if not agents:
         return None
@@ -284,19 +329,12 @@ def _pick_agent(agents: list[AgentConfig], task: Task) -> Optional[AgentConfig]:
         for agent in agents:
             if agent.role == task.assigned_role:
                 return agent
-    keywords = {
-        "qa": ["test", "bug", "regression", "qa", "verify"],
-        "devops": ["deploy", "ci", "pipeline", "infra", "release"],
-        "docs": ["docs", "documentation", "readme", "guide"],
-        "dev": ["code", "implement", "fix", "refactor", "build"],
-        "pm": ["scope", "plan", "requirements", "roadmap"],
-    }
     text = f"{task.title} {task.description or ''}".lower()
     scored: list[tuple[int, AgentConfig]] = []
     for agent in agents:
         role = agent.role.lower()
         score = 0
-        for key, words in keywords.items():
+        for key, words in ROLE_KEYWORDS.items():
             if key in role:
                 score += sum(1 for w in words if w in text) * 2
             else:
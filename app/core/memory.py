@@ -5,7 +5,8 @@ import json
 
 from sqlmodel import select
 
-from app.db.models import AgentConfig, AgentMemory, ProjectSetting, Run
+from app.core.config_cache import get_config_cache
+from app.db.models import AgentConfig, AgentMemory
 from app.db.session import get_session
 
 
@@ -84,22 +85,16 @@ class MemoryStore:
         default = {"cap": 5, "strategy": "rolling"}
         if not run_id:
             return default
-        with get_session() as session:
-            run = session.get(Run, run_id)
-            if not run:
-                return default
-            setting = session.exec(
-                select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-            ).first()
-            if not setting or not setting.memory_profiles:
-                return default
-            try:
-                data = json.loads(setting.memory_profiles)
-            except Exception:
-                return default
-            if not isinstance(data, dict) or not role:
-                return default
-            profile = data.get(role)
-            if isinstance(profile, dict):
-                return profile
+        setting = get_config_cache().setting_for_run(run_id)
+        if not setting or not setting.memory_profiles:
+            return default
+        try:
+            data = json.loads(setting.memory_profiles)
+        except Exception:
+            return default
+        if not isinstance(data, dict) or not role:
+            return default
+        profile = data.get(role)
+        if isinstance(profile, dict):
+            return profile
         return default
@@ -0,0 +1,227 @@
+import threading
+from typing import Optional
+
+from sqlalchemy import delete, event, func, inspect
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from app.db.models import AgentMemory, Approval, AuditLog, Job, JobEvent, MetricCounter, Run, Task
+
+
+# Counters live per (project, run); run 0 holds the project totals.
+PROJECT = 0
+READY = "_ready"
+COUNTERS = ("tasks", "tool_calls", "tool_errors", "approvals_pending", "memory_entries", "events")
+TOOL_PREFIX = "tool:"
+
+_lock = threading.Lock()
+_enabled = False
+_run_projects: dict[tuple[str, int], int] = {}
+_job_runs: dict[tuple[str, int], int] = {}
+
+
+def enable_rollups() -> None:
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        event.listen(Session, "after_flush", _track)
+        _enabled = True
+
+
+def aggregate(session: Session, project_id: int, run_id: Optional[int] = None) -> dict:
+    if run_id:
+        run_ids = [run_id]
+        runs = 1 if session.get(Run, run_id) else 0
+    else:
+        run_ids = select(Run.id).where(Run.project_id == project_id)
+        runs = session.exec(select(func.count()).select_from(Run).where(Run.project_id == project_id)).one()
+    counts = _aggregate_by_run(session, run_ids)
+    totals = {name: 0 for name in COUNTERS}
+    breakdown: dict[str, int] = {}
+    for counters in counts.values():
+        for name, value in counters.items():
+            if name.startswith(TOOL_PREFIX):
+                tool = name[len(TOOL_PREFIX) :]
+                breakdown[tool] = breakdown.get(tool, 0) + value
+            else:
+                totals[name] += value
+    return {"runs": runs, **totals, "tool_breakdown": breakdown}
+
+
+def read(session: Session, project_id: int, run_id: Optional[int] = None) -> Optional[dict]:
+    scope = run_id or PROJECT
+    rows = session.exec(
+        select(MetricCounter.run_id, MetricCounter.name, MetricCounter.value).where(
+            MetricCounter.project_id == project_id, MetricCounter.run_id.in_({PROJECT, scope})
+        )
+    ).all()
+    if (PROJECT, READY) not in {(row_run, name) for row_run, name, _ in rows}:
+        return None
+    values = {name: value for row_run, name, value in rows if row_run == scope}
+    runs = (1 if session.get(Run, run_id) else 0) if run_id else values.get("runs", 0)
+    return {
+        "runs": runs,
+        **{name: values.get(name, 0) for name in COUNTERS},
+        "tool_breakdown": {
+            name[len(TOOL_PREFIX) :]: value
+            for name, value in values.items()
+            if name.startswith(TOOL_PREFIX) and value
+        },
+    }
+
+
+def rebuild(session: Session, project_id: int) -> list[dict]:
+    run_ids = list(session.exec(select(Run.id).where(Run.project_id == project_id)).all())
+    expected: dict[tuple[int, str], int] = {(PROJECT, READY): 1, (PROJECT, "runs"): len(run_ids)}
+    for run_id, counters in _aggregate_by_run(session, run_ids).items():
+        for name, value in counters.items():
+            if not value:
+                continue
+            expected[(run_id, name)] = value
+            expected[(PROJECT, name)] = expected.get((PROJECT, name), 0) + value
+    rows = session.exec(select(MetricCounter).where(MetricCounter.project_id == project_id)).all()
+    stored = {(row.run_id, row.name): row.value for row in rows}
+    mismatches = []
+    for run_id, name in sorted(set(stored) | set(expected)):
+        actual = expected.get((run_id, name), 0)
+        if name != READY and stored.get((run_id, name), 0) != actual:
+            mismatches.append(
+                {"run_id": run_id or None, "name": name, "stored": stored.get((run_id, name), 0), "actual": actual}
+            )
+    session.exec(delete(MetricCounter).where(MetricCounter.project_id == project_id))
+    session.add_all(
+        MetricCounter(project_id=project_id, run_id=run_id, name=name, value=value)
+        for (run_id, name), value in expected.items()
+    )
+    session.commit()
+    return mismatches
+
+
+def _aggregate_by_run(session: Session, run_ids) -> dict[int, dict[str, int]]:
+    counts: dict[int, dict[str, int]] = {}
+
+    def add(run_id: Optional[int], name: str, value: int) -> None:
+        if run_id is not None and value:
+            counters = counts.setdefault(run_id, {})
+            counters[name] = counters.get(name, 0) + value
+
+    for run_id, value in session.exec(
+        select(Task.run_id, func.count()).where(Task.run_id.in_(run_ids)).group_by(Task.run_id)
+    ).all():
+        add(run_id, "tasks", value)
+    for run_id, value in session.exec(
+        select(AuditLog.run_id, func.count())
+        .where(AuditLog.run_id.in_(run_ids), AuditLog.decision != "allowed")
+        .group_by(AuditLog.run_id)
+    ).all():
+        add(run_id, "tool_errors", value)
+    for run_id, tool_name, value in session.exec(
+        select(AuditLog.run_id, AuditLog.tool_name, func.count())
+        .where(AuditLog.run_id.in_(run_ids), AuditLog.action == "tool.request")
+        .group_by(AuditLog.run_id, AuditLog.tool_name)
+    ).all():
+        add(run_id, "tool_calls", value)
+        add(run_id, TOOL_PREFIX + (tool_name or "unknown"), value)
+    for run_id, value in session.exec(
+        select(Approval.run_id, func.count())
+        .where(Approval.run_id.in_(run_ids), Approval.status == "pending")
+        .group_by(Approval.run_id)
+    ).all():
+        add(run_id, "approvals_pending", value)
+    for run_id, value in session.exec(
+        select(AgentMemory.run_id, func.count())
+        .where(AgentMemory.run_id.in_(run_ids))
+        .group_by(AgentMemory.run_id)
+    ).all():
+        add(run_id, "memory_entries", value)
+    for run_id, value in session.exec(
+        select(Job.run_id, func.count(JobEvent.id))
+        .join(JobEvent, JobEvent.job_id == Job.id)
+        .where(Job.run_id.in_(run_ids))
+        .group_by(Job.run_id)
+    ).all():
+        add(run_id, "events", value)
+    return counts
+
+
+def _track(session: Session, flush_context) -> None:
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    url = str(bind.url)
+    deltas: dict[tuple[int, int, str], int] = {}
+
+    def add(run_id: Optional[int], name: str, value: int = 1) -> None:
+        project_id = _project_of(session, url, run_id)
+        if project_id is None:
+            return
+        for scope in (run_id, PROJECT):
+            key = (project_id, scope, name)
+            deltas[key] = deltas.get(key, 0) + value
+
+    for obj in session.new:
+        if isinstance(obj, Run):
+            key = (obj.project_id, PROJECT, "runs")
+            deltas[key] = deltas.get(key, 0) + 1
+        elif isinstance(obj, Task):
+            add(obj.run_id, "tasks")
+        elif isinstance(obj, AuditLog):
+            if obj.action == "tool.request":
+                add(obj.run_id, "tool_calls")
+                add(obj.run_id, TOOL_PREFIX + (obj.tool_name or "unknown"))
+            if obj.decision != "allowed":
+                add(obj.run_id, "tool_errors")
+        elif isinstance(obj, Approval):
+            if obj.status == "pending":
+                add(obj.run_id, "approvals_pending")
+        elif isinstance(obj, AgentMemory):
+            add(obj.run_id, "memory_entries")
+        elif isinstance(obj, JobEvent):
+            add(_run_of_job(session, url, obj.job_id), "events")
+    for obj in session.dirty:
+        if not isinstance(obj, Approval):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes():
+            continue
+        was_pending = "pending" in (history.deleted or ())
+        if was_pending != (obj.status == "pending"):
+            add(obj.run_id, "approvals_pending", -1 if was_pending else 1)
+    if not deltas:
+        return
+    connection = session.connection()
+    for (project_id, run_id, name), value in deltas.items():
+        statement = insert(MetricCounter).values(project_id=project_id, run_id=run_id, name=name, value=value)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["project_id", "run_id", "name"],
+                set_={"value": MetricCounter.value + statement.excluded.value},
+            )
+        )
+
+
+def _project_of(session: Session, url: str, run_id: Optional[int]) -> Optional[int]:
+    if not run_id:
+        return None
+    key = (url, run_id)
+    if key not in _run_projects:
+        with session.no_autoflush:
+            run = session.get(Run, run_id)
+        if run is None:
+            return None
+        _run_projects[key] = run.project_id
+    return _run_projects[key]
+
+
+def _run_of_job(session: Session, url: str, job_id: Optional[int]) -> Optional[int]:
+    if not job_id:
+        return None
+    key = (url, job_id)
+    if key not in _job_runs:
+        with session.no_autoflush:
+            job = session.get(Job, job_id)
+        if job is None:
+            return None
+        _job_runs[key] = job.run_id
+    return _job_runs[key]
@@ -8,12 +8,14 @@ from pathlib import Path
 
 from app.agents.runtime import AgentRuntime
 from app.core.artifacts import ArtifactStore
+from app.core.config_cache import get_config_cache
 from app.core.events import Event, EventBus
 from app.core.job_engine import JobEngine, JobStepResult
 from app.core.memory import MemoryStore
+from app.core.task_dispatcher import TaskDispatcher
 from app.core.verification import Verifier
-from app.db.models import AgentConfig, Job, Project, ProjectSetting, Run, Task
-from app.db.session import get_session
+from app.db.models import AgentConfig, Job, Project, Run, Task
+from app.db.session import get_session, run_db
 from app.repo.file_watcher import FileWatcher
 
 
@@ -26,6 +28,7 @@ class Orchestrator:
         default_repo_root: Path,
         job_engine: JobEngine,
         verifier: Verifier,
+        task_dispatcher: TaskDispatcher | None = None,
     ) -> None:
         self.event_bus = event_bus
         self.artifact_store = artifact_store
@@ -34,17 +37,15 @@ class Orchestrator:
         self.memory_store = MemoryStore()
         self.job_engine = job_engine
         self.verifier = verifier
+        self.task_dispatcher = task_dispatcher or TaskDispatcher()
 
     async def _emit(self, run_id: int, event_type: str, payload: dict) -> None:
-        event = Event(type=event_type, payload=payload)
+        event = Event(type=event_type, payload=payload, run_id=run_id)
         await self.event_bus.publish(event)
         self.artifact_store.write_event(run_id, event.__dict__)
 
-    def _get_agents(self, team_id: int, session=None) -> List[AgentConfig]:
-        if session is None:
-            with get_session() as session:
-                return list(session.exec(select(AgentConfig).where(AgentConfig.team_id == team_id)))
-        return list(session.exec(select(AgentConfig).where(AgentConfig.team_id == team_id)))
+    def _get_agents(self, team_id: int) -> List[AgentConfig]:
+        return get_config_cache().roster(team_id)
 
     async def start_run(self, run_id: int) -> None:
         with get_session() as session:
@@ -62,7 +63,7 @@ class Orchestrator:
             session.add(run)
             session.commit()
 
-        job_id = self.job_engine.create_job(run_id)
+        job_id = await run_db(self.job_engine.create_job, run_id)
         watcher = FileWatcher(repo_root, self.event_bus, self.artifact_store, run_id)
         await self._emit(
             run_id,
@@ -101,16 +102,14 @@ class Orchestrator:
             run = session.get(Run, run_id)
             if not run:
                 return JobStepResult(False, "run_not_found")
-            setting = session.exec(
-                select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-            ).first()
+            setting = get_config_cache().setting(run.project_id)
             policy = (setting.chat_target_policy if setting else None) or "managers"
             if policy != "team":
                 return JobStepResult(True)
             existing = session.exec(select(Task).where(Task.run_id == run.id)).first()
             if existing:
                 return JobStepResult(True)
-            agents = self._get_agents(run.team_id, session)
+            agents = self._get_agents(run.team_id)
         manager = _pick_manager(agents)
         if not manager or not manager.id:
             return JobStepResult(True)
@@ -131,7 +130,9 @@ class Orchestrator:
             f"Team members: {roles}\n"
             f"Run goal:\n{run.goal}\n"
         )
-        response = await self.agent_runtime.run_agent(run.id, manager, manager_prompt)
+        response = await self.agent_runtime.run_agent(
+            run.id, manager, manager_prompt, cache="planning"
+        )
         response_text = (response.get("content") or "").strip()
         payload = _extract_json_payload(response_text)
         directive = payload.get("directive") if payload else None
@@ -164,6 +165,7 @@ class Orchestrator:
                 session.commit()
                 session.refresh(task)
                 created_tasks += 1
+                self.task_dispatcher.notify()
                 await self._emit(
                     run.id,
                     "task.created",
@@ -182,7 +184,7 @@ class Orchestrator:
             run = session.get(Run, run_id)
             if not run:
                 return JobStepResult(False, "run_not_found")
-            agents = self._get_agents(run.team_id, session)
+            agents = self._get_agents(run.team_id)
             for agent in agents:
                 response = await self.agent_runtime.run_agent(run_id, agent, run.goal)
                 self.artifact_store.write_chat(run_id, agent.role, response)
@@ -224,7 +226,7 @@ class Orchestrator:
             run = session.get(Run, run_id)
             if not run:
                 return
-            agents = self._get_agents(run.team_id, session)
+            agents = self._get_agents(run.team_id)
             for agent in agents:
                 prompt = (
                     "Introduce yourself in one short paragraph. "
@@ -232,7 +234,7 @@ class Orchestrator:
                     f"Role: {agent.role}. "
                     f"Persona: {agent.personality or 'Professional and concise.'}"
                 )
-                response = await self.agent_runtime.run_agent(run_id, agent, prompt)
+                response = await self.agent_runtime.run_agent(run_id, agent, prompt, cache="introduce")
                 self.artifact_store.write_chat(run_id, agent.role, response)
                 await self._emit(
                     run_id,
@@ -277,6 +279,7 @@ class Orchestrator:
             session.add(task)
             session.commit()
             session.refresh(task)
+            self.task_dispatcher.notify()
             return task
 
 
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.core.jsonl_log import JsonlLog
+
+
+_lock = threading.Lock()
+_seqs: dict[tuple[Path, int], int] = {}
+_latest: dict[tuple[Path, int, str], str] = {}
+
+
+class SnapshotStore:
+    def __init__(self, base_dir: Path, max_bytes: int = 1_000_000, compress: bool = True) -> None:
+        self.base_dir = base_dir
+        self.blob_dir = base_dir / "blobs"
+        self.max_bytes = max_bytes
+        self.compress = compress
+
+    def save_file(self, run_id: int, path: Path) -> dict:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return {"skipped": "missing"}
+        if size > self.max_bytes:
+            return {"skipped": "too_large", "size": size}
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return {"skipped": "unreadable"}
+        return self.save(run_id, str(path), data)
+
+    def save(self, run_id: int, file_path: str, data: bytes) -> dict:
+        if len(data) > self.max_bytes:
+            return {"skipped": "too_large", "size": len(data)}
+        if _is_binary(data):
+            return {"skipped": "binary", "size": len(data)}
+        digest = hashlib.sha256(data).hexdigest()
+        log = self._manifest(run_id)
+        key = (self.base_dir, run_id)
+        with _lock:
+            if key not in _seqs:
+                self._load_latest(run_id, log)
+            # An editor save that leaves content unchanged is not a new version.
+            if _latest.get((self.base_dir, run_id, file_path)) == digest:
+                return {"skipped": "unchanged", "hash": digest}
+            self._write_blob(digest, data)
+            _seqs[key] += 1
+            entry = {
+                "seq": _seqs[key],
+                "path": file_path,
+                "hash": digest,
+                "size": len(data),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            log.append(entry)
+            _latest[(self.base_dir, run_id, file_path)] = digest
+        return entry
+
+    def history(self, run_id: int, file_path: Optional[str] = None) -> list[dict]:
+        match = file_path.__eq__ if file_path is not None else None
+        return self._manifest(run_id).page(match=match)[0]
+
+    def read_blob(self, digest: str) -> Optional[bytes]:
+        for path, packed in ((self._blob_path(digest, True), True), (self._blob_path(digest, False), False)):
+            try:
+                data = path.read_bytes()
+            except OSError:
+                continue
+            return zlib.decompress(data) if packed else data
+        return None
+
+    def _write_blob(self, digest: str, data: bytes) -> None:
+        if self._blob_path(digest, True).exists() or self._blob_path(digest, False).exists():
+            return
+        path = self._blob_path(digest, self.compress)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        staging.write_bytes(zlib.compress(data, 6) if self.compress else data)
+        os.replace(staging, path)
+
+    def _blob_path(self, digest: str, packed: bool) -> Path:
+        return self.blob_dir / digest[:2] / (f"{digest[2:]}.z" if packed else digest[2:])
+
+    def _manifest(self, run_id: int) -> JsonlLog:
+        return JsonlLog(self.base_dir / "runs" / str(run_id) / "snapshots" / "manifest.jsonl", "path")
+
+    def _load_latest(self, run_id: int, log: JsonlLog) -> None:
+        highest = 0
+        for entry in log.page()[0]:
+            highest = max(highest, int(entry.get("seq") or 0))
+            _latest[(self.base_dir, run_id, str(entry.get("path")))] = str(entry.get("hash"))
+        _seqs[(self.base_dir, run_id)] = highest
+
+
+def _is_binary(data: bytes) -> bool:
+    if b"\x00" in data[:8192]:
+        return True
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return True
+    return False
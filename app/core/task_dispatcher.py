@@ -0,0 +1,41 @@
+import asyncio
+from typing import Optional
+
+
+class TaskDispatcher:
+    def __init__(self, sweep_interval: float = 30.0) -> None:
+        self.sweep_interval = sweep_interval
+        self._signals: list[asyncio.Event] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self) -> asyncio.Event:
+        self._loop = asyncio.get_event_loop()
+        signal = asyncio.Event()
+        # Start signalled so the first pass reconciles anything already pending.
+        signal.set()
+        self._signals.append(signal)
+        return signal
+
+    def unsubscribe(self, signal: asyncio.Event) -> None:
+        if signal in self._signals:
+            self._signals.remove(signal)
+
+    def notify(self) -> None:
+        if not self._signals:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for signal in list(self._signals):
+            if running is not None and running is self._loop:
+                signal.set()
+            elif self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(signal.set)
+
+    async def wait(self, signal: asyncio.Event) -> None:
+        try:
+            await asyncio.wait_for(signal.wait(), timeout=self.sweep_interval)
+        except asyncio.TimeoutError:
+            pass
+        signal.clear()
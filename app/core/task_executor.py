@@ -0,0 +1,93 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Coroutine, Optional
+
+from app.db.models import AgentConfig, ProjectSetting, Run, Task
+
+
+@dataclass
+class ClaimedTask:
+    task: Task
+    run: Run
+    agent: AgentConfig
+    setting: Optional[ProjectSetting] = None
+    agents: list[AgentConfig] = field(default_factory=list)
+
+
+class TaskExecutor:
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_agent: int = 1,
+        per_provider: int = 4,
+        on_release: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_agent = max(1, per_agent)
+        self.per_provider = max(1, per_provider)
+        self.on_release = on_release
+        self._inflight: dict[int, asyncio.Task] = {}
+        self._agent_counts: dict[int, int] = {}
+        self._provider_counts: dict[str, int] = {}
+        self._waiters: list[asyncio.Future] = []
+
+    def has_capacity(self) -> bool:
+        return len(self._inflight) < self.max_concurrency
+
+    def is_inflight(self, task_id: int) -> bool:
+        return task_id in self._inflight
+
+    def spawn(self, task_id: int, coro: Coroutine) -> bool:
+        if task_id in self._inflight or not self.has_capacity():
+            coro.close()
+            return False
+        job = asyncio.create_task(coro)
+        self._inflight[task_id] = job
+        job.add_done_callback(lambda _: self._finish(task_id))
+        return True
+
+    def try_reserve(self, agent: AgentConfig) -> bool:
+        agent_key = agent.id or 0
+        provider_key = agent.provider or ""
+        if self._agent_counts.get(agent_key, 0) >= self.per_agent:
+            return False
+        if self._provider_counts.get(provider_key, 0) >= self.per_provider:
+            return False
+        self._agent_counts[agent_key] = self._agent_counts.get(agent_key, 0) + 1
+        self._provider_counts[provider_key] = self._provider_counts.get(provider_key, 0) + 1
+        return True
+
+    async def reserve(self, agent: AgentConfig) -> None:
+        while not self.try_reserve(agent):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    @asynccontextmanager
+    async def slot(self, agent: AgentConfig) -> AsyncIterator[None]:
+        await self.reserve(agent)
+        try:
+            yield
+        finally:
+            self.release(agent)
+
+    def release(self, agent: AgentConfig, notify: bool = True) -> None:
+        agent_key = agent.id or 0
+        provider_key = agent.provider or ""
+        self._agent_counts[agent_key] = max(0, self._agent_counts.get(agent_key, 0) - 1)
+        self._provider_counts[provider_key] = max(0, self._provider_counts.get(provider_key, 0) - 1)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        if notify and self.on_release:
+            # Deferred so the finished job leaves the in-flight set before the next pass.
+            asyncio.get_running_loop().call_soon(self.on_release)
+
+    def _finish(self, task_id: int) -> None:
+        self._inflight.pop(task_id, None)
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import and_, or_, update
+
+from app.db.models import ProjectSetting, Task
+from app.db.session import get_session, run_db
+
+DEFAULT_RETRY_LIMIT = 3
+
+
+def retry_limit(setting: Optional[ProjectSetting]) -> int:
+    if setting and setting.task_retry_limit:
+        return max(1, int(setting.task_retry_limit))
+    return DEFAULT_RETRY_LIMIT
+
+
+class TaskLeaseManager:
+    def __init__(self, lease_seconds: float = 120.0, owner: Optional[str] = None) -> None:
+        self.lease_seconds = max(5.0, lease_seconds)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def claimable(self, now: Optional[datetime] = None):
+        now = now or datetime.utcnow()
+        return or_(
+            Task.status == "pending",
+            and_(
+                Task.status == "in_progress",
+                or_(Task.lease_expires_at == None, Task.lease_expires_at < now),  # noqa: E711
+            ),
+        )
+
+    def is_claimable(self, task: Task, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.utcnow()
+        if task.status == "pending":
+            return True
+        if task.status != "in_progress":
+            return False
+        return task.lease_expires_at is None or task.lease_expires_at < now
+
+    def claim(self, session, task_id: int, assigned_role: Optional[str]) -> bool:
+        now = datetime.utcnow()
+        result = session.exec(
+            update(Task)
+            .where(Task.id == task_id, self.claimable(now))
+            .values(
+                status="in_progress",
+                assigned_role=assigned_role,
+                attempts=Task.attempts + 1,
+                lease_owner=self.owner,
+                lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                updated_at=now,
+            )
+        )
+        return result.rowcount == 1
+
+    def claim_task(self, task_id: int, assigned_role: Optional[str]) -> Optional[Task]:
+        with get_session() as session:
+            session.expire_on_commit = False
+            if not self.claim(session, task_id, assigned_role):
+                session.rollback()
+                return None
+            session.commit()
+            return session.get(Task, task_id)
+
+    def renew(self, task_id: int) -> bool:
+        now = datetime.utcnow()
+        with get_session() as session:
+            result = session.exec(
+                update(Task)
+                .where(
+                    Task.id == task_id,
+                    Task.status == "in_progress",
+                    Task.lease_owner == self.owner,
+                )
+                .values(lease_expires_at=now + timedelta(seconds=self.lease_seconds))
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def finish(self, task_id: int, status: str) -> bool:
+        now = datetime.utcnow()
+        values = {
+            "status": status,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now,
+        }
+        if status == "completed":
+            values["completed_at"] = now
+        with get_session() as session:
+            result = session.exec(
+                update(Task)
+                .where(
+                    Task.id == task_id,
+                    Task.status == "in_progress",
+                    Task.lease_owner == self.owner,
+                )
+                .values(**values)
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def fail_exhausted(self, task_id: int, limit: int) -> bool:
+        now = datetime.utcnow()
+        with get_session() as session:
+            # Fenced like a claim, so a worker that holds a live lease keeps the task.
+            result = session.exec(
+                update(Task)
+                .where(Task.id == task_id, self.claimable(now), Task.attempts >= limit)
+                .values(status="failed", lease_owner=None, lease_expires_at=None, updated_at=now)
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def abandon(self, task_id: int, attempts: int, limit: int) -> Optional[str]:
+        status = "failed" if attempts >= limit else "pending"
+        return status if self.finish(task_id, status) else None
+
+    @asynccontextmanager
+    async def hold(self, task_id: int) -> AsyncIterator[None]:
+        heartbeat = asyncio.create_task(self._heartbeat(task_id))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, task_id: int) -> None:
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await run_db(self.renew, task_id):
+                    return
+            except Exception:
+                continue
@@ -7,6 +7,7 @@ from app.core.approvals import ApprovalStore
 from app.core.audit import AuditEntry, AuditLogger
 from app.core.events import Event, EventBus
 from app.core.policy import PolicyEngine
+from app.db.session import run_db
 
 
 @dataclass
@@ -69,18 +70,19 @@ class ToolBroker:
             risk_level=request.risk_level,
             approved=approved,
         )
-        self.audit_logger.log(
-            AuditEntry(
-                actor=request.actor,
-                action="tool.request",
-                decision=decision.reason,
-                tool_name=request.tool_name,
-                risk_level=request.risk_level,
-                request=request.arguments,
-                run_id=request.run_id,
-                job_id=request.job_id,
-            )
+        entry = AuditEntry(
+            actor=request.actor,
+            action="tool.request",
+            decision=decision.reason,
+            tool_name=request.tool_name,
+            risk_level=request.risk_level,
+            request=request.arguments,
+            run_id=request.run_id,
+            job_id=request.job_id,
         )
+        # Approval-gated actions run only once their audit row is committed.
+        gated = decision.allowed and approved and not request.approved
+        logged = self.audit_logger.log(entry, durable=gated)
         self._emit_event(
             "tool.requested",
             {
@@ -100,6 +102,8 @@ class ToolBroker:
         executor = self.executors.get(request.tool_name)
         if not executor:
             return ToolResult(success=False, error="tool_not_registered")
+        if gated and not logged:
+            return ToolResult(success=False, error="audit_unavailable")
         result = executor(request)
         self.audit_logger.log(
             AuditEntry(
@@ -132,7 +136,8 @@ class ToolBroker:
     async def execute_async(self, request: ToolRequest, actor_scopes: Iterable[str]) -> ToolResult:
         approved = request.approved
         if not approved and self.approvals:
-            approved = self.approvals.is_approved(
+            approved = await run_db(
+                self.approvals.is_approved,
                 request.approval_id,
                 tool_name=request.tool_name,
                 risk_level=request.risk_level,
@@ -143,18 +148,22 @@ class ToolBroker:
             risk_level=request.risk_level,
             approved=approved,
         )
-        self.audit_logger.log(
-            AuditEntry(
-                actor=request.actor,
-                action="tool.request",
-                decision=decision.reason,
-                tool_name=request.tool_name,
-                risk_level=request.risk_level,
-                request=request.arguments,
-                run_id=request.run_id,
-                job_id=request.job_id,
-            )
+        entry = AuditEntry(
+            actor=request.actor,
+            action="tool.request",
+            decision=decision.reason,
+            tool_name=request.tool_name,
+            risk_level=request.risk_level,
+            request=request.arguments,
+            run_id=request.run_id,
+            job_id=request.job_id,
         )
+        # Approval-gated actions run only once their audit row is committed.
+        gated = decision.allowed and approved and not request.approved
+        if gated:
+            logged = await run_db(self.audit_logger.log, entry, durable=True)
+        else:
+            logged = self.audit_logger.log(entry)
         self._emit_event(
             "tool.requested",
             {
@@ -174,6 +183,8 @@ class ToolBroker:
         executor = self.executors.get(request.tool_name)
         if not executor:
             return ToolResult(success=False, error="tool_not_registered")
+        if gated and not logged:
+            return ToolResult(success=False, error="audit_unavailable")
         if inspect.iscoroutinefunction(executor):
             result = await executor(request)
         else:
@@ -207,9 +218,10 @@ class ToolBroker:
         return result
 
     def _emit_event(self, event_type: str, payload: dict, run_id: int | None) -> None:
+        event = Event(type=event_type, payload=payload, run_id=run_id)
         if self.event_writer and run_id:
             try:
-                self.event_writer(run_id, {"type": event_type, "payload": payload})
+                self.event_writer(run_id, event.__dict__)
             except Exception:
                 pass
         if not self.event_bus:
@@ -217,6 +229,6 @@ class ToolBroker:
         try:
             loop = asyncio.get_event_loop()
             if loop.is_running():
-                loop.create_task(self.event_bus.publish(Event(type=event_type, payload=payload)))
+                loop.create_task(self.event_bus.publish(event))
         except Exception:
             return
@@ -2,15 +2,15 @@ import json
 import asyncio
 from pathlib import Path
 
+from app.core.config_cache import get_config_cache
 from app.core.events import Event
 from app.core.file_tools import execute_file_tool
 from app.core.git_tools import execute_git_tool
 from app.core.shell import execute_shell_tool, is_destructive_command
 from app.core.tool_broker import ToolRequest, ToolResult
 from app.integrations.mcp_client import MCPClient
-from app.db.models import Approval, ProjectSetting, Run
+from app.db.models import Approval
 from app.db.session import get_session
-from sqlmodel import select
 
 
 def extract_tool_call(text: str) -> dict | None:
@@ -149,14 +149,8 @@ async def execute_tool_call(
 def _requires_pr_approval(run_id: int) -> bool:
     if not run_id:
         return False
-    with get_session() as session:
-        run = session.get(Run, run_id)
-        if not run:
-            return False
-        setting = session.exec(
-            select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-        ).first()
-        return bool(setting.require_pm_pr_approval) if setting else False
+    setting = get_config_cache().setting_for_run(run_id)
+    return bool(setting.require_pm_pr_approval) if setting else False
 
 
 def _create_approval(run_id: int, actor: str, tool_name: str, risk_level: str) -> int:
@@ -177,7 +171,7 @@ def _create_approval(run_id: int, actor: str, tool_name: str, risk_level: str) -
 def _emit_event(event_bus, artifact_store, run_id: int, event_type: str, payload: dict) -> None:
     if not run_id:
         return
-    event = Event(type=event_type, payload=payload)
+    event = Event(type=event_type, payload=payload, run_id=run_id)
     if artifact_store:
         artifact_store.write_event(run_id, event.__dict__)
     if event_bus:
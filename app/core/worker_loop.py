@@ -1,15 +1,21 @@
 import asyncio
+import json
 from datetime import datetime, timedelta
 from typing import Optional
 
 from sqlmodel import select
 
+from app.core.chat_cursors import ChatCursorStore
+from app.core.config_cache import get_config_cache
 from app.core.events import Event, EventBus
 from app.core.memory import MemoryStore
+from app.core.task_dispatcher import TaskDispatcher
+from app.core.task_executor import ClaimedTask, TaskExecutor
+from app.core.task_leases import TaskLeaseManager, retry_limit
 from app.core.tool_dispatcher import execute_tool_call, extract_tool_call, normalize_tool_response
-from app.db.models import AgentConfig, ProjectSetting, Run, Task, Team
-from app.db.session import get_session
-from app.core.chat_router import MANAGER_ROLES
+from app.db.models import AgentConfig, ProjectSetting, Run, Task
+from app.db.session import get_session, run_db
+from app.core.chat_router import ChatRouter, MANAGER_ROLES
 
 
 class WorkerLoop:
@@ -22,6 +28,10 @@ class WorkerLoop:
         artifact_store,
         repo_root,
         allow_self_edit: bool,
+        task_dispatcher: TaskDispatcher | None = None,
+        task_executor: TaskExecutor | None = None,
+        task_leases: TaskLeaseManager | None = None,
+        chat_router: ChatRouter | None = None,
     ) -> None:
         self.event_bus = event_bus
         self.get_active_project_id = get_active_project_id
@@ -29,9 +39,13 @@ class WorkerLoop:
         self.tool_broker = tool_broker
         self.artifact_store = artifact_store
         self._running = False
+        self.task_dispatcher = task_dispatcher or TaskDispatcher()
+        self.task_executor = task_executor or TaskExecutor(on_release=self.task_dispatcher.notify)
+        self.task_leases = task_leases or TaskLeaseManager()
         self._idle_prompted: dict[int, datetime] = {}
         self._manager_prompted: dict[int, datetime] = {}
-        self._chat_seen: dict[int, list[str]] = {}
+        self.chat_cursors = ChatCursorStore()
+        self.chat_router = chat_router or ChatRouter()
         self.repo_root = repo_root
         self.allow_self_edit = allow_self_edit
         self.memory = MemoryStore()
@@ -41,72 +55,144 @@ class WorkerLoop:
             return
         self._running = True
         asyncio.create_task(self._run())
+        asyncio.create_task(self._watch_chat())
 
     async def _run(self) -> None:
-        while True:
-            try:
-                await self._tick()
-            except Exception:
-                pass
-            await asyncio.sleep(2)
+        signal = self.task_dispatcher.subscribe()
+        try:
+            while True:
+                await self.task_dispatcher.wait(signal)
+                try:
+                    await self._tick()
+                except Exception:
+                    pass
+        finally:
+            self.task_dispatcher.unsubscribe(signal)
+
+    async def _watch_chat(self) -> None:
+        # Only used as a wake-up signal, so a burst of chat collapses to one pending entry.
+        queue = self.event_bus.subscribe(
+            maxsize=16, policy="coalesce", name="worker_loop", types="chat.message"
+        )
+        try:
+            while True:
+                message = await queue.get()
+                try:
+                    event_type = json.loads(message).get("type")
+                except Exception:
+                    continue
+                if event_type == "chat.message":
+                    self.task_dispatcher.notify()
+        finally:
+            self.event_bus.unsubscribe(queue)
 
     async def _tick(self) -> None:
         project_id = self.get_active_project_id()
         if project_id is None:
             return
+        tasks, run, agents = await run_db(self._load_tick, project_id)
+        for task in tasks:
+            if not self.task_executor.has_capacity():
+                break
+            if self.task_executor.is_inflight(task.id):
+                continue
+            claimed = await self._claim_task(task.id)
+            if claimed:
+                self.task_executor.spawn(task.id, self._handle_task(claimed))
+        if run:
+            if run.pause_mode:
+                return
+            await self._prompt_idle(run, agents)
+            await self._process_chat(run, agents)
+
+    def _load_tick(self, project_id: int) -> tuple[list[Task], Optional[Run], list[AgentConfig]]:
         with get_session() as session:
             tasks = list(
                 session.exec(
                     select(Task)
-                    .where(Task.status == "pending")
+                    .where(self.task_leases.claimable())
                     .order_by(Task.created_at.asc())
                 )
             )
             run = session.exec(
                 select(Run).where(Run.project_id == project_id).order_by(Run.id.desc())
             ).first()
-            agents = (
-                list(session.exec(select(AgentConfig).where(AgentConfig.team_id == run.team_id)))
-                if run
-                else []
+        agents = get_config_cache().roster(run.team_id) if run else []
+        return tasks, run, agents
+
+    async def _claim_task(self, task_id: int) -> Optional[ClaimedTask]:
+        loaded = await run_db(self._load_claim, task_id)
+        if not loaded:
+            return None
+        task, run, agents, setting, exhausted = loaded
+        if exhausted:
+            await self._emit(
+                task.run_id,
+                "task.failed",
+                {"task_id": task.id, "reason": f"max_attempts:{exhausted}"},
             )
-        for task in tasks[:5]:
-            await self._handle_task(task.id)
-        if run:
-            if run.pause_mode:
-                return
-            await self._prompt_idle(run, agents)
-            await self._process_chat(run, agents)
+            return None
+        assigned = _pick_agent(agents, task)
+        # Reservations stay on the event loop; the conditional UPDATE is what makes the claim exclusive.
+        if not assigned or not self.task_executor.try_reserve(assigned):
+            return None
+        task = await run_db(self.task_leases.claim_task, task_id, assigned.role)
+        if task is None:
+            self.task_executor.release(assigned, notify=False)
+            return None
+
+        await self._emit(
+            run.id,
+            "task.started",
+            {"task_id": task.id, "assigned_role": assigned.role, "title": task.title},
+        )
+        return ClaimedTask(task=task, run=run, agent=assigned, setting=setting, agents=agents)
 
-    async def _handle_task(self, task_id: int) -> None:
+    def _load_claim(
+        self, task_id: int
+    ) -> Optional[tuple[Task, Run, list[AgentConfig], Optional[ProjectSetting], Optional[int]]]:
         with get_session() as session:
             task = session.get(Task, task_id)
-            if not task or task.status != "pending":
-                return
+            if not task or not self.task_leases.is_claimable(task):
+                return None
             run = session.get(Run, task.run_id)
             if not run:
-                return
-            team = session.get(Team, run.team_id)
-            agents = list(session.exec(select(AgentConfig).where(AgentConfig.team_id == team.id)))
-            setting = session.exec(
-                select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-            ).first()
-            assigned = _pick_agent(agents, task)
-            if not assigned:
-                return
-            task.status = "in_progress"
-            task.assigned_role = assigned.role
-            task.attempts += 1
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            session.commit()
+                return None
+        cache = get_config_cache()
+        setting = cache.setting(run.project_id)
+        limit = retry_limit(setting)
+        if task.attempts >= limit:
+            if not self.task_leases.fail_exhausted(task_id, limit):
+                return None
+            return task, run, [], setting, limit
+        return task, run, cache.roster(run.team_id), setting, None
 
-        await self._emit(
-            run.id,
-            "task.started",
-            {"task_id": task.id, "assigned_role": assigned.role, "title": task.title},
+    async def _handle_task(self, claimed: ClaimedTask) -> None:
+        try:
+            async with self.task_leases.hold(claimed.task.id):
+                await self._execute_task(claimed)
+        except Exception as exc:
+            await self._abandon(claimed, exc)
+        finally:
+            self.task_executor.release(claimed.agent)
+
+    async def _abandon(self, claimed: ClaimedTask, exc: Exception) -> None:
+        task = claimed.task
+        status = await run_db(
+            self.task_leases.abandon, task.id, task.attempts, retry_limit(claimed.setting)
         )
+        if status == "pending":
+            self.task_dispatcher.notify()
+        if status:
+            await self._emit(
+                claimed.run.id,
+                "task.failed" if status == "failed" else "task.requeued",
+                {"task_id": task.id, "reason": f"error: {exc}"},
+            )
 
+    async def _execute_task(self, claimed: ClaimedTask) -> None:
+        task, run, assigned, setting = claimed.task, claimed.run, claimed.agent, claimed.setting
+        task_id = task.id
         tool_note = (
             "If you need to edit code, use ONLY JSON tool calls like:\n"
             '{"tool":"file.read","arguments":{"path":"src/app.ts"}}\n'
@@ -155,7 +241,7 @@ class WorkerLoop:
         }
         self.artifact_store.write_chat(run.id, assigned.role, worker_message)
         await self._emit(run.id, "chat.message", worker_message)
-        self.memory.append(run.id, assigned.id, assigned.role, f"Agent: {response_text}")
+        await run_db(self.memory.append, run.id, assigned.id, assigned.role, f"Agent: {response_text}")
         await self._emit(
             run.id,
             "memory.updated",
@@ -166,21 +252,14 @@ class WorkerLoop:
             },
         )
 
-        with get_session() as session:
-            task = session.get(Task, task_id)
-            if not task:
-                return
-            task.status = "completed"
-            task.completed_at = datetime.utcnow()
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            session.commit()
+        if not await run_db(self.task_leases.finish, task_id, "completed"):
+            return
 
         await self._emit(
             run.id,
             "task.completed",
             {
-                "task_id": task.id,
+                "task_id": task_id,
                 "summary": response_text,
                 "assigned_role": assigned.role,
                 "review": None,
@@ -233,114 +312,141 @@ class WorkerLoop:
             + ", ".join(idle_agents)
             + ". Provide next steps and assignments."
         )
-        with get_session() as session:
-            task = Task(
+        task = await run_db(
+            _insert_task,
+            Task(
                 run_id=run.id,
                 title=title,
                 description=description,
                 assigned_role=assigned_role,
-            )
-            session.add(task)
-            session.commit()
-            session.refresh(task)
-            await self._emit(
-                run.id,
-                "task.created",
-                {"task_id": task.id, "title": task.title, "assigned_role": task.assigned_role},
-            )
+            ),
+        )
+        self.task_dispatcher.notify()
+        await self._emit(
+            run.id,
+            "task.created",
+            {"task_id": task.id, "title": task.title, "assigned_role": task.assigned_role},
+        )
 
     async def _process_chat(self, run: Run, agents: list[AgentConfig]) -> None:
-        messages = self.artifact_store.read_chats(run.id)
+        head = self.artifact_store.head_chat_seq(run.id)
+        cursors = await run_db(self.chat_cursors.load, run.id, [agent.id for agent in agents], head)
+        if not cursors or min(cursors.values()) >= head:
+            return
+        messages = self.artifact_store.read_chats(run.id, after_seq=min(cursors.values()))
         if not messages:
             return
-        with get_session() as session:
-            setting = session.exec(
-                select(ProjectSetting).where(ProjectSetting.project_id == run.project_id)
-            ).first()
-        for agent in agents:
-            if not agent.id:
+        setting = await run_db(get_config_cache().setting, run.project_id)
+        started = dict(cursors)
+        processed: dict[int, int] = {}
+        for msg in messages:
+            seq = int(msg.get("seq") or 0)
+            readers = [
+                agent
+                for agent in agents
+                if agent.id
+                and cursors.get(agent.id, head) < seq
+                and processed.get(agent.id, 0) < 2
+            ]
+            if not readers:
                 continue
-            seen = self._chat_seen.get(agent.id, [])
-            processed = 0
-            for msg in messages:
-                message_id = msg.get("message_id") or f"{msg.get('agent')}:{msg.get('timestamp')}:{msg.get('content')}"
-                if message_id in seen:
-                    continue
-                seen.append(message_id)
-                if len(seen) > 200:
-                    seen = seen[-200:]
-                sender = str(msg.get("agent") or "")
-                if sender.lower() in {
-                    (agent.display_name or "").lower(),
-                    agent.role.lower(),
-                }:
-                    continue
-                prompt = (
-                    "Incoming team message:\n"
-                    f"From: {sender}\n"
-                    f"Content: {msg.get('content')}\n\n"
-                    "Decide if you should respond. If yes, respond with a concise update or action. "
-                    "If not needed, respond with ONLY: NO_RESPONSE.\n"
-                    "If you are blocked or done, ask @po or @dm what to do next. "
-                    "Use role tags like @po, @dm, @tl, @dev, @qa, @rm when appropriate."
-                )
-                response = await self.agent_runtime.run_agent(run.id, agent, prompt)
-                response_text = (response.get("content") or "").strip()
-                tool_call = extract_tool_call(response_text)
-                if tool_call:
-                    allow_file_edits = bool(setting and setting.auto_execute_edits) and (
-                        "developer" in agent.role.lower()
-                        or "engineer" in agent.role.lower()
-                    )
-                    response_text = await execute_tool_call(
-                        tool_call,
-                        broker=self.tool_broker,
-                        agent=agent,
-                        run_id=run.id,
-                        repo_root=self.repo_root,
-                        allow_self_edit=self.allow_self_edit,
-                        extra_allowed_roots=None,
-                        allow_file_edits=allow_file_edits,
-                        event_bus=self.event_bus,
-                        artifact_store=self.artifact_store,
-                    )
-                    response_text = normalize_tool_response(response_text)
-                if response_text.upper() == "NO_RESPONSE":
-                    processed += 1
-                    if processed >= 2:
-                        break
-                    continue
-                agent_message = {
-                    "message_id": f"auto-{agent.id}-{int(datetime.utcnow().timestamp())}",
-                    "agent": agent.display_name or agent.role,
-                    "role": agent.role,
-                    "content": response_text,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-                self.artifact_store.write_chat(run.id, agent.role, agent_message)
-                await self._emit(run.id, "chat.message", agent_message)
-                self.memory.append(run.id, agent.id, agent.role, f"Agent: {response_text}")
+            triage = await self.chat_router.triage(msg, readers, run.id)
+            if triage.candidates:
                 await self._emit(
                     run.id,
-                    "memory.updated",
+                    "chat.triaged",
                     {
-                        "agent_id": agent.id,
-                        "agent": agent.display_name or agent.role,
-                        "content": f"Agent: {response_text}",
+                        "seq": seq,
+                        "responders": [a.display_name or a.role for a in triage.responders],
+                        "calls_avoided": triage.avoided,
+                        "calls_avoided_total": self.chat_router.calls_avoided.get(run.id, 0),
+                        "used_model": triage.used_model,
                     },
                 )
-                processed += 1
-                if processed >= 2:
-                    break
-            self._chat_seen[agent.id] = seen
+            responder_ids = {agent.id for agent in triage.responders}
+            for agent in readers:
+                cursors[agent.id] = seq
+                if agent.id not in responder_ids:
+                    continue
+                # Persist before the paid call so a crash never replays this message.
+                await run_db(self.chat_cursors.advance, run.id, agent.id, seq)
+                started[agent.id] = seq
+                processed[agent.id] = processed.get(agent.id, 0) + 1
+                await self._respond_to_chat(run, agent, msg, setting)
+        for agent_id, cursor in cursors.items():
+            if cursor > started.get(agent_id, head):
+                await run_db(self.chat_cursors.advance, run.id, agent_id, cursor)
+
+    async def _respond_to_chat(
+        self, run: Run, agent: AgentConfig, msg: dict, setting: Optional[ProjectSetting]
+    ) -> None:
+        sender = str(msg.get("agent") or "")
+        prompt = (
+            "Incoming team message:\n"
+            f"From: {sender}\n"
+            f"Content: {msg.get('content')}\n\n"
+            "Decide if you should respond. If yes, respond with a concise update or action. "
+            "If not needed, respond with ONLY: NO_RESPONSE.\n"
+            "If you are blocked or done, ask @po or @dm what to do next. "
+            "Use role tags like @po, @dm, @tl, @dev, @qa, @rm when appropriate."
+        )
+        response = await self.agent_runtime.run_agent(run.id, agent, prompt)
+        response_text = (response.get("content") or "").strip()
+        tool_call = extract_tool_call(response_text)
+        if tool_call:
+            allow_file_edits = bool(setting and setting.auto_execute_edits) and (
+                "developer" in agent.role.lower()
+                or "engineer" in agent.role.lower()
+            )
+            response_text = await execute_tool_call(
+                tool_call,
+                broker=self.tool_broker,
+                agent=agent,
+                run_id=run.id,
+                repo_root=self.repo_root,
+                allow_self_edit=self.allow_self_edit,
+                extra_allowed_roots=None,
+                allow_file_edits=allow_file_edits,
+                event_bus=self.event_bus,
+                artifact_store=self.artifact_store,
+            )
+            response_text = normalize_tool_response(response_text)
+        if response_text.upper() == "NO_RESPONSE":
+            return
+        agent_message = {
+            "message_id": f"auto-{agent.id}-{int(datetime.utcnow().timestamp())}",
+            "agent": agent.display_name or agent.role,
+            "role": agent.role,
+            "content": response_text,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        self.artifact_store.write_chat(run.id, agent.role, agent_message)
+        await self._emit(run.id, "chat.message", agent_message)
+        await run_db(self.memory.append, run.id, agent.id, agent.role, f"Agent: {response_text}")
+        await self._emit(
+            run.id,
+            "memory.updated",
+            {
+                "agent_id": agent.id,
+                "agent": agent.display_name or agent.role,
+                "content": f"Agent: {response_text}",
+            },
+        )
 
     async def _emit(self, run_id: int, event_type: str, payload: dict) -> None:
-        event = Event(type=event_type, payload=payload)
+        event = Event(type=event_type, payload=payload, run_id=run_id)
         self.artifact_store.write_event(run_id, event.__dict__)
         await self.event_bus.publish(event)
 
 
 
+def _insert_task(task: Task) -> Task:
+    with get_session() as session:
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+    return task
+
 
 def _pick_agent(agents: list[AgentConfig], task: Task) -> Optional[AgentConfig]:
     if not agents:
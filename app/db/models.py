@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 from pydantic import ConfigDict
 
@@ -23,6 +24,7 @@ class Project(SQLModel, table=True):
 
 class ProjectSetting(SQLModel, table=True):
     model_config = ConfigDict(protected_namespaces=())
+    __table_args__ = (Index("ix_projectsetting_project_id", "project_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     project_id: int = Field(foreign_key="project.id")
     allow_all_tools: bool = False
@@ -39,6 +41,7 @@ class ProjectSetting(SQLModel, table=True):
     mcp_endpoints: Optional[str] = None
     mcp_ports: Optional[str] = None
     enabled_plugins: Optional[str] = None
+    provider_limits: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -51,6 +54,7 @@ class Team(SQLModel, table=True):
 
 
 class AgentConfig(SQLModel, table=True):
+    __table_args__ = (Index("ix_agentconfig_team_id", "team_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     team_id: int = Field(foreign_key="team.id")
     display_name: Optional[str] = None
@@ -68,6 +72,7 @@ class AgentConfig(SQLModel, table=True):
 
 
 class Run(SQLModel, table=True):
+    __table_args__ = (Index("ix_run_project_id", "project_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     project_id: int = Field(foreign_key="project.id")
     team_id: int = Field(foreign_key="team.id")
@@ -83,6 +88,10 @@ class Run(SQLModel, table=True):
 
 
 class Task(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_task_status_created_at", "status", "created_at"),
+        Index("ix_task_run_id", "run_id"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     run_id: int = Field(foreign_key="run.id")
     title: str
@@ -95,6 +104,17 @@ class Task(SQLModel, table=True):
     completed_at: Optional[datetime] = None
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     attempts: int = 0
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+
+
+class ChatCursor(SQLModel, table=True):
+    __table_args__ = (Index("ux_chatcursor_run_id_agent_id", "run_id", "agent_id", unique=True),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_id: int = Field(foreign_key="run.id")
+    agent_id: int = Field(foreign_key="agentconfig.id")
+    last_seq: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class Artifact(SQLModel, table=True):
@@ -106,6 +126,10 @@ class Artifact(SQLModel, table=True):
 
 
 class AgentMemory(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_agentmemory_run_id_agent_id_created_at", "run_id", "agent_id", "created_at"),
+        Index("ix_agentmemory_agent_id_created_at", "agent_id", "created_at"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     run_id: int = Field(foreign_key="run.id")
     agent_id: int = Field(foreign_key="agentconfig.id")
@@ -166,6 +190,7 @@ class Job(SQLModel, table=True):
 
 
 class JobStep(SQLModel, table=True):
+    __table_args__ = (Index("ix_jobstep_job_id", "job_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     job_id: int = Field(foreign_key="job.id")
     name: str
@@ -177,6 +202,7 @@ class JobStep(SQLModel, table=True):
 
 
 class JobEvent(SQLModel, table=True):
+    __table_args__ = (Index("ix_jobevent_job_id", "job_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     job_id: int = Field(foreign_key="job.id")
     step_id: Optional[int] = Field(default=None, foreign_key="jobstep.id")
@@ -186,6 +212,7 @@ class JobEvent(SQLModel, table=True):
 
 
 class AuditLog(SQLModel, table=True):
+    __table_args__ = (Index("ix_auditlog_run_id", "run_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     run_id: Optional[int] = Field(default=None, foreign_key="run.id")
     job_id: Optional[int] = Field(default=None, foreign_key="job.id")
@@ -200,6 +227,7 @@ class AuditLog(SQLModel, table=True):
 
 
 class Approval(SQLModel, table=True):
+    __table_args__ = (Index("ix_approval_run_id", "run_id"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     run_id: Optional[int] = Field(default=None, foreign_key="run.id")
     job_id: Optional[int] = Field(default=None, foreign_key="job.id")
@@ -208,4 +236,13 @@ class Approval(SQLModel, table=True):
     risk_level: Optional[str] = None
     status: str = "pending"
     reason: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class MetricCounter(SQLModel, table=True):
+    __table_args__ = (Index("ix_metriccounter_scope", "project_id", "run_id", "name", unique=True),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    project_id: int
+    run_id: int = 0
+    name: str
+    value: int = 0
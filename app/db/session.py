@@ -1,17 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
 from sqlmodel import Session, SQLModel, create_engine
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.dialects import sqlite
 
 
 _engine = None
-SCHEMA_VERSION = 1
+_engines: dict = {}
+_engines_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = 4
+SCHEMA_VERSION = 2
+
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": "5000",
+    "synchronous": "NORMAL",
+    "cache_size": "-20000",
+    "mmap_size": "268435456",
+    "temp_store": "MEMORY",
+}
+_sqlite_pragmas = dict(DEFAULT_SQLITE_PRAGMAS)
+
+# Run before a unique index is added to an existing table, so duplicate rows cannot block it.
+_UNIQUE_INDEX_PREP = {
+    "ux_chatcursor_run_id_agent_id": (
+        "UPDATE chatcursor SET last_seq = (SELECT MAX(other.last_seq) FROM chatcursor other "
+        "WHERE other.run_id = chatcursor.run_id AND other.agent_id = chatcursor.agent_id)",
+        "DELETE FROM chatcursor WHERE id NOT IN (SELECT MIN(id) FROM chatcursor GROUP BY run_id, agent_id)",
+        "DROP INDEX IF EXISTS ix_chatcursor_run_id_agent_id",
+    ),
+}
+
+
+def configure_sqlite(pragmas: dict[str, str]) -> None:
+    global _sqlite_pragmas
+    _sqlite_pragmas = dict(pragmas)
+
+
+T = TypeVar("T")
+
+
+def configure_db_executor(workers: int) -> None:
+    global _executor, _executor_workers
+    with _engines_lock:
+        previous, _executor = _executor, None
+        _executor_workers = max(1, workers)
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Sessions are opened and closed inside fn, on a DB thread, so a slow commit never stalls the event loop.
+    global _executor
+    executor = _executor
+    if executor is None:
+        with _engines_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(_executor_workers, thread_name_prefix="db")
+            executor = _executor
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args, **kwargs))
 
 
 def init_db(db_url: str) -> None:
     global _engine
-    _engine = create_engine(db_url, echo=False)
-    SQLModel.metadata.create_all(_engine)
-    _ensure_schema(_engine)
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine = _create_engine(db_url)
+            SQLModel.metadata.create_all(engine)
+            _ensure_schema(engine)
+            _engines[db_url] = engine
+        _engine = engine
+
+
+def _create_engine(db_url: str):
+    engine = create_engine(db_url, echo=False)
+    if engine.dialect.name != "sqlite" or not _sqlite_pragmas:
+        return engine
+    pragmas = dict(_sqlite_pragmas)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return engine
 
 
 def _ensure_schema(engine) -> None:
@@ -47,6 +129,15 @@ def _ensure_schema(engine) -> None:
                     )
                 )
                 applied_changes = True
+            existing_indexes = {
+                row[1] for row in conn.execute(text(f"PRAGMA index_list({table_name})"))
+            }
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    for statement in _UNIQUE_INDEX_PREP.get(index.name, ()):
+                        conn.execute(text(statement))
+                    index.create(conn)
+                    applied_changes = True
         if applied_changes and current_version < SCHEMA_VERSION:
             _set_schema_version(conn, SCHEMA_VERSION)
         conn.commit()
@@ -100,6 +191,12 @@ def _column_default_for_type(column) -> str | None:
     return "''"
 
 
+def get_engine():
+    if _engine is None:
+        raise RuntimeError("Database not initialized. Call init_db first.")
+    return _engine
+
+
 def get_session() -> Session:
     if _engine is None:
         raise RuntimeError("Database not initialized. Call init_db first.")
@@ -1,4 +1,5 @@
 from pathlib import Path
+import asyncio
 import os
 
 from fastapi import FastAPI
@@ -11,29 +12,45 @@ from app.api.routes import agents, approvals, avatars, budgets, chat, events, fi
 from app.api.ws import router as ws_router
 from app.config import load_settings
 from app.core.approvals import ApprovalStore
+from app.core.artifact_writer import configure_writer, get_writer
 from app.core.audit import AuditLogger
-from app.core.events import EventBus
+from app.core.chat_router import ChatRouter
+from app.core.config_cache import get_config_cache
+from app.core.events import Event, EventBus
 from app.core.job_engine import JobEngine
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.metric_rollups import enable_rollups
 from app.core.policy import PolicyEngine
 from app.core.secrets import SecretsBroker
+from app.core.task_dispatcher import TaskDispatcher
+from app.core.task_executor import TaskExecutor
+from app.core.task_leases import TaskLeaseManager
 from app.core.tool_broker import ToolBroker
 from app.core.verification import NoopVerifier
 from app.core.project_registry import ProjectRegistry, project_data_dir, project_db_url
-from app.db.models import AgentConfig, Project, Team
-from app.db.session import get_session, init_db
+from app.db.models import AgentConfig, Project, Run, Team
+from app.db.session import configure_db_executor, configure_sqlite, get_session, init_db
 from sqlmodel import select
 from app.core.orchestrator import Orchestrator
 from app.core.manager_loop import ManagerLoop
 from app.core.worker_loop import WorkerLoop
 from app.core.artifacts import ArtifactStore
 from app.agents.runtime import AgentRuntime
+from app.providers.http_pool import ProviderHTTP
+from app.providers.response_cache import ResponseCache
+from app.providers.scheduler import ProviderScheduler
 from app.providers.model_registry import ModelRegistry
 from app.integrations.mcp_client import MCPRegistry
+from app.repo.file_watcher import configure_watchers
 
 
 def create_app() -> FastAPI:
     settings = load_settings()
     settings.data_dir.mkdir(parents=True, exist_ok=True)
+    configure_sqlite(settings.sqlite_pragmas)
+    configure_db_executor(settings.db_threads)
+    if settings.metric_rollups:
+        enable_rollups()
 
     registry = ProjectRegistry(settings.data_dir)
     if settings.allow_self_project and os.getenv("AI_DEVTEAM_SELF_ACTIVE", "").lower() == "true":
@@ -70,10 +87,19 @@ def create_app() -> FastAPI:
 
     app = FastAPI(title="Overmind Orchestrator")
     app.state.settings = settings
-    app.state.event_bus = EventBus()
+    app.state.event_bus = EventBus(
+        settings.event_queue_size,
+        settings.event_overflow_policy,
+        _run_project_id,
+        lambda run_id: ArtifactStore(app.state.data_dir).next_event_seq(run_id),
+        settings.event_replay_size,
+    )
+    configure_watchers(settings.watch_debounce_ms / 1000, settings.watch_max_events_per_second)
+    app.state.loop_monitor = LoopLagMonitor()
+    app.state.config_cache = get_config_cache()
     app.state.mcp_registry = MCPRegistry(settings.mcp_endpoints, settings.mcp_discovery_ports)
     app.state.policy_engine = PolicyEngine()
-    app.state.audit_logger = AuditLogger()
+    app.state.audit_logger = AuditLogger(settings.audit_flush_ms / 1000, settings.audit_max_batch)
     app.state.approval_store = ApprovalStore()
     app.state.tool_broker = ToolBroker(
         app.state.policy_engine,
@@ -82,24 +108,52 @@ def create_app() -> FastAPI:
         app.state.event_bus,
         lambda run_id, event: ArtifactStore(app.state.data_dir).write_event(run_id, event),
     )
-    app.state.job_engine = JobEngine(app.state.event_bus)
+    app.state.job_engine = JobEngine(app.state.event_bus, settings.job_batch_size)
+    app.state.task_dispatcher = TaskDispatcher(settings.task_sweep_seconds)
+    app.state.task_executor = TaskExecutor(
+        settings.max_concurrent_tasks,
+        settings.agent_concurrency,
+        settings.provider_concurrency,
+        on_release=app.state.task_dispatcher.notify,
+    )
+    app.state.task_leases = TaskLeaseManager(settings.task_lease_seconds)
     app.state.verifier = NoopVerifier()
     app.state.secrets_broker = SecretsBroker(settings.encryption_key)
     app.state.project_registry = registry
     app.state.active_project_id = 0 if active_id == 0 and settings.allow_self_project else active.id
     app.state.active_project_root = active_root
     app.state.data_dir = data_dir
+    app.state.model_registry = ModelRegistry(
+        app.state.secrets_broker,
+        ProviderHTTP(
+            settings.http_max_connections,
+            settings.http_keepalive,
+            http2=settings.http2,
+            timeouts=settings.provider_timeouts,
+        ),
+        ProviderScheduler(settings.provider_limits, settings.provider_retries),
+        ResponseCache(
+            settings.data_dir / "response_cache.db",
+            settings.response_cache_sites,
+            settings.response_cache_size,
+            settings.response_cache_ttl,
+        ),
+    )
     app.state.orchestrator = Orchestrator(
         app.state.event_bus,
-        ArtifactStore(app.state.data_dir),
+        ArtifactStore(app.state.data_dir, settings.snapshot_max_bytes, settings.compress_snapshots),
         AgentRuntime(
-            ModelRegistry(app.state.secrets_broker),
+            app.state.model_registry,
             app.state.mcp_registry,
             app.state.secrets_broker,
+            settings.stream_responses,
+            settings.stream_flush_ms / 1000,
+            settings.stream_flush_bytes,
         ),
         app.state.active_project_root,
         app.state.job_engine,
         app.state.verifier,
+        app.state.task_dispatcher,
     )
     app.state.orchestrator.agent_runtime.event_bus = app.state.event_bus
     app.state.orchestrator.agent_runtime.event_writer = (
@@ -113,6 +167,9 @@ def create_app() -> FastAPI:
         ArtifactStore(app.state.data_dir),
         app.state.active_project_root,
         app.state.settings.allow_self_edit,
+        app.state.task_dispatcher,
+        app.state.task_executor,
+        app.state.task_leases,
     )
     app.state.worker_loop = WorkerLoop(
         app.state.event_bus,
@@ -122,6 +179,14 @@ def create_app() -> FastAPI:
         ArtifactStore(app.state.data_dir),
         app.state.active_project_root,
         app.state.settings.allow_self_edit,
+        app.state.task_dispatcher,
+        app.state.task_executor,
+        app.state.task_leases,
+        ChatRouter(
+            app.state.orchestrator.agent_runtime.registry,
+            app.state.settings.triage_model,
+            app.state.secrets_broker,
+        ),
     )
 
     app.add_middleware(
@@ -173,12 +238,44 @@ def create_app() -> FastAPI:
 
     @app.on_event("startup")
     async def _start_manager_loop() -> None:
+        if settings.artifact_flush_ms >= 0:
+            configure_writer(settings.artifact_flush_ms / 1000, settings.artifact_fsync_seconds)
+        if settings.audit_flush_ms >= 0:
+            app.state.audit_logger.start()
+        app.state.loop_monitor.start()
+        loop = asyncio.get_running_loop()
+
+        def _config_changed(project_ids: set[int], team_ids: set[int]) -> None:
+            event = Event(
+                type="config.changed",
+                payload={"project_ids": sorted(project_ids), "team_ids": sorted(team_ids)},
+            )
+            # Commits land on request and DB threads; the bus lives on the event loop.
+            loop.call_soon_threadsafe(lambda: loop.create_task(app.state.event_bus.publish(event)))
+
+        app.state.config_listener = _config_changed
+        app.state.config_cache.listeners.append(_config_changed)
         app.state.manager_loop.start()
         app.state.worker_loop.start()
 
+    @app.on_event("shutdown")
+    async def _drain_artifacts() -> None:
+        listener = getattr(app.state, "config_listener", None)
+        if listener in app.state.config_cache.listeners:
+            app.state.config_cache.listeners.remove(listener)
+        app.state.audit_logger.close()
+        await app.state.model_registry.aclose()
+        get_writer().close()
+
     return app
 
 
+def _run_project_id(run_id: int) -> int | None:
+    with get_session() as session:
+        run = session.get(Run, run_id)
+        return run.project_id if run else None
+
+
 def _ensure_manager_identity(session, project_id: int) -> None:
     teams = list(session.exec(select(Team).where(Team.project_id == project_id)))
     for team in teams:
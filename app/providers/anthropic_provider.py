@@ -1,7 +1,6 @@
+import json
 import os
-from typing import Any, Dict, List
-
-import httpx
+from typing import Any, AsyncIterator, Dict, List
 
 from app.providers.base import ModelInfo, ProviderBase, ProviderError
 
@@ -34,11 +33,45 @@ class AnthropicProvider(ProviderBase):
             "anthropic-version": "2023-06-01",
         }
         body = {"model": model, "max_tokens": 512, "messages": [{"role": "user", "content": prompt}]}
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post("https://api.anthropic.com/v1/messages", headers=headers, json=body)
-            if response.status_code != 200:
-                raise ProviderError(f"Anthropic invoke failed: {response.text}")
-            data = response.json()
+        response = await self._request(
+            "invoke", "POST", "https://api.anthropic.com/v1/messages", headers=headers, json=body
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"Anthropic invoke failed: {response.text}")
+        data = response.json()
         content_blocks = data.get("content", [])
         content = content_blocks[0].get("text", "") if content_blocks else ""
         return {"content": content}
+
+    async def invoke_model_stream(
+        self, model: str, payload: Dict[str, Any], api_key: str | None = None
+    ) -> AsyncIterator[str]:
+        key = api_key or self.api_key
+        if not key:
+            raise ProviderError("ANTHROPIC_API_KEY not set")
+        headers = {
+            "x-api-key": key,
+            "anthropic-version": "2023-06-01",
+        }
+        body = {
+            "model": model,
+            "max_tokens": 512,
+            "messages": [{"role": "user", "content": payload.get("prompt", "")}],
+            "stream": True,
+        }
+        async for event, data in self._stream(
+            "invoke", "POST", "https://api.anthropic.com/v1/messages", headers=headers, json=body
+        ):
+            if event == "message_stop":
+                return
+            if event not in {"content_block_delta", "error"}:
+                continue
+            try:
+                item = json.loads(data)
+            except ValueError:
+                continue
+            if event == "error":
+                raise ProviderError(f"Anthropic stream failed: {data}")
+            delta = item.get("delta") or {}
+            if delta.get("type") == "text_delta" and delta.get("text"):
+                yield delta["text"]
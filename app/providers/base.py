@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+
+if TYPE_CHECKING:
+    from app.providers.http_pool import ProviderHTTP
 
 
 class ProviderError(Exception):
-    pass
+    def __init__(
+        self, message: str = "", status_code: int | None = None, retry_after: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 @dataclass
@@ -20,6 +30,7 @@ class ModelInfo:
 
 class ProviderBase:
     name: str = ""
+    http: "ProviderHTTP | None" = None
 
     def validate_key(self) -> bool:
         raise NotImplementedError
@@ -34,3 +45,24 @@ class ProviderBase:
         self, model: str, payload: Dict[str, Any], api_key: str | None = None
     ) -> Dict[str, Any]:
         raise NotImplementedError
+
+    async def invoke_model_stream(
+        self, model: str, payload: Dict[str, Any], api_key: str | None = None
+    ) -> AsyncIterator[str]:
+        response = await self.invoke_model(model, payload, api_key=api_key)
+        yield response.get("content", "")
+
+    async def _request(self, operation: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if self.http is None:
+            from app.providers.http_pool import ProviderHTTP
+
+            self.http = ProviderHTTP()
+        return await self.http.request(self.name, operation, method, url, **kwargs)
+
+    async def _stream(self, operation: str, method: str, url: str, **kwargs: Any) -> AsyncIterator[Tuple[str, str]]:
+        if self.http is None:
+            from app.providers.http_pool import ProviderHTTP
+
+            self.http = ProviderHTTP()
+        async for item in self.http.stream(self.name, operation, method, url, **kwargs):
+            yield item
@@ -1,7 +1,6 @@
+import json
 import os
-from typing import Any, Dict, List
-
-import httpx
+from typing import Any, AsyncIterator, Dict, List
 
 from app.providers.base import ModelInfo, ProviderBase, ProviderError
 
@@ -19,14 +18,15 @@ class GeminiProvider(ProviderBase):
         key = api_key or self.api_key
         if not key:
             return []
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                "https://generativelanguage.googleapis.com/v1beta/models",
-                params={"key": key},
-            )
-            if response.status_code != 200:
-                raise ProviderError(f"Gemini list_models failed: {response.text}")
-            data = response.json().get("models", [])
+        response = await self._request(
+            "list",
+            "GET",
+            "https://generativelanguage.googleapis.com/v1beta/models",
+            params={"key": key},
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"Gemini list_models failed: {response.text}")
+        data = response.json().get("models", [])
         return [ModelInfo(id=item["name"], provider=self.name) for item in data]
 
     async def invoke_model(
@@ -37,15 +37,16 @@ class GeminiProvider(ProviderBase):
             raise ProviderError("GEMINI_API_KEY not set")
         prompt = payload.get("prompt", "")
         body = {"contents": [{"parts": [{"text": prompt}]}]}
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                f"https://generativelanguage.googleapis.com/v1beta/{model}:generateContent",
-                params={"key": key},
-                json=body,
-            )
-            if response.status_code != 200:
-                raise ProviderError(f"Gemini invoke failed: {response.text}")
-            data = response.json()
+        response = await self._request(
+            "invoke",
+            "POST",
+            f"https://generativelanguage.googleapis.com/v1beta/{model}:generateContent",
+            params={"key": key},
+            json=body,
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"Gemini invoke failed: {response.text}")
+        data = response.json()
         candidates = data.get("candidates", [])
         content = ""
         if candidates:
@@ -53,3 +54,27 @@ class GeminiProvider(ProviderBase):
             if parts:
                 content = parts[0].get("text", "")
         return {"content": content}
+
+    async def invoke_model_stream(
+        self, model: str, payload: Dict[str, Any], api_key: str | None = None
+    ) -> AsyncIterator[str]:
+        key = api_key or self.api_key
+        if not key:
+            raise ProviderError("GEMINI_API_KEY not set")
+        body = {"contents": [{"parts": [{"text": payload.get("prompt", "")}]}]}
+        async for _, data in self._stream(
+            "invoke",
+            "POST",
+            f"https://generativelanguage.googleapis.com/v1beta/{model}:streamGenerateContent",
+            params={"key": key, "alt": "sse"},
+            json=body,
+        ):
+            try:
+                candidates = json.loads(data).get("candidates") or []
+            except ValueError:
+                continue
+            if not candidates:
+                continue
+            for part in candidates[0].get("content", {}).get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
@@ -1,9 +1,8 @@
 import os
-from typing import Any, Dict, List
-
-import httpx
+from typing import Any, AsyncIterator, Dict, List
 
 from app.providers.base import ModelInfo, ProviderBase, ProviderError
+from app.providers.openai_provider import chat_completion_deltas
 
 
 class GroqProvider(ProviderBase):
@@ -20,11 +19,10 @@ class GroqProvider(ProviderBase):
         if not key:
             return []
         headers = {"Authorization": f"Bearer {key}"}
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get("https://api.groq.com/openai/v1/models", headers=headers)
-            if response.status_code != 200:
-                raise ProviderError(f"Groq list_models failed: {response.text}")
-            data = response.json().get("data", [])
+        response = await self._request("list", "GET", "https://api.groq.com/openai/v1/models", headers=headers)
+        if response.status_code != 200:
+            raise ProviderError(f"Groq list_models failed: {response.text}")
+        data = response.json().get("data", [])
         return [ModelInfo(id=item["id"], provider=self.name) for item in data]
 
     async def invoke_model(
@@ -36,14 +34,37 @@ class GroqProvider(ProviderBase):
         prompt = payload.get("prompt", "")
         headers = {"Authorization": f"Bearer {key}"}
         body = {"model": model, "messages": [{"role": "user", "content": prompt}]}
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
+        response = await self._request(
+            "invoke",
+            "POST",
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers=headers,
+            json=body,
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"Groq invoke failed: {response.text}")
+        data = response.json()
+        content = data["choices"][0]["message"]["content"]
+        return {"content": content}
+
+    async def invoke_model_stream(
+        self, model: str, payload: Dict[str, Any], api_key: str | None = None
+    ) -> AsyncIterator[str]:
+        key = api_key or self.api_key
+        if not key:
+            raise ProviderError("GROQ_API_KEY not set")
+        body = {
+            "model": model,
+            "messages": [{"role": "user", "content": payload.get("prompt", "")}],
+            "stream": True,
+        }
+        async for chunk in chat_completion_deltas(
+            self._stream(
+                "invoke",
+                "POST",
                 "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
+                headers={"Authorization": f"Bearer {key}"},
                 json=body,
             )
-            if response.status_code != 200:
-                raise ProviderError(f"Groq invoke failed: {response.text}")
-            data = response.json()
-        content = data["choices"][0]["message"]["content"]
-        return {"content": content}
+        ):
+            yield chunk
@@ -0,0 +1,201 @@
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from app.providers.base import ProviderError
+
+TIMEOUT_FIELDS = ("connect", "read", "total")
+# Overload answers the scheduler retries; they are raised here so no provider treats them as a fallback cue.
+RETRY_STATUSES = {429, 503, 529}
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    connect: float
+    read: float
+    total: float
+
+
+DEFAULT_TIMEOUTS = {
+    "list": Timeouts(connect=10.0, read=30.0, total=30.0),
+    "invoke": Timeouts(connect=10.0, read=60.0, total=120.0),
+}
+
+
+def parse_timeouts(raw: str) -> Dict[str, float]:
+    overrides: Dict[str, float] = {}
+    for item in raw.split(","):
+        key, _, value = item.partition("=")
+        key = key.strip().lower()
+        if not key or key.split(".")[-1] not in TIMEOUT_FIELDS:
+            continue
+        try:
+            overrides[key] = float(value)
+        except ValueError:
+            continue
+    return overrides
+
+
+class ProviderHTTP:
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeouts: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max(1, max_connections),
+            max_keepalive_connections=max(0, min(max_keepalive, max_connections)),
+            keepalive_expiry=keepalive_expiry,
+        )
+        # HTTP/2 needs the optional `h2` package; without it we stay on keep-alive HTTP/1.1.
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.overrides = dict(timeouts or {})
+        self.requests: Dict[str, int] = {}
+        self.timeouts_hit: Dict[str, int] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits, http2=self.http2)
+            self._clients[provider] = client
+        return client
+
+    def timeouts(self, provider: str, operation: str) -> Timeouts:
+        base = DEFAULT_TIMEOUTS.get(operation, DEFAULT_TIMEOUTS["invoke"])
+        values = {name: getattr(base, name) for name in TIMEOUT_FIELDS}
+        # Most specific wins: field < operation.field < provider.field < provider.operation.field.
+        for prefix in ("", f"{operation}.", f"{provider}.", f"{provider}.{operation}."):
+            for name in TIMEOUT_FIELDS:
+                if prefix + name in self.overrides:
+                    values[name] = self.overrides[prefix + name]
+        return Timeouts(**values)
+
+    async def request(
+        self, provider: str, operation: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        limits = self.timeouts(provider, operation)
+        timeout = httpx.Timeout(limits.read, connect=limits.connect)
+        self.requests[provider] = self.requests.get(provider, 0) + 1
+        try:
+            response = await asyncio.wait_for(
+                self.client(provider).request(method, url, timeout=timeout, **kwargs),
+                timeout=limits.total if limits.total > 0 else None,
+            )
+        except (asyncio.TimeoutError, httpx.TimeoutException) as exc:
+            self.timeouts_hit[provider] = self.timeouts_hit.get(provider, 0) + 1
+            raise ProviderError(f"{provider} {operation} timed out") from exc
+        if response.status_code in RETRY_STATUSES:
+            raise _overloaded(provider, operation, response)
+        return response
+
+    async def stream(
+        self, provider: str, operation: str, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[Tuple[str, str]]:
+        limits = self.timeouts(provider, operation)
+        timeout = httpx.Timeout(limits.read, connect=limits.connect)
+        # The read timeout bounds each gap between chunks; the total bounds the whole stream.
+        deadline = time.monotonic() + limits.total if limits.total > 0 else None
+        self.requests[provider] = self.requests.get(provider, 0) + 1
+        try:
+            async with self.client(provider).stream(method, url, timeout=timeout, **kwargs) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    if response.status_code in RETRY_STATUSES:
+                        raise _overloaded(provider, operation, response)
+                    raise ProviderError(
+                        f"{provider} stream failed: {response.text}", status_code=response.status_code
+                    )
+                lines = []
+                async for line in response.aiter_lines():
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise asyncio.TimeoutError()
+                    lines.append(line)
+                    if line:
+                        continue
+                    for item in parse_sse(lines):
+                        yield item
+                    lines = []
+                for item in parse_sse(lines):
+                    yield item
+        except (asyncio.TimeoutError, httpx.TimeoutException) as exc:
+            self.timeouts_hit[provider] = self.timeouts_hit.get(provider, 0) + 1
+            raise ProviderError(f"{provider} {operation} timed out") from exc
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive": self.limits.max_keepalive_connections,
+            "providers": {
+                provider: {
+                    "open": not client.is_closed,
+                    "requests": self.requests.get(provider, 0),
+                    "timeouts": self.timeouts_hit.get(provider, 0),
+                }
+                for provider, client in self._clients.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _overloaded(provider: str, operation: str, response: httpx.Response) -> ProviderError:
+    return ProviderError(
+        f"{provider} {operation} rejected ({response.status_code}): {response.text}",
+        status_code=response.status_code,
+        retry_after=retry_after_seconds(response.headers.get("retry-after")),
+    )
+
+
+def parse_sse(lines: Iterable[str]) -> list[Tuple[str, str]]:
+    events: list[Tuple[str, str]] = []
+    event, data = "", []
+    for line in [*lines, ""]:
+        if not line:
+            if data:
+                events.append((event or "message", "\n".join(data)))
+            event, data = "", []
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "event":
+            event = value
+        elif name == "data":
+            data.append(value)
+    return events
@@ -1,10 +1,16 @@
 import asyncio
 import inspect
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
 
 from app.providers.base import ModelInfo, ProviderBase, ProviderError
 from app.providers.model_filters import filter_chat_models
 from app.core.secrets import SecretsBroker
+from app.db.session import run_db
+from app.providers.http_pool import ProviderHTTP
+from app.providers.response_cache import CacheEntry, CachedText, ResponseCache, cache_key
+from app.providers.scheduler import BACKGROUND, COMPLETION_ESTIMATE, Limits, ProviderScheduler, estimate_tokens
 from app.providers.openai_provider import OpenAIProvider
 from app.providers.anthropic_provider import AnthropicProvider
 from app.providers.groq_provider import GroqProvider
@@ -12,14 +18,26 @@ from app.providers.gemini_provider import GeminiProvider
 
 
 class ModelRegistry:
-    def __init__(self, secrets_broker: SecretsBroker | None = None) -> None:
+    def __init__(
+        self,
+        secrets_broker: SecretsBroker | None = None,
+        http: ProviderHTTP | None = None,
+        scheduler: ProviderScheduler | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
+        self.http = http or ProviderHTTP()
+        self.scheduler = scheduler or ProviderScheduler()
+        self.response_cache = response_cache
         self._providers: Dict[str, ProviderBase] = {
             "openai": OpenAIProvider(),
             "anthropic": AnthropicProvider(),
             "groq": GroqProvider(),
             "gemini": GeminiProvider(),
         }
+        for provider in self._providers.values():
+            provider.http = self.http
         self._cache: Dict[str, List[ModelInfo]] = {}
+        self._ttft: Dict[str, Deque[float]] = {}
         self._lock = asyncio.Lock()
         self._secrets_broker = secrets_broker
 
@@ -69,14 +87,132 @@ class ModelRegistry:
             all_models.extend(self._cache.get(name, []))
         return all_models
 
-    async def invoke(self, provider: str, model: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def invoke(
+        self,
+        provider: str,
+        model: str,
+        payload: Dict[str, Any],
+        priority: int = BACKGROUND,
+        limits: Optional[Limits] = None,
+        cache: Optional[str] = None,
+    ) -> Dict[str, Any]:
         if provider not in self._providers:
             raise ProviderError(f"Unknown provider: {provider}")
+        async with self._cached(provider, model, payload, cache) as entry:
+            if entry.content is not None:
+                return {"content": entry.content, "cached": True}
+            api_key = self._api_key(provider, payload)
+            prompt_tokens = estimate_tokens(payload.get("prompt", ""))
+            attempt = 0
+            while True:
+                async with self.scheduler.slot(
+                    provider, model, prompt_tokens + COMPLETION_ESTIMATE, priority, limits
+                ) as grant:
+                    try:
+                        response = await self._providers[provider].invoke_model(model, payload, api_key=api_key)
+                        grant.settle(prompt_tokens + estimate_tokens(response.get("content", "")))
+                        entry.store(response.get("content", ""))
+                        return response
+                    except ProviderError as exc:
+                        delay = self.scheduler.retry_delay(provider, exc, attempt)
+                        if delay is None:
+                            raise
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def invoke_stream(
+        self,
+        provider: str,
+        model: str,
+        payload: Dict[str, Any],
+        priority: int = BACKGROUND,
+        limits: Optional[Limits] = None,
+        cache: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        if provider not in self._providers:
+            raise ProviderError(f"Unknown provider: {provider}")
+        async with self._cached(provider, model, payload, cache) as entry:
+            if entry.content is not None:
+                yield CachedText(entry.content)
+                return
+            api_key = self._api_key(provider, payload)
+            prompt_tokens = estimate_tokens(payload.get("prompt", ""))
+            attempt = 0
+            while True:
+                parts: List[str] = []
+                async with self.scheduler.slot(
+                    provider, model, prompt_tokens + COMPLETION_ESTIMATE, priority, limits
+                ) as grant:
+                    try:
+                        async for chunk in self._providers[provider].invoke_model_stream(
+                            model, payload, api_key=api_key
+                        ):
+                            parts.append(chunk)
+                            yield chunk
+                        content = "".join(parts)
+                        grant.settle(prompt_tokens + max(1, len(content) // 4))
+                        entry.store(content)
+                        return
+                    except ProviderError as exc:
+                        # Text already shown to the user cannot be replayed, so only a stream that never started retries.
+                        delay = None if parts else self.scheduler.retry_delay(provider, exc, attempt)
+                        if delay is None:
+                            raise
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _cached(
+        self, provider: str, model: str, payload: Dict[str, Any], site: Optional[str]
+    ) -> AsyncIterator[CacheEntry]:
+        if not self.response_cache or not self.response_cache.enabled(site):
+            yield CacheEntry()
+            return
+        entry = CacheEntry(site, cache_key(provider, model, payload))
+        try:
+            entry.content = await run_db(self.response_cache.get, site, entry.key)
+        except Exception:
+            # The cache is an optimisation; a broken one behaves like a miss.
+            entry.content = None
+        if entry.content is not None:
+            payload.pop("provider_token", None)
+        yield entry
+        if entry.fresh:
+            try:
+                await run_db(self.response_cache.put, site, entry.key, provider, model, entry.fresh)
+            except Exception:
+                pass
+
+    def _api_key(self, provider: str, payload: Dict[str, Any]) -> Optional[str]:
+        if not self._secrets_broker:
+            payload.pop("provider_token", None)
+            return None
         provider_token = payload.pop("provider_token", None)
-        api_key = None
-        if provider_token and self._secrets_broker:
-            api_key = self._secrets_broker.resolve_token(provider_token)
-        return await self._providers[provider].invoke_model(model, payload, api_key=api_key)
+        if not provider_token:
+            # Issued only once a call really goes out, so cache hits never mint a credential.
+            token = self._secrets_broker.issue_provider_token(provider)
+            provider_token = token.token if token else None
+        return self._secrets_broker.resolve_token(provider_token) if provider_token else None
+
+    def record_ttft(self, provider: str, seconds: float) -> None:
+        self._ttft.setdefault(provider, deque(maxlen=200)).append(seconds)
+
+    def stream_stats(self) -> Dict[str, dict]:
+        stats: Dict[str, dict] = {}
+        for provider, samples in self._ttft.items():
+            ordered = sorted(samples)
+            stats[provider] = {
+                "samples": len(ordered),
+                "ttft_p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "ttft_p99_ms": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000, 1),
+                "ttft_last_ms": round(samples[-1] * 1000, 1),
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+        if self.response_cache:
+            self.response_cache.close()
 
     async def suggest_manager_model(self, provider: str) -> str | None:
         models = await self.list_models(provider, enabled=[provider])
@@ -1,7 +1,6 @@
+import json
 import os
-from typing import Any, Dict, List
-
-import httpx
+from typing import Any, AsyncIterator, Dict, List
 
 from app.providers.base import ModelInfo, ProviderBase, ProviderError
 from app.providers.model_filters import is_chat_model
@@ -21,11 +20,10 @@ class OpenAIProvider(ProviderBase):
         if not key:
             return []
         headers = {"Authorization": f"Bearer {key}"}
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get("https://api.openai.com/v1/models", headers=headers)
-            if response.status_code != 200:
-                raise ProviderError(f"OpenAI list_models failed: {response.text}")
-            data = response.json().get("data", [])
+        response = await self._request("list", "GET", "https://api.openai.com/v1/models", headers=headers)
+        if response.status_code != 200:
+            raise ProviderError(f"OpenAI list_models failed: {response.text}")
+        data = response.json().get("data", [])
         return [ModelInfo(id=item["id"], provider=self.name) for item in data]
 
     async def invoke_model(
@@ -38,68 +36,125 @@ class OpenAIProvider(ProviderBase):
         headers = {"Authorization": f"Bearer {key}"}
         chat_body = {"model": model, "messages": [{"role": "user", "content": prompt}]}
         completion_body = {"model": model, "prompt": prompt}
-        async with httpx.AsyncClient(timeout=60) as client:
-            use_chat = is_chat_model(self.name, model)
-            if use_chat:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=chat_body,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["choices"][0]["message"]["content"]
-                    return {"content": content}
-                error_text = response.text
-                # Some OpenAI models are only supported on the Responses API.
-                if "v1/responses" in error_text:
-                    response = await client.post(
-                        "https://api.openai.com/v1/responses",
-                        headers=headers,
-                        json={"model": model, "input": prompt},
-                    )
-                    if response.status_code != 200:
-                        raise ProviderError(f"OpenAI invoke failed: {response.text}")
-                    data = response.json()
-                    content = _extract_response_text(data)
-                    return {"content": content}
-                # Some older models only support completions.
-                if "not supported by the chat endpoint" in error_text.lower():
-                    response = await client.post(
-                        "https://api.openai.com/v1/completions",
-                        headers=headers,
-                        json=completion_body,
-                    )
-                    if response.status_code != 200:
-                        raise ProviderError(f"OpenAI invoke failed: {response.text}")
-                    data = response.json()
-                    text = data["choices"][0].get("text", "")
-                    return {"content": text}
-                raise ProviderError(f"OpenAI invoke failed: {error_text}")
-
-            response = await client.post(
-                "https://api.openai.com/v1/completions",
+        use_chat = is_chat_model(self.name, model)
+        if use_chat:
+            response = await self._request(
+                "invoke",
+                "POST",
+                "https://api.openai.com/v1/chat/completions",
                 headers=headers,
-                json=completion_body,
+                json=chat_body,
             )
             if response.status_code == 200:
                 data = response.json()
+                content = data["choices"][0]["message"]["content"]
+                return {"content": content}
+            error_text = response.text
+            # Some OpenAI models are only supported on the Responses API.
+            if "v1/responses" in error_text:
+                response = await self._request(
+                    "invoke",
+                    "POST",
+                    "https://api.openai.com/v1/responses",
+                    headers=headers,
+                    json={"model": model, "input": prompt},
+                )
+                if response.status_code != 200:
+                    raise ProviderError(f"OpenAI invoke failed: {response.text}")
+                data = response.json()
+                content = _extract_response_text(data)
+                return {"content": content}
+            # Some older models only support completions.
+            if "not supported by the chat endpoint" in error_text.lower():
+                response = await self._request(
+                    "invoke",
+                    "POST",
+                    "https://api.openai.com/v1/completions",
+                    headers=headers,
+                    json=completion_body,
+                )
+                if response.status_code != 200:
+                    raise ProviderError(f"OpenAI invoke failed: {response.text}")
+                data = response.json()
                 text = data["choices"][0].get("text", "")
                 return {"content": text}
-            error_text = response.text
-            if "v1/responses" not in error_text:
-                raise ProviderError(f"OpenAI invoke failed: {error_text}")
-            response = await client.post(
-                "https://api.openai.com/v1/responses",
-                headers=headers,
-                json={"model": model, "input": prompt},
-            )
-            if response.status_code != 200:
-                raise ProviderError(f"OpenAI invoke failed: {response.text}")
+            raise ProviderError(f"OpenAI invoke failed: {error_text}")
+
+        response = await self._request(
+            "invoke",
+            "POST",
+            "https://api.openai.com/v1/completions",
+            headers=headers,
+            json=completion_body,
+        )
+        if response.status_code == 200:
             data = response.json()
+            text = data["choices"][0].get("text", "")
+            return {"content": text}
+        error_text = response.text
+        if "v1/responses" not in error_text:
+            raise ProviderError(f"OpenAI invoke failed: {error_text}")
+        response = await self._request(
+            "invoke",
+            "POST",
+            "https://api.openai.com/v1/responses",
+            headers=headers,
+            json={"model": model, "input": prompt},
+        )
+        if response.status_code != 200:
+            raise ProviderError(f"OpenAI invoke failed: {response.text}")
+        data = response.json()
         content = _extract_response_text(data)
         return {"content": content}
 
+    async def invoke_model_stream(
+        self, model: str, payload: Dict[str, Any], api_key: str | None = None
+    ) -> AsyncIterator[str]:
+        key = api_key or self.api_key
+        if not key:
+            raise ProviderError("OPENAI_API_KEY not set")
+        if not is_chat_model(self.name, model):
+            async for chunk in super().invoke_model_stream(model, payload, api_key=key):
+                yield chunk
+            return
+        body = {
+            "model": model,
+            "messages": [{"role": "user", "content": payload.get("prompt", "")}],
+            "stream": True,
+        }
+        try:
+            async for chunk in chat_completion_deltas(
+                self._stream(
+                    "invoke",
+                    "POST",
+                    "https://api.openai.com/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {key}"},
+                    json=body,
+                )
+            ):
+                yield chunk
+        except ProviderError as exc:
+            # Models outside the chat endpoint are served whole by invoke_model's fallbacks.
+            text = str(exc)
+            if "v1/responses" not in text and "not supported by the chat endpoint" not in text.lower():
+                raise
+            async for chunk in super().invoke_model_stream(model, payload, api_key=key):
+                yield chunk
+
+
+async def chat_completion_deltas(events: AsyncIterator) -> AsyncIterator[str]:
+    async for _, data in events:
+        if data.strip() == "[DONE]":
+            return
+        try:
+            choices = json.loads(data).get("choices") or []
+        except ValueError:
+            continue
+        for choice in choices:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
 
 def _extract_response_text(data: Dict[str, Any]) -> str:
     if isinstance(data, dict):
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+CACHE_SITES = ("introduce", "profile", "planning")
+# Never part of the key: tokens are one-shot and would make every call unique.
+_UNKEYED_FIELDS = {"prompt", "provider_token"}
+
+
+def normalize_prompt(prompt: str) -> str:
+    lines = [re.sub(r"\s+", " ", line).strip() for line in str(prompt or "").splitlines()]
+    return "\n".join(lines).strip()
+
+
+def cache_key(provider: str, model: str, payload: Dict[str, Any]) -> str:
+    params = {name: value for name, value in payload.items() if name not in _UNKEYED_FIELDS}
+    raw = json.dumps(
+        [provider, model, normalize_prompt(payload.get("prompt", "")), params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CachedText(str):
+    """A response replayed from the cache rather than produced by the provider."""
+
+
+@dataclass
+class CacheEntry:
+    site: Optional[str] = None
+    key: str = ""
+    content: Optional[str] = None
+    fresh: str = ""
+
+    def store(self, content: str) -> None:
+        if self.key:
+            self.fresh = content
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: Path,
+        sites: Iterable[str] = (),
+        max_entries: int = 1000,
+        ttl_seconds: float = 86400.0,
+    ) -> None:
+        self.path = Path(path)
+        self.sites = {site for site in sites if site}
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.usd_saved = 0.0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def enabled(self, site: Optional[str]) -> bool:
+        return bool(site) and (site in self.sites or "*" in self.sites)
+
+    def get(self, site: str, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._db().execute(
+                    "SELECT content, created_at FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                entry = (row[0], row[1]) if row else None
+            if entry is not None and self._expired(entry[1], now):
+                self._memory.pop(key, None)
+                self._db().execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self._db().commit()
+                entry = None
+            if entry is None:
+                self.misses[site] = self.misses.get(site, 0) + 1
+                return None
+            self._remember(key, entry)
+            self._db().execute("UPDATE response_cache SET used_at = ? WHERE key = ?", (now, key))
+            self._db().commit()
+            self.hits[site] = self.hits.get(site, 0) + 1
+            self.usd_saved += float(os.getenv("AI_DEVTEAM_COST_PER_CALL", "0.01"))
+            return entry[0]
+
+    def put(self, site: str, key: str, provider: str, model: str, content: str) -> None:
+        if not content:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, (content, now))
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, site, provider, model, content, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, site, provider, model, content, now, now),
+            )
+            if self.ttl_seconds > 0:
+                conn.execute("DELETE FROM response_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM response_cache WHERE key NOT IN "
+                "(SELECT key FROM response_cache ORDER BY used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._db().execute("DELETE FROM response_cache")
+            self._db().commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                "sites": sorted(self.sites),
+                "entries": entries,
+                "memory_entries": len(self._memory),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "usd_saved": round(self.usd_saved, 4),
+                "by_site": {
+                    site: {"hits": self.hits.get(site, 0), "misses": self.misses.get(site, 0)}
+                    for site in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, entry: tuple[str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, site TEXT, provider TEXT, model TEXT, content TEXT, "
+                "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_response_cache_used_at ON response_cache (used_at)"
+            )
+            self._conn.commit()
+        return self._conn
@@ -0,0 +1,303 @@
+import asyncio
+import itertools
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional
+
+from app.providers.base import ProviderError
+from app.providers.http_pool import RETRY_STATUSES
+
+INTERACTIVE = 0
+BACKGROUND = 1
+LIMIT_FIELDS = ("rpm", "tpm", "concurrency")
+ALL_PROVIDERS = "*"
+# Completion size assumed when reserving tokens-per-minute before a call; settled afterwards.
+COMPLETION_ESTIMATE = 512
+# Upper bound on any wait without a known deadline, so a missed wake-up only costs this much.
+RECHECK_SECONDS = 1.0
+
+Limits = Dict[str, Dict[str, float]]
+
+
+def parse_limits(raw: str) -> Limits:
+    limits: Limits = {}
+    for item in raw.split(","):
+        key, _, value = item.partition("=")
+        # Model names contain dots, so the field is whatever follows the last one.
+        scope, _, name = key.strip().rpartition(".")
+        name = name.lower()
+        if name not in LIMIT_FIELDS:
+            continue
+        try:
+            limits.setdefault(scope or ALL_PROVIDERS, {})[name] = float(value)
+        except ValueError:
+            continue
+    return limits
+
+
+def load_limits(raw: Optional[str]) -> Limits:
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    limits: Limits = {}
+    for scope, values in data.items():
+        if not isinstance(values, dict):
+            continue
+        for name, value in values.items():
+            if name in LIMIT_FIELDS and isinstance(value, (int, float)):
+                limits.setdefault(str(scope), {})[name] = float(value)
+    return limits
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text or "") // 4)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def configure(self, per_minute: float) -> None:
+        if per_minute != self.per_minute:
+            self._refill(time.monotonic())
+            self.level = min(self.level, per_minute)
+            self.per_minute = per_minute
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A request larger than the whole budget waits for a full bucket rather than forever.
+        needed = min(amount, self.per_minute)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * 60.0 / self.per_minute
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def adjust(self, amount: float) -> None:
+        self.level = min(self.per_minute, self.level - amount)
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.per_minute, self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    order: int
+    model: str = field(compare=False)
+    tokens: int = field(compare=False)
+    provider_limits: Dict[str, float] = field(compare=False)
+    model_limits: Dict[str, float] = field(compare=False)
+
+
+@dataclass
+class _Lane:
+    condition: asyncio.Condition
+    waiters: list = field(default_factory=list)
+    active: Dict[str, int] = field(default_factory=dict)
+    buckets: Dict[tuple, TokenBucket] = field(default_factory=dict)
+    blocked_until: float = 0.0
+    calls: int = 0
+    throttled: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+
+
+class Grant:
+    def __init__(self, buckets: list, tokens: int) -> None:
+        self._buckets = buckets
+        self._tokens = tokens
+
+    def settle(self, actual_tokens: int) -> None:
+        delta = actual_tokens - self._tokens
+        for bucket in self._buckets:
+            bucket.adjust(delta)
+        self._tokens = actual_tokens
+
+
+class ProviderScheduler:
+    def __init__(
+        self,
+        limits: Optional[Limits] = None,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ) -> None:
+        self.limits: Limits = dict(limits or {})
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lanes: Dict[str, _Lane] = {}
+        self._order = itertools.count()
+
+    def limits_for(
+        self, provider: str, model: str, overrides: Optional[Limits] = None
+    ) -> tuple[Dict[str, float], Dict[str, float]]:
+        overrides = overrides or {}
+        provider_limits: Dict[str, float] = {}
+        for source in (self.limits, overrides):
+            provider_limits.update(source.get(ALL_PROVIDERS, {}))
+        for source in (self.limits, overrides):
+            provider_limits.update(source.get(provider, {}))
+        model_limits: Dict[str, float] = {}
+        for source in (self.limits, overrides):
+            model_limits.update(source.get(f"{provider}:{model}", {}))
+        return provider_limits, model_limits
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        model: str,
+        tokens: int = 0,
+        priority: int = BACKGROUND,
+        overrides: Optional[Limits] = None,
+    ) -> AsyncIterator[Grant]:
+        lane = self._lane(provider)
+        provider_limits, model_limits = self.limits_for(provider, model, overrides)
+        waiter = _Waiter(priority, next(self._order), model, tokens, provider_limits, model_limits)
+        grant = await self._acquire(lane, waiter)
+        try:
+            yield grant
+        finally:
+            async with lane.condition:
+                for key in ("", model):
+                    lane.active[key] = max(0, lane.active.get(key, 0) - 1)
+                lane.condition.notify_all()
+
+    def retry_delay(self, provider: str, exc: ProviderError, attempt: int) -> Optional[float]:
+        status = getattr(exc, "status_code", None)
+        if status not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        lane = self._lane(provider)
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None and retry_after > self.max_delay:
+            return None
+        backoff = min(self.max_delay, self.base_delay * (2**attempt))
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, backoff)
+        else:
+            delay = random.uniform(backoff / 2, backoff)
+        if status == 429:
+            lane.rate_limited += 1
+            # Everyone else on this provider waits out the same window instead of tripping it again.
+            lane.blocked_until = max(lane.blocked_until, time.monotonic() + (retry_after or delay))
+        lane.retries += 1
+        return delay
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            provider: {
+                "active": lane.active.get("", 0),
+                "waiting": len(lane.waiters),
+                "calls": lane.calls,
+                "throttled": lane.throttled,
+                "rate_limited": lane.rate_limited,
+                "retries": lane.retries,
+                "blocked_for_s": round(max(0.0, lane.blocked_until - now), 2),
+            }
+            for provider, lane in self._lanes.items()
+        }
+
+    def _lane(self, provider: str) -> _Lane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            lane = _Lane(asyncio.Condition())
+            self._lanes[provider] = lane
+        return lane
+
+    async def _acquire(self, lane: _Lane, waiter: _Waiter) -> Grant:
+        lane.waiters.append(waiter)
+        lane.waiters.sort()
+        waited = False
+        async with lane.condition:
+            try:
+                while True:
+                    delay = self._admit(lane, waiter)
+                    if delay == 0:
+                        lane.calls += 1
+                        if waited:
+                            lane.throttled += 1
+                        return self._take(lane, waiter)
+                    waited = True
+                    try:
+                        await asyncio.wait_for(
+                            lane.condition.wait(), RECHECK_SECONDS if delay is None else delay
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                # Leaving the line, granted or cancelled, can unblock the callers queued behind us.
+                if waiter in lane.waiters:
+                    lane.waiters.remove(waiter)
+                lane.condition.notify_all()
+
+    def _admit(self, lane: _Lane, waiter: _Waiter) -> Optional[float]:
+        now = time.monotonic()
+        if now < lane.blocked_until:
+            return lane.blocked_until - now
+        for other in lane.waiters:
+            if other is waiter:
+                break
+            # Earlier (higher-priority) callers keep their place for the model and for provider capacity.
+            if (
+                other.model == waiter.model
+                or self._check(lane, "", other.provider_limits, other.tokens, now) != 0
+            ):
+                ahead = self._delay(lane, other, now)
+                return None if ahead is None else max(ahead, 0.01)
+        return self._delay(lane, waiter, now)
+
+    def _delay(self, lane: _Lane, waiter: _Waiter, now: float) -> Optional[float]:
+        provider_delay = self._check(lane, "", waiter.provider_limits, waiter.tokens, now)
+        model_delay = self._check(lane, waiter.model, waiter.model_limits, waiter.tokens, now)
+        if provider_delay is None or model_delay is None:
+            return None
+        return max(provider_delay, model_delay)
+
+    def _check(
+        self, lane: _Lane, key: str, limits: Dict[str, float], tokens: int, now: float
+    ) -> Optional[float]:
+        concurrency = int(limits.get("concurrency") or 0)
+        if concurrency and lane.active.get(key, 0) >= concurrency:
+            return None
+        delay = 0.0
+        for kind, amount in (("rpm", 1), ("tpm", tokens)):
+            per_minute = limits.get(kind) or 0
+            if per_minute > 0 and amount > 0:
+                delay = max(delay, self._bucket(lane, key, kind, per_minute).wait_time(amount, now))
+        return delay
+
+    def _take(self, lane: _Lane, waiter: _Waiter) -> Grant:
+        token_buckets = []
+        for key, limits in (("", waiter.provider_limits), (waiter.model, waiter.model_limits)):
+            lane.active[key] = lane.active.get(key, 0) + 1
+            if limits.get("rpm"):
+                self._bucket(lane, key, "rpm", limits["rpm"]).take(1)
+            if limits.get("tpm") and waiter.tokens:
+                bucket = self._bucket(lane, key, "tpm", limits["tpm"])
+                bucket.take(waiter.tokens)
+                token_buckets.append(bucket)
+        return Grant(token_buckets, waiter.tokens)
+
+    def _bucket(self, lane: _Lane, key: str, kind: str, per_minute: float) -> TokenBucket:
+        bucket = lane.buckets.get((key, kind))
+        if bucket is None:
+            bucket = TokenBucket(per_minute)
+            lane.buckets[(key, kind)] = bucket
+        else:
+            bucket.configure(per_minute)
+        return bucket
@@ -1,4 +1,7 @@
 import asyncio
+import os
+import re
+import threading
 from pathlib import Path
 from typing import Iterable, Optional
 
@@ -9,45 +12,227 @@ from app.core.artifacts import ArtifactStore
 from app.core.events import Event, EventBus
 
 
-class _RepoEventHandler(FileSystemEventHandler):
-    def __init__(
-        self,
-        event_bus: EventBus,
-        artifact_store: ArtifactStore,
-        run_id: int,
-        loop: asyncio.AbstractEventLoop,
-        ignore_dirs: Iterable[str],
-    ) -> None:
-        self.event_bus = event_bus
-        self.artifact_store = artifact_store
-        self.run_id = run_id
-        self.loop = loop
-        self.ignore_dirs = set(ignore_dirs)
+DEFAULT_IGNORES = [".git/", ".ai_dev_team/", "node_modules/"]
+
+_registry_lock = threading.Lock()
+_shared: dict[Path, "_SharedObserver"] = {}
+_debounce_seconds = 0.25
+_max_events_per_second = 200
+
 
-    def _should_ignore(self, path: str) -> bool:
-        for ignored in self.ignore_dirs:
-            if ignored in path:
-                return True
-        return False
+def configure_watchers(debounce_seconds: float, max_events_per_second: int) -> None:
+    global _debounce_seconds, _max_events_per_second
+    _debounce_seconds = max(0.0, debounce_seconds)
+    _max_events_per_second = max(1, max_events_per_second)
+
+
+def watcher_stats() -> list[dict]:
+    with _registry_lock:
+        return [shared.stats() for shared in _shared.values()]
+
+
+class IgnoreMatcher:
+    def __init__(self, patterns: Iterable[str]) -> None:
+        ignored: list[str] = []
+        negated: list[str] = []
+        for raw in patterns:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            target = ignored
+            if line.startswith("!"):
+                target, line = negated, line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            target.append(_gitignore_regex(line))
+        self._ignored = re.compile("|".join(ignored)) if ignored else None
+        self._negated = re.compile("|".join(negated)) if negated else None
+
+    @classmethod
+    def for_root(cls, root: Path) -> "IgnoreMatcher":
+        patterns = list(DEFAULT_IGNORES)
+        for path in (root / ".gitignore", root / ".git" / "info" / "exclude"):
+            try:
+                patterns.extend(path.read_text(encoding="utf-8", errors="replace").splitlines())
+            except OSError:
+                continue
+        return cls(patterns)
+
+    def ignored(self, relative: str) -> bool:
+        if self._ignored is None or not self._ignored.match(relative):
+            return False
+        # Negations are applied after all ignores rather than in file order.
+        return not (self._negated and self._negated.match(relative))
+
+
+def _gitignore_regex(pattern: str) -> str:
+    directory_only = pattern.endswith("/")
+    pattern = pattern.strip("/") if directory_only else pattern
+    anchored = "/" in pattern.lstrip("/") or pattern.startswith("/")
+    pattern = pattern.lstrip("/")
+    body = ""
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            body += "(?:.*/)?"
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            body += ".*"
+            index += 2
+            continue
+        if char == "*":
+            body += "[^/]*"
+        elif char == "?":
+            body += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                body += re.escape(char)
+            else:
+                body += "[" + pattern[index + 1 : end].replace("\\", "\\\\") + "]"
+                index = end
+        else:
+            body += re.escape(char)
+        index += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    # A directory pattern only matches paths beneath it; others also cover a matching directory's contents.
+    suffix = "/.*" if directory_only else "(?:/.*)?"
+    return f"(?:{prefix}{body}{suffix})$"
+
+
+class _RepoEventHandler(FileSystemEventHandler):
+    def __init__(self, shared: "_SharedObserver") -> None:
+        self.shared = shared
 
     def on_modified(self, event) -> None:
-        if event.is_directory or self._should_ignore(event.src_path):
-            return
-        self._handle_event("file.modified", event.src_path)
+        if not event.is_directory:
+            self.shared.record("file.modified", event.src_path)
 
     def on_created(self, event) -> None:
-        if event.is_directory or self._should_ignore(event.src_path):
+        if not event.is_directory:
+            self.shared.record("file.created", event.src_path)
+
+    def on_moved(self, event) -> None:
+        # Editors commonly save by writing a temp file and renaming it over the original.
+        if not event.is_directory:
+            self.shared.record("file.modified", event.dest_path)
+
+
+class _SharedObserver:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._prefix = str(root).rstrip(os.sep) + os.sep
+        self.matcher = IgnoreMatcher.for_root(root)
+        self.watchers: list["FileWatcher"] = []
+        self.received = 0
+        self.ignored = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.delivered = 0
+        self._pending: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer: Optional[Observer] = None
+        self._flusher: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        observer = Observer()
+        observer.schedule(_RepoEventHandler(self), str(self.root), recursive=True)
+        observer.start()
+        self._observer = observer
+        self._flusher = threading.Thread(target=self._run, name=f"watch:{self.root.name}", daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._flusher:
+            self._flusher.join()
+            self._flusher = None
+
+    def record(self, event_type: str, path: str) -> None:
+        self.received += 1
+        if not path.startswith(self._prefix):
+            self.ignored += 1
+            return
+        relative = path[len(self._prefix) :].replace(os.sep, "/")
+        if relative in (".gitignore", ".git/info/exclude"):
+            self.matcher = IgnoreMatcher.for_root(self.root)
+        if self.matcher.ignored(relative):
+            self.ignored += 1
+            return
+        with self._lock:
+            previous = self._pending.get(path)
+            if previous is not None:
+                self.coalesced += 1
+                # A file created and then edited in one window is still reported as created.
+                if previous == "file.created":
+                    return
+            self._pending[path] = event_type
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
             return
-        self._handle_event("file.created", event.src_path)
+        budget = max(1, int(_max_events_per_second * max(_debounce_seconds, 0.05)))
+        items = list(pending.items())
+        if len(items) > budget:
+            self.dropped += len(items) - budget
+            items = items[:budget]
+        watchers = list(self.watchers)
+        for path, event_type in items:
+            self._deliver(watchers, event_type, path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "root": str(self.root),
+            "runs": [watcher.run_id for watcher in self.watchers],
+            "received": self.received,
+            "ignored": self.ignored,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+            "pending": pending,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(_debounce_seconds or 0.05):
+            try:
+                self.flush()
+            except Exception:
+                continue
 
-    def _handle_event(self, event_type: str, path: str) -> None:
+    def _deliver(self, watchers: list["FileWatcher"], event_type: str, path: str) -> None:
+        file_path = Path(path)
+        data: Optional[bytes] = None
+        limit = max((watcher.artifact_store.snapshots.max_bytes for watcher in watchers), default=0)
         try:
-            contents = Path(path).read_text(encoding="utf-8")
-        except Exception:
-            contents = ""
-        self.artifact_store.write_snapshot(self.run_id, path, contents)
-        event = Event(type=event_type, payload={"path": path})
-        asyncio.run_coroutine_threadsafe(self.event_bus.publish(event), self.loop)
+            if file_path.stat().st_size <= limit:
+                data = file_path.read_bytes()
+        except OSError:
+            pass
+        for watcher in watchers:
+            snapshots = watcher.artifact_store.snapshots
+            if data is not None:
+                snapshot = snapshots.save(watcher.run_id, path, data)
+            else:
+                snapshot = snapshots.save_file(watcher.run_id, file_path)
+            payload = {"path": path}
+            if snapshot.get("hash"):
+                payload["blob"] = snapshot["hash"]
+            if snapshot.get("skipped"):
+                payload["snapshot_skipped"] = snapshot["skipped"]
+            event = Event(type=event_type, payload=payload, run_id=watcher.run_id)
+            asyncio.run_coroutine_threadsafe(watcher.event_bus.publish(event), watcher.loop)
+            self.delivered += 1
 
 
 class FileWatcher:
@@ -62,27 +247,31 @@ class FileWatcher:
         self.event_bus = event_bus
         self.artifact_store = artifact_store
         self.run_id = run_id
-        self._observer: Optional[Observer] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shared: Optional[_SharedObserver] = None
 
     def start(self) -> None:
-        if self._observer:
+        if self._shared:
             return
-        loop = asyncio.get_event_loop()
-        handler = _RepoEventHandler(
-            self.event_bus,
-            self.artifact_store,
-            self.run_id,
-            loop,
-            ignore_dirs=[".git", ".ai_dev_team", "node_modules"],
-        )
-        observer = Observer()
-        observer.schedule(handler, str(self.repo_root), recursive=True)
-        observer.start()
-        self._observer = observer
+        self.loop = asyncio.get_event_loop()
+        root = Path(self.repo_root).resolve()
+        with _registry_lock:
+            shared = _shared.get(root)
+            if shared is None:
+                shared = _SharedObserver(root)
+                shared.start()
+                _shared[root] = shared
+            shared.watchers.append(self)
+        self._shared = shared
 
     def stop(self) -> None:
-        if not self._observer:
+        shared, self._shared = self._shared, None
+        if not shared:
             return
-        self._observer.stop()
-        self._observer.join()
-        self._observer = None
+        with _registry_lock:
+            if self in shared.watchers:
+                shared.watchers.remove(self)
+            if shared.watchers:
+                return
+            _shared.pop(shared.root, None)
+        shared.stop()
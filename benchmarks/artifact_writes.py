@@ -0,0 +1,53 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import artifact_writer  # noqa: E402
+from app.core.artifacts import ArtifactStore  # noqa: E402
+
+
+def _event(index: int) -> dict:
+    return {
+        "type": "tool.requested",
+        "payload": {"tool": "file.read", "arguments": {"path": f"src/{index}.py"}},
+        "timestamp": "2024-01-01T00:00:00",
+    }
+
+
+def _run(count: int, writer: artifact_writer.ArtifactWriter) -> float:
+    artifact_writer._writer = writer
+    if writer.flush_interval:
+        writer.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArtifactStore(Path(tmp))
+        started = time.perf_counter()
+        for index in range(count):
+            store.write_event(1, _event(index))
+            if index % 4 == 0:
+                store.write_chat(1, "Developer", {"role": "Developer", "content": f"update {index}"})
+        enqueued = time.perf_counter() - started
+        writer.close()
+        total = time.perf_counter() - started
+        assert len(store.read_events(1)) == count
+    print(f"  caller time {enqueued * 1000:8.1f} ms   until durable {total * 1000:8.1f} ms")
+    return count / enqueued
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare synchronous and batched artifact writes.")
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("synchronous (open, append, close per record)")
+    sync_rate = _run(args.events, artifact_writer.ArtifactWriter(flush_interval=0))
+    print("background writer (50 ms batches, open handles)")
+    batched_rate = _run(args.events, artifact_writer.ArtifactWriter(flush_interval=0.05))
+    print(f"events/s: sync {sync_rate:,.0f}  batched {batched_rate:,.0f}  ({batched_rate / sync_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event  # noqa: E402
+
+from app.core.events import EventBus  # noqa: E402
+from app.core.job_engine import JobEngine, JobStepResult  # noqa: E402
+from app.db import session as db  # noqa: E402
+from app.db.models import Project, Run, Team  # noqa: E402
+
+
+def _seed_runs(count: int) -> list[int]:
+    with db.get_session() as session:
+        project = Project(name="Bench", repo_local_path=".")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        team = Team(project_id=project.id, name="Team")
+        session.add(team)
+        session.commit()
+        session.refresh(team)
+        runs = [Run(project_id=project.id, team_id=team.id, goal=f"Bench {index}") for index in range(count)]
+        session.add_all(runs)
+        session.commit()
+        return [run.id for run in runs]
+
+
+async def _noop() -> JobStepResult:
+    return JobStepResult(True)
+
+
+async def _jobs(engine: JobEngine, run_ids: list[int], steps: list[str]) -> None:
+    handlers = {name: _noop for name in steps}
+    for run_id in run_ids:
+        job_id = engine.create_job(run_id)
+        await engine.run(job_id, steps, handlers)
+
+
+def _measure(label: str, jobs: int, step_count: int, **engine_args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db.init_db(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        run_ids = _seed_runs(jobs)
+        steps = [f"step-{index}" for index in range(step_count)]
+        engine = JobEngine(EventBus(), **engine_args)
+        commits = []
+        event.listen(db._engine, "commit", lambda conn: commits.append(1))
+        started = time.perf_counter()
+        asyncio.run(_jobs(engine, run_ids, steps))
+        elapsed = time.perf_counter() - started
+        db._engine.dispose()
+    total = jobs * step_count
+    print(
+        f"{label:16} {elapsed / total * 1000:7.3f} ms/step   {total / elapsed:9,.0f} steps/s   "
+        f"{len(commits) / total:5.2f} commits/step"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure JobEngine overhead per step with no-op handlers.")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--synchronous", default="FULL", help="SQLite synchronous mode; FULL makes commits slow")
+    args = parser.parse_args()
+
+    db.configure_sqlite({**db.DEFAULT_SQLITE_PRAGMAS, "synchronous": args.synchronous})
+    _measure("per transition", args.jobs, args.steps)
+    _measure(f"batch of {args.batch}", args.jobs, args.steps, batch_size=args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.loop_monitor import LoopLagMonitor  # noqa: E402
+from app.core.memory import MemoryStore  # noqa: E402
+from app.db import session as db  # noqa: E402
+from app.db.models import AgentConfig, Project, Run, Team  # noqa: E402
+
+
+def _seed(path: Path) -> tuple[int, int]:
+    db.init_db(f"sqlite:///{path}")
+    with db.get_session() as session:
+        project = Project(name="Bench", repo_local_path=".")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        team = Team(project_id=project.id, name="Team")
+        session.add(team)
+        session.commit()
+        session.refresh(team)
+        agent = AgentConfig(team_id=team.id, role="Developer", provider="openai", model="gpt-4")
+        run = Run(project_id=project.id, team_id=team.id, goal="Bench")
+        session.add(agent)
+        session.add(run)
+        session.commit()
+        return run.id, agent.id
+
+
+async def _agents(count: int, writes: int, run_id: int, agent_id: int, threaded: bool) -> LoopLagMonitor:
+    memory = MemoryStore()
+    monitor = LoopLagMonitor(interval=0.005, window=100_000)
+    monitor.start()
+
+    async def agent(index: int) -> None:
+        for step in range(writes):
+            content = f"Agent {index}: step {step}"
+            if threaded:
+                await db.run_db(memory.append, run_id, agent_id, "Developer", content)
+            else:
+                memory.append(run_id, agent_id, "Developer", content)
+            # Stand-in for awaiting a provider response between writes.
+            await asyncio.sleep(0.001)
+
+    await asyncio.gather(*(agent(index) for index in range(count)))
+    monitor.stop()
+    return monitor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure event-loop lag with inline and threaded DB access.")
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--synchronous", default="FULL", help="SQLite synchronous mode; FULL makes commits slow")
+    args = parser.parse_args()
+
+    db.configure_sqlite({**db.DEFAULT_SQLITE_PRAGMAS, "synchronous": args.synchronous})
+    for label, threaded in (("inline", False), ("threaded", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_id, agent_id = _seed(Path(tmp) / "bench.db")
+            stats = asyncio.run(_agents(args.agents, args.writes, run_id, agent_id, threaded)).stats()
+            db._engine.dispose()
+        print(
+            f"{label:9} lag p50 {stats['p50_ms']:7.2f} ms   p99 {stats['p99_ms']:7.2f} ms   "
+            f"max {stats['max_ms']:7.2f} ms   stalls {stats['stalls']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.db import session as db  # noqa: E402
+from app.db.models import AuditLog  # noqa: E402
+
+
+def _writer(count: int, errors: list[int]) -> None:
+    failed = 0
+    for index in range(count):
+        try:
+            with db.get_session() as session:
+                session.add(AuditLog(actor="bench", action="tool.call", decision="allow", request=str(index)))
+                session.commit()
+        except OperationalError:
+            failed += 1
+    errors.append(failed)
+
+
+def _run(label: str, pragmas: dict[str, str], threads: int, count: int) -> None:
+    db.configure_sqlite(pragmas)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.init_db(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        errors: list[int] = []
+        workers = [threading.Thread(target=_writer, args=(count, errors)) for _ in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        db._engine.dispose()
+    written = threads * count - sum(errors)
+    print(f"{label:8} {written / elapsed:10,.0f} commits/s   {sum(errors):5} locked errors   {elapsed:6.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare concurrent SQLite writers with and without connection PRAGMAs.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=250)
+    args = parser.parse_args()
+
+    _run("default", {}, args.threads, args.writes)
+    _run("tuned", db.DEFAULT_SQLITE_PRAGMAS, args.threads, args.writes)
+
+
+if __name__ == "__main__":
+    main()
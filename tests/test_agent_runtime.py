@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+from app.agents.runtime import AgentRuntime
+from app.core.events import EventBus
+from app.db.models import AgentConfig
+from app.db.session import init_db
+from app.integrations.mcp_client import MCPRegistry
+
+
+class FakeRegistry:
+    def __init__(self) -> None:
+        self.ttft = []
+
+    async def invoke_stream(self, provider, model, payload, **kwargs):
+        for chunk in ["Hel", "lo", " wor", "ld", "!"]:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    def record_ttft(self, provider, seconds):
+        self.ttft.append((provider, seconds))
+
+
+def test_run_agent_streams_coalesced_deltas(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'runtime.db'}")
+    registry = FakeRegistry()
+    runtime = AgentRuntime(registry, MCPRegistry([], []), delta_interval=10, delta_bytes=5)
+    runtime.event_bus = EventBus(replay_size=0)
+    queue = runtime.event_bus.subscribe(types="chat.delta")
+    agent = AgentConfig(team_id=1, role="Developer", provider="openai", model="gpt-4")
+
+    result = asyncio.run(runtime.run_agent(1, agent, "Say hello"))
+
+    assert result["content"] == "Hello world!"
+    assert result["ttft_ms"] is not None
+    assert [provider for provider, _ in registry.ttft] == ["openai"]
+    deltas = [json.loads(queue.get_nowait()) for _ in range(queue.qsize())]
+    assert [event["payload"]["delta"] for event in deltas] == ["Hello", " world", "!"]
+    assert [event["payload"]["done"] for event in deltas] == [False, False, True]
+    assert all(event["seq"] is None for event in deltas)
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from sqlmodel import select
+
+from app.core.audit import AuditEntry, AuditLogger
+from app.core.policy import PolicyEngine
+from app.core.tool_broker import ToolBroker, ToolRequest, ToolResult
+from app.db.models import AuditLog
+from app.db.session import get_engine, get_session, init_db
+
+
+def test_audit_entries_are_batched_and_keep_enqueue_time(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    logger = AuditLogger(flush_interval=5.0, max_batch=100)
+    logger.start()
+    first = AuditEntry(actor="dev", action="tool.request", decision="allowed", tool_name="file.read")
+    time.sleep(0.01)
+    second = AuditEntry(actor="dev", action="tool.result", decision="executed", tool_name="file.read")
+    assert first.created_at != second.created_at
+    logger.log(first)
+    logger.log(second)
+    with get_session() as session:
+        assert list(session.exec(select(AuditLog))) == []
+
+    assert logger.flush()
+    with get_session() as session:
+        rows = list(session.exec(select(AuditLog).order_by(AuditLog.id)))
+    assert [row.action for row in rows] == ["tool.request", "tool.result"]
+    assert rows[0].created_at.isoformat() == first.created_at
+    assert logger.stats() == {"pending": 0, "written": 2, "batches": 1, "failed": 0}
+
+    logger.log(AuditEntry(actor="dev", action="tool.request", decision="denied"))
+    logger.close()
+    with get_session() as session:
+        assert len(list(session.exec(select(AuditLog)))) == 3
+
+
+class ApproveAll:
+    def is_approved(self, approval_id, tool_name=None, risk_level=None):
+        return True
+
+
+def test_approved_actions_do_not_run_without_a_committed_audit_row(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    logger = AuditLogger(flush_interval=5.0)
+    logger.start()
+    calls = []
+
+    def executor(request):
+        calls.append(request.tool_name)
+        return ToolResult(success=True, output={"ok": True})
+
+    broker = ToolBroker(PolicyEngine(), logger, ApproveAll(), executors={"git.push": executor})
+    AuditLog.__table__.drop(get_engine())
+
+    request = ToolRequest("git.push", {}, risk_level="high", approval_id=1)
+    assert broker.execute(request, []).error == "audit_unavailable"
+    assert asyncio.run(broker.execute_async(request, [])).error == "audit_unavailable"
+    assert calls == [] and logger.stats()["failed"] == 2
+    logger.close()
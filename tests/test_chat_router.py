@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core.chat_router import ChatRouter
+from app.db.models import AgentConfig
+
+
+def _agents():
+    return [
+        AgentConfig(id=1, team_id=1, role="Product Owner", display_name="Ava", provider="openai", model="m"),
+        AgentConfig(id=2, team_id=1, role="Developer", display_name="Dan", provider="openai", model="m"),
+        AgentConfig(id=3, team_id=1, role="QA Engineer", display_name="Quinn", provider="groq", model="m"),
+    ]
+
+
+class FakeRegistry:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def invoke(self, provider, model, payload):
+        self.calls += 1
+        return {"content": self.content}
+
+
+def test_triage_prefers_mentions_then_keywords():
+    router = ChatRouter()
+    agents = _agents()
+
+    result = asyncio.run(router.triage({"agent": "Stakeholder", "content": "@dev please look"}, agents, 1))
+    assert [agent.id for agent in result.responders] == [2]
+    assert result.avoided == 2
+
+    result = asyncio.run(router.triage({"agent": "Dan", "content": "found a regression"}, agents, 1))
+    assert [agent.id for agent in result.responders] == [3]
+
+    result = asyncio.run(router.triage({"agent": "Dan", "content": "hello"}, agents, 1))
+    assert [agent.id for agent in result.responders] == [1]
+    assert router.calls_avoided[1] == 4
+
+
+def test_triage_uses_single_model_call():
+    registry = FakeRegistry('Sure: ["Quinn", "Dan"]')
+    router = ChatRouter(registry, "openai:gpt-4o-mini")
+    result = asyncio.run(router.triage({"agent": "Ava", "content": "thoughts?"}, _agents(), 7))
+    assert registry.calls == 1
+    assert result.used_model
+    assert sorted(agent.id for agent in result.responders) == [2, 3]
+    assert router.model_calls[7] == 1
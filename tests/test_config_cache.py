@@ -0,0 +1,51 @@
+from sqlmodel import select
+
+from app.core.config_cache import get_config_cache
+from app.core.memory import MemoryStore
+from app.db.models import AgentConfig, Project, ProjectSetting, Run, Team
+from app.db.session import get_session, init_db
+
+
+def test_settings_and_rosters_are_cached_until_written(tmp_path) -> None:
+    init_db(f"sqlite:///{tmp_path / 'cache.db'}")
+    cache = get_config_cache()
+    with get_session() as session:
+        project = Project(name="Test", repo_local_path=".")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        team = Team(project_id=project.id, name="Team")
+        session.add(team)
+        session.commit()
+        session.refresh(team)
+        session.add(ProjectSetting(project_id=project.id, chat_target_policy="team"))
+        agent = AgentConfig(team_id=team.id, role="Developer", provider="openai", model="gpt-4")
+        session.add(agent)
+        run = Run(project_id=project.id, team_id=team.id, goal="Ship")
+        session.add(run)
+        session.commit()
+        project_id, team_id, run_id, agent_id = project.id, team.id, run.id, agent.id
+
+    misses = cache.misses
+    assert cache.setting(project_id).chat_target_policy == "team"
+    assert [agent.role for agent in cache.roster(team_id)] == ["Developer"]
+    assert cache.misses == misses + 2
+    hits = cache.hits
+    cache.setting(project_id).chat_target_policy = "managers"
+    assert cache.setting(project_id).chat_target_policy == "team"
+    assert cache.hits == hits + 2
+
+    # Memory appends rewrite memory_summary only, which must not evict the roster.
+    MemoryStore().append(run_id, agent_id, "Developer", "note")
+    misses = cache.misses
+    cache.roster(team_id)
+    assert cache.misses == misses
+
+    with get_session() as session:
+        setting = session.exec(select(ProjectSetting).where(ProjectSetting.project_id == project_id)).one()
+        setting.chat_target_policy = "managers"
+        session.add(setting)
+        session.add(AgentConfig(team_id=team_id, role="QA Engineer", provider="openai", model="gpt-4"))
+        session.commit()
+    assert cache.setting(project_id).chat_target_policy == "managers"
+    assert sorted(agent.role for agent in cache.roster(team_id)) == ["Developer", "QA Engineer"]
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlmodel import SQLModel, create_engine, select
+
+from app.core.chat_cursors import ChatCursorStore
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.task_leases import TaskLeaseManager
+from app.db import session as db
+from app.db.models import AgentConfig, AgentMemory, ProjectSetting, Run, Task
+
+
+def test_init_db_applies_pragmas_and_reuses_engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_db(url)
+    engine = db._engine
+    with db.get_session() as session:
+        assert session.exec(text("PRAGMA journal_mode")).one()[0] == "wal"
+        assert session.exec(text("PRAGMA busy_timeout")).one()[0] == 5000
+        assert session.exec(text("PRAGMA synchronous")).one()[0] == 1
+        assert session.exec(text("PRAGMA temp_store")).one()[0] == 2
+
+    db.init_db(f"sqlite:///{tmp_path / 'other.db'}")
+    db.init_db(url)
+    assert db._engine is engine
+
+
+def _plan(session, statement) -> str:
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+    return "\n".join(row[3] for row in rows)
+
+
+def test_bootstrapper_adds_missing_indexes_used_by_loop_queries(tmp_path):
+    path = tmp_path / "legacy.db"
+    legacy = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        rows = conn.execute(text("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'ix_%'"))
+        for name in [row[0] for row in rows]:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(
+            text(
+                "INSERT INTO task (run_id, title, status, created_at, updated_at, attempts) "
+                "VALUES (1, 'kept', 'pending', '2024-01-01 00:00:00', '2024-01-01 00:00:00', 0)"
+            )
+        )
+    legacy.dispose()
+
+    db.init_db(f"sqlite:///{path}")
+
+    with db.get_session() as session:
+        indexes = {row[1] for row in session.exec(text("PRAGMA index_list(task)"))}
+        assert {"ix_task_status_created_at", "ix_task_run_id"} <= indexes
+        assert [task.title for task in session.exec(select(Task))] == ["kept"]
+        claim = select(Task).where(TaskLeaseManager().claimable()).order_by(Task.created_at.asc())
+        assert "USING INDEX ix_task_status_created_at" in _plan(session, claim)
+        recall = (
+            select(AgentMemory)
+            .where(AgentMemory.run_id == 1, AgentMemory.agent_id == 2)
+            .order_by(AgentMemory.created_at.desc())
+            .limit(5)
+        )
+        assert "USING INDEX ix_agentmemory_run_id_agent_id_created_at" in _plan(session, recall)
+        latest_run = select(Run).where(Run.project_id == 1).order_by(Run.id.desc())
+        assert "USING INDEX ix_run_project_id" in _plan(session, latest_run)
+        roster = select(AgentConfig).where(AgentConfig.team_id == 1)
+        assert "USING INDEX ix_agentconfig_team_id" in _plan(session, roster)
+        setting = select(ProjectSetting).where(ProjectSetting.project_id == 1)
+        assert "USING INDEX ix_projectsetting_project_id" in _plan(session, setting)
+
+
+def test_run_db_runs_off_the_event_loop(tmp_path):
+    db.init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    monitor = LoopLagMonitor(interval=0.005)
+
+    def slow_count() -> int:
+        time.sleep(0.2)
+        with db.get_session() as session:
+            return len(list(session.exec(select(Task))))
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.01)
+        count = await db.run_db(slow_count)
+        monitor.stop()
+        return count
+
+    assert asyncio.run(run()) == 0
+    assert monitor.samples
+    assert monitor.max_lag < 0.15
+
+
+def test_duplicate_chat_cursors_merge_into_a_unique_index(tmp_path):
+    path = tmp_path / "cursors.db"
+    legacy = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(text("DROP INDEX ux_chatcursor_run_id_agent_id"))
+        conn.execute(text("CREATE INDEX ix_chatcursor_run_id_agent_id ON chatcursor (run_id, agent_id)"))
+        for last_seq in (3, 7):
+            conn.execute(
+                text("INSERT INTO chatcursor (run_id, agent_id, last_seq, updated_at) VALUES (1, 1, :seq, '2024-01-01')"),
+                {"seq": last_seq},
+            )
+    legacy.dispose()
+
+    db.init_db(f"sqlite:///{path}")
+    store = ChatCursorStore()
+    assert store.load(1, [1, 2], 5) == {1: 7, 2: 5}
+    store.advance(1, 2, 9)
+    store.advance(1, 2, 6)
+    store.advance(1, 3, 4)
+    assert store.load(1, [1, 2, 3], 0) == {1: 7, 2: 9, 3: 4}
+    with db.get_session() as session:
+        assert session.exec(text("SELECT COUNT(*) FROM chatcursor")).one()[0] == 3
+        indexes = {row[1]: row[2] for row in session.exec(text("PRAGMA index_list(chatcursor)"))}
+    assert indexes.get("ux_chatcursor_run_id_agent_id") == 1
+    assert "ix_chatcursor_run_id_agent_id" not in indexes
@@ -1,6 +1,10 @@
 import asyncio
+import json
 
-from app.core.events import Event, EventBus
+import pytest
+
+from app.core.artifacts import ArtifactStore
+from app.core.events import Event, EventBus, SubscriberClosed
 
 
 def test_event_bus_publish():
@@ -13,3 +17,95 @@ def test_event_bus_publish():
         assert '"type": "test"' in message
 
     asyncio.run(run())
+
+
+def test_event_bus_overflow_policies():
+    bus = EventBus(maxsize=2)
+    oldest = bus.subscribe()
+    newest = bus.subscribe(policy="drop_newest")
+    coalesce = bus.subscribe(policy="coalesce")
+    disconnect = bus.subscribe(policy="disconnect")
+
+    async def run():
+        for index, kind in enumerate(["a", "b", "b", "c"]):
+            await bus.publish(Event(type=kind, payload={"n": index}))
+        return [
+            [json.loads(queue.get_nowait())["payload"]["n"] for _ in range(queue.qsize())]
+            for queue in (oldest, newest, coalesce)
+        ]
+
+    assert asyncio.run(run()) == [[2, 3], [0, 1], [2, 3]]
+    assert oldest.dropped == 2 and newest.dropped == 2 and coalesce.coalesced == 1 and coalesce.dropped == 1
+    assert disconnect.closed and disconnect not in bus._subscribers
+    with pytest.raises(SubscriberClosed):
+        asyncio.run(disconnect.get())
+
+
+def test_event_bus_filters_by_run_project_and_type():
+    bus = EventBus(project_resolver=lambda run_id: {1: 10, 2: 20}.get(run_id))
+    everything = bus.subscribe()
+    run_chat = bus.subscribe(run_id=1, types="chat.*")
+    project_tools = bus.subscribe(project_id=20, types=["tool.requested"])
+
+    async def run():
+        await bus.publish(Event(type="chat.message", payload={}, run_id=1))
+        await bus.publish(Event(type="chat.message", payload={"run_id": 2}))
+        await bus.publish(Event(type="tool.requested", payload={}, run_id=2))
+        await bus.publish(Event(type="tool.completed", payload={}, run_id=2))
+        await bus.publish(Event(type="mcp.discovered", payload={}))
+
+    asyncio.run(run())
+    assert everything.qsize() == 5
+    assert run_chat.qsize() == 1
+    assert json.loads(project_tools.get_nowait())["type"] == "tool.requested"
+    assert project_tools.qsize() == 0
+
+    bus.update_filters(run_chat, types="mcp.*")
+    asyncio.run(bus.publish(Event(type="mcp.discovered", payload={})))
+    assert run_chat.qsize() == 2
+
+
+def test_event_bus_sequences_and_replays(tmp_path):
+    store = ArtifactStore(tmp_path)
+    bus = EventBus(sequencer=store.next_event_seq, replay_size=2)
+
+    async def run():
+        first = Event(type="chat.message", payload={}, run_id=4)
+        store.write_event(4, first.__dict__)
+        await bus.publish(first)
+        for index in range(3):
+            event = Event(type="task.created", payload={"n": index}, run_id=4)
+            await bus.publish(event)
+            store.write_event(4, event.__dict__)
+        return first
+
+    first = asyncio.run(run())
+    assert first.seq == 1
+    assert bus.head_seq(4) == 4
+    buffered, oldest = bus.replay(4, 1)
+    assert oldest == 3 and [seq for seq, _, _ in buffered] == [3, 4]
+    assert [event["seq"] for event in store.read_events(4, after_seq=1)] == [2, 3, 4]
+    assert ArtifactStore(tmp_path)._event_log(4).head_seq() == 4
+
+
+def test_ws_backlog_reads_only_the_gap_and_dedupes(tmp_path):
+    from types import SimpleNamespace
+
+    from app.api.ws import _backlog
+
+    store = ArtifactStore(tmp_path)
+    bus = EventBus(replay_size=3)
+    websocket = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(data_dir=tmp_path)))
+
+    async def run():
+        events = [Event(type="task.created", payload={"n": seq}, run_id=6, seq=seq) for seq in range(1, 7)]
+        for event in events:
+            store.write_event(6, event.__dict__)
+        # Seq 5 reaches the bus after seq 6, so the ring is not in seq order.
+        for seq in (3, 4, 6, 5):
+            await bus.publish(events[seq - 1])
+
+    asyncio.run(run())
+    queue = bus.subscribe(run_id=6)
+    seqs = [json.loads(message)["seq"] for message in _backlog(websocket, bus, queue, "1")]
+    assert seqs == [2, 3, 4, 5, 6]
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.core.artifacts import ArtifactStore
+from app.core.events import EventBus
+from app.repo import file_watcher
+from app.repo.file_watcher import FileWatcher, _SharedObserver
+
+
+def test_shared_observer_filters_and_coalesces(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / ".gitignore").write_text("*.log\nbuild/\n!keep.log\n")
+    monkeypatch.setattr(file_watcher, "_max_events_per_second", 8)
+    monkeypatch.setattr(file_watcher, "_debounce_seconds", 0.25)
+    bus = EventBus()
+    queue = bus.subscribe()
+    shared = _SharedObserver(repo.resolve())
+    loop = asyncio.new_event_loop()
+    for run_id in (1, 2):
+        watcher = FileWatcher(repo, bus, ArtifactStore(tmp_path / "data"), run_id)
+        watcher.loop = loop
+        shared.watchers.append(watcher)
+
+    source = repo / "src" / "app.py"
+    source.write_text("print('hi')\n")
+    root = str(repo.resolve())
+    shared.record("file.created", f"{root}/src/app.py")
+    shared.record("file.modified", f"{root}/src/app.py")
+    for name in ("debug.log", "build/out.js", ".git/index", "node_modules/x/index.js"):
+        shared.record("file.modified", f"{root}/{name}")
+    shared.record("file.modified", f"{root}/keep.log")
+    for index in range(5):
+        shared.record("file.modified", f"{root}/src/gen{index}.py")
+    shared.flush()
+    loop.run_until_complete(asyncio.sleep(0.01))
+    loop.close()
+
+    stats = shared.stats()
+    assert (stats["ignored"], stats["coalesced"], stats["dropped"]) == (4, 1, 5)
+    assert stats["delivered"] == 4
+    messages = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert sum('"file.created"' in message for message in messages) == 2
@@ -0,0 +1,71 @@
+import asyncio
+
+from sqlmodel import select
+
+from app.core.events import EventBus
+from app.core.job_engine import JobEngine, JobStepResult
+from app.db.models import Job, JobEvent, JobStep, Project, Run, Team
+from app.db.session import get_session, init_db
+
+
+def _seed_job(tmp_path, engine: JobEngine) -> int:
+    init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    with get_session() as session:
+        project = Project(name="Test", repo_local_path=".")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        team = Team(project_id=project.id, name="Team")
+        session.add(team)
+        session.commit()
+        session.refresh(team)
+        run = Run(project_id=project.id, team_id=team.id, goal="Ship")
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+    return engine.create_job(run.id)
+
+
+async def _ok() -> JobStepResult:
+    return JobStepResult(True)
+
+
+async def _broken() -> JobStepResult:
+    return JobStepResult(False, "boom")
+
+
+def test_each_transition_is_one_transaction(tmp_path):
+    engine = JobEngine(EventBus())
+    job_id = _seed_job(tmp_path, engine)
+    asyncio.run(engine.run(job_id, ["plan", "build"], {"plan": _ok, "build": _ok}))
+    assert engine.transactions == 5
+    with get_session() as session:
+        job = session.get(Job, job_id)
+        steps = list(session.exec(select(JobStep).order_by(JobStep.id)))
+        events = list(session.exec(select(JobEvent).order_by(JobEvent.id)))
+    assert (job.status, job.current_state) == ("completed", "done")
+    assert [(step.name, step.status, step.attempts) for step in steps] == [
+        ("plan", "completed", 1),
+        ("build", "completed", 1),
+    ]
+    assert [(event.type, event.step_id) for event in events] == [
+        ("job.step.started", steps[0].id),
+        ("job.step.completed", steps[0].id),
+        ("job.step.started", steps[1].id),
+        ("job.step.completed", steps[1].id),
+        ("job.completed", None),
+    ]
+
+
+def test_batch_mode_flushes_when_the_job_stops(tmp_path):
+    engine = JobEngine(EventBus(), batch_size=16)
+    job_id = _seed_job(tmp_path, engine)
+    asyncio.run(engine.run(job_id, ["plan", "build"], {"plan": _ok, "build": _broken}, max_attempts=1))
+    assert engine.transactions == 1
+    with get_session() as session:
+        job = session.get(Job, job_id)
+        steps = list(session.exec(select(JobStep).order_by(JobStep.id)))
+        events = [event.type for event in session.exec(select(JobEvent).order_by(JobEvent.id))]
+    assert job.status == "failed"
+    assert [(step.status, step.error) for step in steps] == [("completed", None), ("failed", "max_attempts_exceeded")]
+    assert events == ["job.step.started", "job.step.completed", "job.step.started", "job.failed"]
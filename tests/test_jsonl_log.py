@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from app.core import artifact_writer
+from app.core.artifact_writer import ArtifactWriter
+from app.core.artifacts import ArtifactStore
+from app.core.events import EventFilter
+
+
+def test_event_pages_use_index(tmp_path):
+    store = ArtifactStore(tmp_path)
+    for index in range(10):
+        kind = "chat.message" if index % 2 else "task.created"
+        store.write_event(1, {"type": kind, "payload": {"n": index}})
+
+    tail, more = store.page_events(1, limit=3)
+    assert [event["seq"] for event in tail] == [8, 9, 10] and more
+    older, more = store.page_events(1, before_seq=8, limit=3)
+    assert [event["seq"] for event in older] == [5, 6, 7] and more
+    chats, more = store.page_events(
+        1, after_seq=2, limit=2, types=EventFilter.build(types="chat.*").matches_type
+    )
+    assert [event["seq"] for event in chats] == [4, 6] and more
+
+
+def test_legacy_role_logs_merge_into_one_chat_log(tmp_path):
+    chats = tmp_path / "runs" / "2" / "chats"
+    chats.mkdir(parents=True)
+    legacy = {
+        "Developer": [
+            {"role": "Developer", "content": "first", "timestamp": "2024-01-01T00:00:01"},
+            {"role": "Developer", "content": "third", "timestamp": "2024-01-01T00:00:03", "seq": 2},
+        ],
+        "QA Engineer": [
+            {"role": "QA Engineer", "content": "second", "timestamp": "2024-01-01T00:00:02", "seq": 1},
+        ],
+    }
+    for role, lines in legacy.items():
+        (chats / f"{role}.jsonl").write_text(
+            "".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8"
+        )
+    store = ArtifactStore(tmp_path)
+    store.write_chat(2, "Developer", {"role": "Developer", "content": "fourth"})
+
+    assert sorted(path.name for path in chats.glob("*.jsonl")) == ["chat.jsonl"]
+    assert (chats / "legacy" / "Developer.jsonl").exists()
+    assert [msg["content"] for msg in store.read_chats(2)] == ["first", "second", "third", "fourth"]
+    assert [msg["seq"] for msg in store.read_chats(2, after_seq=1)] == [2, 3, 4]
+    assert [msg["content"] for msg in store.read_chats(2, roles=["QA Engineer"])] == ["second"]
+    assert store.head_chat_seq(2) == 4
+
+
+def test_migrated_chat_history_pages_back_to_the_start(tmp_path):
+    chats = tmp_path / "runs" / "5" / "chats"
+    chats.mkdir(parents=True)
+    for offset, (role, prefix) in enumerate((("Developer", "dev"), ("QA Engineer", "qa"))):
+        lines = [
+            {"role": role, "content": f"{prefix}{n}", "timestamp": f"2024-01-01T00:00:{2 * n + offset:02d}"}
+            for n in range(5)
+        ]
+        (chats / f"{role}.jsonl").write_text(
+            "".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8"
+        )
+    store = ArtifactStore(tmp_path)
+    store.write_chat(5, "Developer", {"role": "Developer", "content": "new"})
+
+    pages, before, more = [], None, True
+    while more:
+        page, more = store.page_chats(5, before_seq=before, limit=3)
+        pages.insert(0, page)
+        before = page[0]["seq"]
+    messages = [msg for page in pages for msg in page]
+    assert [msg["seq"] for msg in messages] == list(range(1, 12))
+    assert [msg["content"] for msg in messages] == [
+        f"{prefix}{n}" for n in range(5) for prefix in ("dev", "qa")
+    ] + ["new"]
+
+
+def test_background_writer_batches_and_drains(tmp_path, monkeypatch):
+    writer = ArtifactWriter(flush_interval=0.2)
+    monkeypatch.setattr(artifact_writer, "_writer", writer)
+    writer.start()
+    store = ArtifactStore(tmp_path)
+    for index in range(50):
+        store.write_event(3, {"type": "tool.requested", "payload": {"n": index}})
+    store.write_snapshot(3, "src/app.py", "print('hi')")
+
+    assert [event["seq"] for event in store.read_events(3, limit=2)] == [49, 50]
+    assert writer.batches < 50
+    writer.close()
+    assert writer.pending() == 0
+    snapshot = store.snapshots.history(3, "src/app.py")[0]
+    assert store.snapshots.read_blob(snapshot["hash"]) == b"print('hi')"
+
+
+def test_reads_serve_pending_writes_without_waiting_on_the_writer(tmp_path, monkeypatch):
+    writer = ArtifactWriter(flush_interval=30)
+    monkeypatch.setattr(artifact_writer, "_writer", writer)
+    writer.start()
+    store = ArtifactStore(tmp_path)
+    for index in range(5):
+        store.write_chat(4, "Developer", {"role": "Developer", "content": str(index)})
+    monkeypatch.setattr(writer, "flush", lambda *args, **kwargs: pytest.fail("read waited on the writer"))
+
+    assert writer.pending() == 5
+    assert store._chat_log(4).head_seq() == 5
+    messages, more = store.page_chats(4, after_seq=1, limit=2)
+    assert [message["content"] for message in messages] == ["1", "2"] and more
+
+    writer.close()
+    assert [message["seq"] for message in store.read_chats(4)] == [1, 2, 3, 4, 5]
+
+
+def test_out_of_order_events_page_by_seq(tmp_path):
+    store = ArtifactStore(tmp_path)
+    for seq in (1, 2, 4, 3, 6, 5):
+        store.write_event(5, {"type": "task.created", "seq": seq})
+
+    first, more = store.page_events(5, after_seq=1, limit=3)
+    assert [event["seq"] for event in first] == [2, 3, 4] and more
+    tail, more = store.page_events(5, before_seq=6, limit=2)
+    assert [event["seq"] for event in tail] == [4, 5] and more
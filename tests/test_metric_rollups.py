@@ -0,0 +1,83 @@
+from sqlmodel import select
+
+from app.core import metric_rollups
+from app.db.models import AgentMemory, Approval, AuditLog, Job, JobEvent, MetricCounter, Project, Run, Task, Team
+from app.db.session import get_session, init_db
+
+
+def _seed(session) -> tuple[int, int]:
+    project = Project(name="Test", repo_local_path=".")
+    session.add(project)
+    session.commit()
+    session.refresh(project)
+    team = Team(project_id=project.id, name="Team")
+    session.add(team)
+    session.commit()
+    session.refresh(team)
+    run = Run(project_id=project.id, team_id=team.id, goal="Ship")
+    session.add(run)
+    session.commit()
+    session.refresh(run)
+    return project.id, run.id
+
+
+def _activity(session, run_id: int) -> None:
+    job = Job(run_id=run_id)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    session.add_all(
+        [
+            Task(run_id=run_id, title="one"),
+            Task(run_id=run_id, title="two"),
+            AuditLog(run_id=run_id, actor="dev", action="tool.request", decision="allowed", tool_name="file.read"),
+            AuditLog(run_id=run_id, actor="dev", action="tool.request", decision="denied", tool_name="git.push"),
+            Approval(run_id=run_id, actor="dev", tool_name="git.push"),
+            AgentMemory(run_id=run_id, agent_id=1, role="Developer", content="note"),
+            JobEvent(job_id=job.id, type="job.step.started", payload="{}"),
+        ]
+    )
+    session.commit()
+
+
+def test_rollups_track_writes_and_match_sql_aggregates(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    metric_rollups.enable_rollups()
+    with get_session() as session:
+        project_id, run_id = _seed(session)
+        _activity(session, run_id)
+        assert metric_rollups.read(session, project_id) is None
+        assert metric_rollups.rebuild(session, project_id) == []
+
+        _activity(session, run_id)
+        approval = session.exec(select(Approval)).first()
+        approval.status = "approved"
+        session.add(approval)
+        session.commit()
+
+        expected = {
+            "runs": 1,
+            "tasks": 4,
+            "tool_calls": 4,
+            "tool_errors": 2,
+            "approvals_pending": 1,
+            "memory_entries": 2,
+            "events": 2,
+            "tool_breakdown": {"file.read": 2, "git.push": 2},
+        }
+        assert metric_rollups.aggregate(session, project_id) == expected
+        assert metric_rollups.read(session, project_id) == expected
+        assert metric_rollups.read(session, project_id, run_id) == metric_rollups.aggregate(
+            session, project_id, run_id
+        )
+
+        counter = session.exec(
+            select(MetricCounter).where(MetricCounter.run_id == run_id, MetricCounter.name == "tasks")
+        ).one()
+        counter.value = 9
+        session.add(counter)
+        session.commit()
+        assert metric_rollups.rebuild(session, project_id) == [
+            {"run_id": run_id, "name": "tasks", "stored": 9, "actual": 4}
+        ]
+        assert metric_rollups.read(session, project_id, run_id)["tasks"] == 4
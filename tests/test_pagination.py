@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException, Response
+from sqlmodel import select
+
+from app.api.pagination import NEXT_HEADER, PageParams, paginate
+from app.api.routes.memories import count_memories
+from app.db.models import AgentMemory, Artifact
+from app.db.session import get_session, init_db
+
+
+def _page(after_id=None, limit=2, fields=None) -> PageParams:
+    return PageParams(after_id=after_id, limit=limit, fields=fields)
+
+
+def test_keyset_pages_and_projection(tmp_path) -> None:
+    init_db(f"sqlite:///{tmp_path / 'pages.db'}")
+    with get_session() as session:
+        session.add_all(Artifact(type="diff" if i % 2 else "log", content="x" * 1000) for i in range(5))
+        session.commit()
+
+        response = Response()
+        first = paginate(session, Artifact, select(Artifact), _page(), response)
+        assert [row["id"] for row in first] == [1, 2]
+        assert "content" not in first[0]
+        assert response.headers[NEXT_HEADER] == "2"
+
+        response = Response()
+        statement = select(Artifact).where(Artifact.type == "diff")
+        rest = paginate(session, Artifact, statement, _page(after_id=2, fields="content"), response)
+        assert rest == [{"id": 4, "content": "x" * 1000}]
+        assert NEXT_HEADER not in response.headers
+
+        response = Response()
+        everything = paginate(session, Artifact, select(Artifact), _page(limit=None), response)
+        assert [row["id"] for row in everything] == [1, 2, 3, 4, 5]
+        assert NEXT_HEADER not in response.headers
+
+        with pytest.raises(HTTPException):
+            paginate(session, Artifact, select(Artifact), _page(fields="nope"), Response())
+
+
+def test_memory_counts_are_grouped_by_agent(tmp_path) -> None:
+    init_db(f"sqlite:///{tmp_path / 'counts.db'}")
+    with get_session() as session:
+        session.add_all(
+            AgentMemory(run_id=run_id, agent_id=agent_id, role="Developer", content="note")
+            for run_id, agent_id in ((1, 1), (1, 1), (1, 2), (2, 1))
+        )
+        session.commit()
+    assert count_memories(run_id=None) == {1: 3, 2: 1}
+    assert count_memories(run_id=1) == {1: 2, 2: 1}
@@ -1,4 +1,10 @@
+import asyncio
+
+import httpx
+
+from app.providers.http_pool import ProviderHTTP, Timeouts, parse_timeouts
 from app.providers.model_registry import ModelRegistry
+from app.providers.scheduler import BACKGROUND, INTERACTIVE, ProviderScheduler, parse_limits
 
 
 def test_registry_has_providers():
@@ -8,3 +14,143 @@ def test_registry_has_providers():
     assert "anthropic" in providers
     assert "groq" in providers
     assert "gemini" in providers
+
+
+def test_provider_http_reuses_one_client_and_resolves_timeouts():
+    overrides = parse_timeouts("read=45,invoke.total=90,groq.read=20,groq.list.total=5,bogus=1,total=x")
+    assert overrides == {"read": 45.0, "invoke.total": 90.0, "groq.read": 20.0, "groq.list.total": 5.0}
+    http = ProviderHTTP(timeouts=overrides)
+    assert http.timeouts("openai", "invoke") == Timeouts(connect=10.0, read=45.0, total=90.0)
+    assert http.timeouts("groq", "list") == Timeouts(connect=10.0, read=20.0, total=5.0)
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    async def scenario() -> list:
+        registry = ModelRegistry(http=http)
+        http._clients["groq"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = http.client("groq")
+        provider = registry._providers["groq"]
+        results = [
+            await provider.invoke_model("llama", {"prompt": "hi"}, api_key="key") for _ in range(3)
+        ]
+        assert http.client("groq") is client
+        await registry.aclose()
+        assert client.is_closed
+        return results
+
+    assert asyncio.run(scenario()) == [{"content": "ok"}] * 3
+    assert len(calls) == 3
+    assert http.stats()["providers"] == {}
+
+
+def test_streams_openai_anthropic_and_gemini_sse():
+    bodies = {
+        "api.openai.com": (
+            'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n'
+            'data: {"choices":[{"delta":{"content":"Hel"}}]}\n\n'
+            'data: {"choices":[{"delta":{"content":"lo"}}]}\n\n'
+            "data: [DONE]\n\n"
+        ),
+        "api.anthropic.com": (
+            "event: message_start\ndata: {}\n\n"
+            'event: content_block_delta\ndata: {"delta":{"type":"text_delta","text":"Hel"}}\n\n'
+            ": ping\n\n"
+            'event: content_block_delta\ndata: {"delta":{"type":"text_delta","text":"lo"}}\n\n'
+            "event: message_stop\ndata: {}\n\n"
+        ),
+        "generativelanguage.googleapis.com": (
+            'data: {"candidates":[{"content":{"parts":[{"text":"Hel"}]}}]}\r\n\r\n'
+            'data: {"candidates":[{"content":{"parts":[{"text":"lo"}]}}]}\r\n\r\n'
+        ),
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=bodies[request.url.host], headers={"content-type": "text/event-stream"})
+
+    async def scenario() -> dict:
+        registry = ModelRegistry()
+        for name in ("openai", "anthropic", "gemini"):
+            registry.http._clients[name] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        models = {"openai": "gpt-4o", "anthropic": "claude-3-5-sonnet", "gemini": "models/gemini-pro"}
+        results = {}
+        for name, model in models.items():
+            provider = registry._providers[name]
+            results[name] = [chunk async for chunk in provider.invoke_model_stream(model, {"prompt": "hi"}, "key")]
+        await registry.aclose()
+        return results
+
+    assert asyncio.run(scenario()) == {name: ["Hel", "lo"] for name in ("openai", "anthropic", "gemini")}
+
+
+def test_scheduler_admits_interactive_first_and_retries_after_429():
+    assert parse_limits("concurrency=1,openai.rpm=60,openai:gpt-4.1.tpm=900,bad.rpm=x") == {
+        "*": {"concurrency": 1.0},
+        "openai": {"rpm": 60.0},
+        "openai:gpt-4.1": {"tpm": 900.0},
+    }
+    scheduler = ProviderScheduler({"*": {"concurrency": 1}}, base_delay=0.01)
+    order = []
+
+    async def call(name: str, priority: int, started: asyncio.Event | None = None) -> None:
+        async with scheduler.slot("groq", "llama", 10, priority):
+            order.append(name)
+            if started:
+                started.set()
+            await asyncio.sleep(0.02)
+
+    async def scenario() -> None:
+        started = asyncio.Event()
+        first = asyncio.create_task(call("first", BACKGROUND, started))
+        await started.wait()
+        queued = [asyncio.create_task(call("background", BACKGROUND))]
+        await asyncio.sleep(0)
+        queued.append(asyncio.create_task(call("chat", INTERACTIVE)))
+        await asyncio.gather(first, *queued)
+
+    asyncio.run(scenario())
+    assert order == ["first", "chat", "background"]
+
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}, text="slow down"),
+        httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]}),
+    ]
+
+    async def retried() -> dict:
+        http = ProviderHTTP()
+        http._clients["groq"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: responses.pop(0))
+        )
+        registry = ModelRegistry(http=http, scheduler=scheduler)
+        registry._providers["groq"].api_key = "key"
+        try:
+            return await registry.invoke("groq", "llama", {"prompt": "hi"}, priority=INTERACTIVE)
+        finally:
+            await registry.aclose()
+
+    assert asyncio.run(retried())["content"] == "ok"
+    stats = scheduler.stats()["groq"]
+    assert (stats["rate_limited"], stats["retries"], stats["calls"]) == (1, 1, 5)
+
+
+def test_cancelled_waiter_ahead_does_not_strand_the_queue():
+    scheduler = ProviderScheduler({"openai": {"rpm": 60}})
+
+    async def call(model: str) -> str:
+        async with scheduler.slot("openai", model, 10):
+            return model
+
+    async def scenario() -> str:
+        scheduler._bucket(scheduler._lane("openai"), "", "rpm", 60).level = 0
+        ahead = asyncio.create_task(call("gpt-4o"))
+        await asyncio.sleep(0.05)
+        behind = asyncio.create_task(call("gpt-4o-mini"))
+        await asyncio.sleep(0.05)
+        ahead.cancel()
+        return await asyncio.wait_for(behind, 3)
+
+    assert asyncio.run(scenario()) == "gpt-4o-mini"
+    assert scheduler.stats()["openai"]["waiting"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+import sqlite3
+import time
+
+from app.providers.model_registry import ModelRegistry
+from app.providers.response_cache import CachedText, ResponseCache, cache_key
+
+
+class CountingProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def invoke_model(self, model, payload, api_key=None):
+        self.calls += 1
+        return {"content": f"reply {self.calls}"}
+
+
+def test_registry_replays_cached_responses_per_site(tmp_path, monkeypatch):
+    monkeypatch.setenv("AI_DEVTEAM_COST_PER_CALL", "0.5")
+    path = tmp_path / "response_cache.db"
+    provider = CountingProvider()
+    registry = ModelRegistry(response_cache=ResponseCache(path, ["profile"], max_entries=2))
+    registry._providers["openai"] = provider
+
+    async def invoke(prompt: str, cache: str | None = "profile") -> dict:
+        payload = {"prompt": prompt, "role": "Developer", "provider_token": "one-shot"}
+        return await registry.invoke("openai", "gpt-4", payload, cache=cache)
+
+    async def scenario() -> list:
+        return [
+            await invoke("Role: Developer\n"),
+            await invoke("Role:   Developer"),
+            await invoke("Role: Developer", cache=None),
+            await invoke("Role: Developer", cache="planning"),
+            await invoke("Role: QA"),
+            await invoke("Role: PM"),
+            await invoke("Role: Developer"),
+        ]
+
+    results = asyncio.run(scenario())
+    assert [result["content"] for result in results] == [
+        "reply 1", "reply 1", "reply 2", "reply 3", "reply 4", "reply 5", "reply 6",
+    ]
+    assert results[1]["cached"] is True
+    stats = registry.response_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["usd_saved"]) == (1, 4, 2, 0.5)
+    registry.response_cache.close()
+
+    reopened = ResponseCache(path, ["profile"], ttl_seconds=60)
+    key = cache_key("openai", "gpt-4", {"prompt": "Role: PM", "role": "Developer"})
+    assert reopened.get("profile", key) == "reply 5"
+    reopened.ttl_seconds = 0.001
+    reopened._memory.clear()
+    time.sleep(0.01)
+    assert reopened.get("profile", key) is None
+    reopened.close()
+
+
+class CountingBroker:
+    def __init__(self) -> None:
+        self.issued = 0
+
+    def issue_provider_token(self, provider):
+        self.issued += 1
+        return None
+
+    def resolve_token(self, token):
+        return None
+
+
+class StreamingProvider(CountingProvider):
+    async def invoke_model_stream(self, model, payload, api_key=None):
+        self.calls += 1
+        for chunk in ("str", "eamed"):
+            yield chunk
+
+
+def test_stream_hits_skip_the_provider_and_the_token(tmp_path):
+    broker = CountingBroker()
+    provider = StreamingProvider()
+    registry = ModelRegistry(broker, response_cache=ResponseCache(tmp_path / "cache.db", ["planning"]))
+    registry._providers["openai"] = provider
+
+    async def stream() -> list:
+        payload = {"prompt": "Plan the sprint", "role": "PM"}
+        return [chunk async for chunk in registry.invoke_stream("openai", "gpt-4", payload, cache="planning")]
+
+    async def scenario() -> tuple:
+        return await stream(), await stream()
+
+    first, second = asyncio.run(scenario())
+    assert (first, second) == (["str", "eamed"], ["streamed"])
+    assert isinstance(second[0], CachedText) and not isinstance(first[0], CachedText)
+    assert (provider.calls, broker.issued) == (1, 1)
+    registry.response_cache.close()
+
+
+def test_cache_errors_are_treated_as_misses(tmp_path):
+    class BrokenCache(ResponseCache):
+        def get(self, site, key):
+            raise sqlite3.OperationalError("database is locked")
+
+        def put(self, site, key, provider, model, content):
+            raise sqlite3.OperationalError("database is locked")
+
+    provider = CountingProvider()
+    registry = ModelRegistry(response_cache=BrokenCache(tmp_path / "cache.db", ["profile"]))
+    registry._providers["openai"] = provider
+
+    result = asyncio.run(registry.invoke("openai", "gpt-4", {"prompt": "Role: QA"}, cache="profile"))
+    assert result == {"content": "reply 1"} and provider.calls == 1
@@ -0,0 +1,28 @@
+from app.core.artifacts import ArtifactStore
+
+
+def test_snapshots_are_content_addressed(tmp_path):
+    store = ArtifactStore(tmp_path / "data", snapshot_max_bytes=64)
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    source = repo / "app.py"
+
+    source.write_text("print('a')\n")
+    first = store.snapshots.save_file(1, source)
+    assert store.snapshots.save_file(1, source)["skipped"] == "unchanged"
+    source.write_text("print('b')\n")
+    store.snapshots.save_file(1, source)
+    source.write_text("print('a')\n")
+    assert store.snapshots.save_file(1, source)["hash"] == first["hash"]
+    other = store.write_snapshot(2, str(repo / "copy.py"), "print('a')\n")
+
+    (repo / "logo.png").write_bytes(b"\x89PNG\x00\x00")
+    (repo / "big.txt").write_text("x" * 100)
+    assert store.snapshots.save_file(1, repo / "logo.png")["skipped"] == "binary"
+    assert store.snapshots.save_file(1, repo / "big.txt")["skipped"] == "too_large"
+
+    history = store.snapshots.history(1, str(source))
+    assert [entry["seq"] for entry in history] == [1, 2, 3]
+    assert other["hash"] == first["hash"]
+    assert len(list((tmp_path / "data" / "blobs").rglob("*.z"))) == 2
+    assert store.snapshots.read_blob(first["hash"]) == b"print('a')\n"
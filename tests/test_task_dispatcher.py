@@ -0,0 +1,18 @@
+import asyncio
+
+from app.core.task_dispatcher import TaskDispatcher
+
+
+def test_dispatcher_wakes_waiter_on_notify():
+    dispatcher = TaskDispatcher(sweep_interval=30)
+
+    async def run():
+        signal = dispatcher.subscribe()
+        await dispatcher.wait(signal)
+        waiter = asyncio.create_task(dispatcher.wait(signal))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        dispatcher.notify()
+        await asyncio.wait_for(waiter, timeout=1)
+
+    asyncio.run(run())
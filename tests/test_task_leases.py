@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from app.core.task_leases import TaskLeaseManager
+from app.db.models import Project, Run, Task, Team
+from app.db.session import get_session, init_db
+
+
+def _seed_task(tmp_path) -> int:
+    init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    with get_session() as session:
+        project = Project(name="Test", repo_local_path=".")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        team = Team(project_id=project.id, name="Team")
+        session.add(team)
+        session.commit()
+        session.refresh(team)
+        run = Run(project_id=project.id, team_id=team.id, goal="Ship")
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+        task = Task(run_id=run.id, title="Build")
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+        return task.id
+
+
+def test_only_one_worker_claims_a_task(tmp_path):
+    task_id = _seed_task(tmp_path)
+    first = TaskLeaseManager(owner="worker-a")
+    second = TaskLeaseManager(owner="worker-b")
+    with get_session() as session:
+        assert first.claim(session, task_id, "Developer")
+        assert not second.claim(session, task_id, "Developer")
+        session.commit()
+    assert not second.finish(task_id, "completed")
+    assert first.finish(task_id, "completed")
+    with get_session() as session:
+        task = session.get(Task, task_id)
+        assert task.status == "completed"
+        assert task.attempts == 1
+        assert task.lease_owner is None
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    task_id = _seed_task(tmp_path)
+    crashed = TaskLeaseManager(owner="worker-a")
+    survivor = TaskLeaseManager(owner="worker-b")
+    with get_session() as session:
+        assert crashed.claim(session, task_id, "Developer")
+        task = session.get(Task, task_id)
+        task.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        session.add(task)
+        session.commit()
+    with get_session() as session:
+        assert survivor.claim(session, task_id, "Developer")
+        session.commit()
+    assert not crashed.renew(task_id)
+    assert survivor.renew(task_id)
+
+
+def test_exhausted_task_is_not_failed_under_a_live_lease(tmp_path):
+    task_id = _seed_task(tmp_path)
+    holder = TaskLeaseManager(owner="worker-a")
+    sweeper = TaskLeaseManager(owner="worker-b")
+    with get_session() as session:
+        assert holder.claim(session, task_id, "Developer")
+        session.commit()
+    assert not sweeper.fail_exhausted(task_id, 1)
+    assert holder.abandon(task_id, 1, 2) == "pending"
+    assert sweeper.fail_exhausted(task_id, 1)
+    with get_session() as session:
+        assert session.get(Task, task_id).status == "failed"
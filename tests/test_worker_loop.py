@@ -0,0 +1,189 @@
+import asyncio
+
+from sqlmodel import select
+
+from app.core.artifacts import ArtifactStore
+from app.core.events import EventBus
+from app.core.manager_loop import ManagerLoop
+from app.core.worker_loop import WorkerLoop
+from app.db.models import AgentConfig, Project, ProjectSetting, Run, Task, Team
+from app.db.session import get_session, init_db
+
+
+class SlowRuntime:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def run_agent(self, run_id, agent, goal):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return {"content": "NO_RESPONSE"}
+
+
+def _seed(tmp_path):
+    init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    with get_session() as session:
+        project = Project(name="Test", repo_local_path=".")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        team = Team(project_id=project.id, name="Team")
+        session.add(team)
+        session.commit()
+        session.refresh(team)
+        session.add(AgentConfig(team_id=team.id, role="Developer", provider="openai", model="gpt-4"))
+        session.add(AgentConfig(team_id=team.id, role="QA Engineer", provider="groq", model="llama"))
+        run = Run(project_id=project.id, team_id=team.id, goal="Ship", pause_mode="break")
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+        for title, role in (("dev one", "Developer"), ("dev two", "Developer"), ("qa", "QA Engineer")):
+            session.add(Task(run_id=run.id, title=title, assigned_role=role))
+        session.commit()
+        return project.id
+
+
+def test_worker_loop_runs_agents_concurrently(tmp_path):
+    project_id = _seed(tmp_path)
+    runtime = SlowRuntime()
+    loop = WorkerLoop(
+        EventBus(),
+        lambda: project_id,
+        runtime,
+        None,
+        ArtifactStore(tmp_path / "artifacts"),
+        tmp_path,
+        False,
+    )
+
+    async def run():
+        await loop._tick()
+        with get_session() as session:
+            statuses = {task.title: task.status for task in session.exec(select(Task))}
+        assert statuses == {"dev one": "in_progress", "dev two": "pending", "qa": "in_progress"}
+        while loop.task_executor._inflight:
+            await asyncio.sleep(0.01)
+        await loop._tick()
+        while loop.task_executor._inflight:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert runtime.peak == 2
+    with get_session() as session:
+        assert all(task.status == "completed" for task in session.exec(select(Task)))
+
+
+class CountingRuntime:
+    def __init__(self):
+        self.calls = 0
+
+    async def run_agent(self, run_id, agent, goal):
+        self.calls += 1
+        return {"content": "NO_RESPONSE"}
+
+
+def test_chat_cursor_survives_restart(tmp_path):
+    project_id = _seed(tmp_path)
+    artifacts = ArtifactStore(tmp_path / "artifacts")
+    with get_session() as session:
+        run = session.exec(select(Run)).first()
+        agents = list(session.exec(select(AgentConfig)))
+    artifacts.write_chat(run.id, "Stakeholder", {"agent": "Stakeholder", "content": "old"})
+
+    def make_loop(runtime):
+        return WorkerLoop(EventBus(), lambda: project_id, runtime, None, artifacts, tmp_path, False)
+
+    runtime = CountingRuntime()
+    asyncio.run(make_loop(runtime)._process_chat(run, agents))
+    assert runtime.calls == 0
+
+    artifacts.write_chat(run.id, "Stakeholder", {"agent": "Stakeholder", "content": "@team new"})
+    asyncio.run(make_loop(runtime)._process_chat(run, agents))
+    assert runtime.calls == len(agents)
+
+    restarted = CountingRuntime()
+    asyncio.run(make_loop(restarted)._process_chat(run, agents))
+    assert restarted.calls == 0
+
+
+class FailingRuntime:
+    def __init__(self):
+        self.calls = 0
+
+    async def run_agent(self, run_id, agent, goal):
+        self.calls += 1
+        raise RuntimeError("boom")
+
+
+def test_failing_task_is_requeued_then_failed_at_retry_limit(tmp_path):
+    project_id = _seed(tmp_path)
+    with get_session() as session:
+        session.add(ProjectSetting(project_id=project_id, task_retry_limit=2))
+        for task in session.exec(select(Task).where(Task.title != "qa")):
+            session.delete(task)
+        session.commit()
+    runtime = FailingRuntime()
+    loop = WorkerLoop(
+        EventBus(), lambda: project_id, runtime, None, ArtifactStore(tmp_path / "artifacts"), tmp_path, False
+    )
+
+    async def tick_until_idle():
+        await loop._tick()
+        while loop.task_executor._inflight:
+            await asyncio.sleep(0.01)
+
+    def task_state():
+        with get_session() as session:
+            task = session.exec(select(Task)).one()
+            return task.status, task.attempts, task.lease_owner
+
+    asyncio.run(tick_until_idle())
+    assert task_state() == ("pending", 1, None)
+    asyncio.run(tick_until_idle())
+    assert task_state() == ("failed", 2, None)
+    asyncio.run(tick_until_idle())
+    assert runtime.calls == 2
+
+
+class ReviewingRuntime:
+    async def run_agent(self, run_id, agent, goal):
+        if agent.role == "Delivery Manager":
+            return {"content": "APPROVED. @qa_engineer please verify the build."}
+        return {"content": "Done."}
+
+
+def test_manager_review_mentions_trigger_followups(tmp_path):
+    project_id = _seed(tmp_path)
+    with get_session() as session:
+        run = session.exec(select(Run)).first()
+        run.pause_mode = None
+        session.add(run)
+        session.add(AgentConfig(team_id=run.team_id, role="Delivery Manager", provider="openai", model="gpt-4"))
+        session.add(Task(run_id=run.id, title="plan"))
+        session.commit()
+    loop = ManagerLoop(
+        EventBus(),
+        lambda: project_id,
+        ReviewingRuntime(),
+        None,
+        ArtifactStore(tmp_path / "artifacts"),
+        tmp_path,
+        False,
+    )
+    followups = []
+
+    async def record(run, manager, message):
+        followups.append(message)
+
+    loop._trigger_followups = record
+
+    async def run():
+        await loop._tick()
+        while loop.task_executor._inflight:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert followups and all("@qa_engineer" in message for message in followups)
@@ -26,6 +26,7 @@ export default function Chat() {
   const [error, setError] = useState(null as string | null);
   const [activity, setActivity] = useState([] as string[]);
   const [thinkingAgents, setThinkingAgents] = useState([] as string[]);
+  const [streams, setStreams] = useState({} as Record<string, { agent: string; text: string }>);
   const [pauseMode, setPauseMode] = useState(null as string | null);
   const [tagOptions, setTagOptions] = useState([] as string[]);
   const [tagMatches, setTagMatches] = useState([] as string[]);
@@ -85,6 +86,20 @@ export default function Chat() {
           const actor = String(payload?.payload?.agent ?? "");
           if (actor) {
             setThinkingAgents((prev: string[]) => prev.filter((name) => name !== actor));
+            setStreams((prev) =>
+              Object.fromEntries(Object.entries(prev).filter(([, item]) => item.agent !== actor))
+            );
+          }
+        }
+        if (payload?.type === "chat.delta") {
+          const streamId = String(payload?.payload?.stream_id ?? "");
+          const actor = String(payload?.payload?.agent ?? "agent");
+          const delta = String(payload?.payload?.delta ?? "");
+          if (streamId) {
+            setStreams((prev) => ({
+              ...prev,
+              [streamId]: { agent: actor, text: (prev[streamId]?.text ?? "") + delta },
+            }));
           }
         }
         if (payload?.type === "tool.completed") {
@@ -329,6 +344,7 @@ export default function Chat() {
     setTyping(false);
     setActivity([]);
     setThinkingAgents([]);
+    setStreams({});
     setError(null);
     setPauseMode(null);
     seenMessageIdsRef.current.clear();
@@ -421,6 +437,11 @@ export default function Chat() {
           {thinkingAgents.length > 0 && (
             <div className="muted">Thinking: {thinkingAgents.join(", ")}</div>
           )}
+          {Object.entries(streams).map(([streamId, item]) => (
+            <div key={streamId} className="muted" style={{ whiteSpace: "pre-wrap" }}>
+              {item.agent}: {item.text}
+            </div>
+          ))}
           {activity.length > 0 && (
             <div className="muted" style={{ marginTop: 8 }}>
               Activity: {activity.join(" · ")}
@@ -201,17 +201,8 @@ export default function TeamSettings() {
     apiGet("/agents")
       .then((data) => setAgents(data as AgentInfo[]))
       .catch((err) => setError(err.message));
-    apiGet("/memories")
-      .then((data) => {
-        const counts: Record<number, number> = {};
-        (data as { agent_id?: number }[]).forEach((entry) => {
-          if (!entry.agent_id) {
-            return;
-          }
-          counts[entry.agent_id] = (counts[entry.agent_id] ?? 0) + 1;
-        });
-        setMemoryCounts(counts);
-      })
+    apiGet("/memories/counts")
+      .then((data) => setMemoryCounts(data as Record<number, number>))
       .catch((err) => setError(err.message));
     apiGet("/mcp/endpoints")
       .then((data) => {